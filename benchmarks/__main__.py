@@ -0,0 +1,90 @@
+"""Runs the stage benchmarks on generated statements and prints JSON
+
+Run with `python -m benchmarks --rows 1000 100000 --stages reader parse`.
+Statements are generated in a temporary workspace with the same seed on every
+run, so results from different versions can be compared directly.
+"""
+
+import json
+import platform
+import sys
+from argparse import ArgumentParser
+from importlib.metadata import PackageNotFoundError, version
+from typing import Any
+
+from benchmarks.generators import GENERATORS
+from benchmarks.stages import STAGES, StageBenchmark
+from benchmarks.workspace import BenchmarkWorkspace
+
+
+def package_version() -> str:
+    try:
+        return version("ofx-converter")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def parse_option(option: str) -> tuple[str, Any]:
+    key, _, value = option.partition("=")
+    try:
+        return key, json.loads(value)
+    except ValueError:
+        return key, value
+
+
+def run(
+    rows: list[int],
+    accounts: list[str],
+    stages: list[str],
+    repeat: int,
+    seed: int,
+    file_options: dict[str, Any],
+) -> dict[str, Any]:
+    results: list[dict[str, Any]] = []
+    with BenchmarkWorkspace(file_options) as workspace:
+        for account_name in accounts:
+            for size in rows:
+                input_path = workspace.write_statement(account_name, size, seed)
+                benchmark = StageBenchmark(account_name, input_path, repeat)
+                results.extend(benchmark.run(stages, size))
+                print(f"Benchmarked {account_name} with {size} rows", file=sys.stderr)
+    return {
+        "version": package_version(),
+        "python": platform.python_version(),
+        "seed": seed,
+        "repeat": repeat,
+        "file_options": file_options,
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument(
+        "--accounts", nargs="+", choices=list(GENERATORS), default=list(GENERATORS)
+    )
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--option",
+        action="append",
+        default=[],
+        help="reader option for every account, e.g. backend=native or use_mmap=true",
+    )
+    parser.add_argument("--output", help="file to write the JSON to")
+    args = parser.parse_args()
+    file_options = dict(map(parse_option, args.option))
+    report = run(
+        args.rows, args.accounts, args.stages, args.repeat, args.seed, file_options
+    )
+    content = json.dumps(report, indent=2)
+    if args.output is not None:
+        with open(args.output, "w") as file_obj:
+            file_obj.write(content)
+    print(content)
+
+
+if __name__ == "__main__":
+    main()
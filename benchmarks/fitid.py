@@ -0,0 +1,95 @@
+"""Compares the per row cost of FITID generation
+
+`property` rebuilds the id on every access, as Transaction did before ids
+were cached, `cached` is the lazy Transaction.fitid and the others hash a
+whole batch with FitidHasher.assign. Rows share datetime objects by
+date, as DateParser returns them, unless --unique-dates is given. Run with
+`python -m benchmarks.fitid --rows 1000000`.
+"""
+
+import json
+from argparse import ArgumentParser
+from datetime import datetime, timedelta
+from decimal import Decimal
+from time import perf_counter
+from typing import Callable
+from zoneinfo import ZoneInfo
+
+from ofx_converter.parsing.fitid import FitidHasher
+from ofx_converter.parsing.transaction import Transaction
+
+# Rendering reads the id once, a few more reads happen when deduplicating
+ACCESSES = 2
+
+
+ROWS_PER_DATE = 20
+
+
+def make_transactions(rows: int, unique_dates: bool) -> list[Transaction]:
+    start = datetime(2020, 1, 1, tzinfo=ZoneInfo("America/Sao_Paulo"))
+    per_date = 1 if unique_dates else ROWS_PER_DATE
+    dates = [start + timedelta(days=i) for i in range(rows // per_date + 1)]
+    return [
+        Transaction(
+            dates[i // per_date],
+            f"Store {i % 1000}",
+            Decimal(i % 500_000 - 250_000) / 100,
+        )
+        for i in range(rows)
+    ]
+
+
+def timed(
+    rows: int, unique_dates: bool, function: Callable[[list[Transaction]], None]
+) -> float:
+    transactions = make_transactions(rows, unique_dates)
+    start = perf_counter()
+    function(transactions)
+    return (perf_counter() - start) / rows * 1e9
+
+
+def by_property(transactions: list[Transaction]) -> None:
+    for t in transactions:
+        for _ in range(ACCESSES):
+            t._make_fitid()
+
+
+def by_cached_property(transactions: list[Transaction]) -> None:
+    for t in transactions:
+        for _ in range(ACCESSES):
+            t.fitid
+
+
+def by_batch(hasher: FitidHasher) -> Callable[[list[Transaction]], None]:
+    def inner(transactions: list[Transaction]) -> None:
+        hasher.assign(transactions)
+        for t in transactions:
+            for _ in range(ACCESSES):
+                t.fitid
+
+    return inner
+
+
+def measure(rows: int, unique_dates: bool = False) -> dict[str, float]:
+    results = {
+        "property": timed(rows, unique_dates, by_property),
+        "cached": timed(rows, unique_dates, by_cached_property),
+        "batch_md5": timed(rows, unique_dates, by_batch(FitidHasher())),
+    }
+    for digest_size in (8, 12, 16):
+        hasher = by_batch(FitidHasher(FitidHasher.BLAKE2B, digest_size))
+        results[f"batch_blake2b_{digest_size}"] = timed(rows, unique_dates, hasher)
+    return {"rows": rows, "accesses": ACCESSES, **results}
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--unique-dates", action="store_true")
+    args = parser.parse_args()
+    results = measure(args.rows, args.unique_dates)
+    print(json.dumps({"fitid_ns_per_row": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
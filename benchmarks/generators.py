@@ -0,0 +1,201 @@
+"""Deterministic statement generators for the benchmarks
+
+Each generator writes a file shaped like the real exports of the bank, with
+rows spread over the month and amounts, descriptions and installments drawn
+from a seeded Random, so the same size and seed always give the same bytes.
+"""
+
+from datetime import datetime, timedelta
+from pathlib import Path
+from random import Random
+from uuid import UUID
+
+DESCRIPTIONS = [
+    "Emporium Sao Paulo",
+    "Bikeok Servicos Ao Cic",
+    "Google Youtubepremium",
+    "Pagamento Recebido",
+    "Padaria Real",
+    "Uber *Trip",
+    "Drogaria Sao Paulo",
+    "Amazon Marketplace",
+    "Posto Ipiranga",
+    "Restaurante Bom Prato",
+]
+
+OFX_HEADER = """OFXHEADER:100
+DATA:OFXSGML
+VERSION:102
+SECURITY:NONE
+ENCODING:USASCII
+CHARSET:1252
+COMPRESSION:NONE
+OLDFILEUID:NONE
+NEWFILEUID:NONE
+<OFX>
+<SIGNONMSGSRSV1>
+<SONRS>
+<STATUS>
+<CODE>0</CODE>
+<SEVERITY>INFO</SEVERITY>
+</STATUS>
+<DTSERVER>{dtend}</DTSERVER>
+<LANGUAGE>POR</LANGUAGE>
+<FI>
+<ORG>NU PAGAMENTOS S.A.</ORG>
+<FID>260</FID>
+</FI>
+</SONRS>
+</SIGNONMSGSRSV1>
+<CREDITCARDMSGSRSV1>
+<CCSTMTTRNRS>
+<TRNUID>1001</TRNUID>
+<STATUS>
+<CODE>0</CODE>
+<SEVERITY>INFO</SEVERITY>
+</STATUS>
+<CCSTMTRS>
+<CURDEF>BRL</CURDEF>
+<CCACCTFROM>
+<ACCTID>61d7badc-f92a-469a-88b2-41a556f2fb29</ACCTID>
+</CCACCTFROM>
+<BANKTRANLIST>
+<DTSTART>{dtstart}</DTSTART>
+<DTEND>{dtend}</DTEND>
+"""
+
+OFX_TRANSACTION = """<STMTTRN>
+<TRNTYPE>{type}</TRNTYPE>
+<DTPOSTED>{date}</DTPOSTED>
+<TRNAMT>{amount}</TRNAMT>
+<FITID>{fitid}</FITID>
+<MEMO>{memo}</MEMO>
+</STMTTRN>
+"""
+
+OFX_FOOTER = """</BANKTRANLIST>
+<LEDGERBAL>
+<BALAMT>{balance}</BALAMT>
+<DTASOF>{dtend}</DTASOF>
+</LEDGERBAL>
+</CCSTMTRS>
+</CCSTMTTRNRS>
+</CREDITCARDMSGSRSV1>
+</OFX>
+"""
+
+
+def format_brl(cents: int, sign_first: bool = True) -> str:
+    """Formats cents as XP does, e.g. -R$ 1.234,56 or R$ -1.234,56"""
+    units, decimals = divmod(abs(cents), 100)
+    sign = "-" if cents < 0 else ""
+    number = f"{units:,}".replace(",", ".") + f",{decimals:02d}"
+    return f"{sign}R$ {number}" if sign_first else f"R$ {sign}{number}"
+
+
+def _timestamps(rows: int, month: datetime) -> list[datetime]:
+    step = timedelta(days=28) / max(rows, 1)
+    return [month + step * i for i in range(rows)]
+
+
+def _installment(random: Random) -> tuple[int, int] | None:
+    if random.random() >= 0.1:
+        return None
+    total = random.randint(2, 12)
+    return random.randint(1, total), total
+
+
+def write_xp_checking_csv(
+    path: Path, rows: int, seed: int = 0, month: datetime = datetime(2025, 1, 1)
+) -> Path:
+    """Writes an XP checking account statement
+
+    Args:
+        path: file to write
+        rows: number of transactions
+        seed: seed of the random amounts and descriptions
+        month: first day of the statement
+    """
+    random = Random(seed)
+    balance = 0
+    with open(path, "w", encoding="utf-8", newline="") as file_obj:
+        file_obj.write("Data;Hora;Descricao;Valor;Saldo;Parcela\r\n")
+        for timestamp in _timestamps(rows, month):
+            cents = random.randint(-200_000, 150_000)
+            balance += cents
+            file_obj.write(
+                f"{timestamp:%d/%m/%y};{timestamp:%H:%M:%S};"
+                f"{random.choice(DESCRIPTIONS)};{format_brl(cents)};"
+                f"{format_brl(balance)};-\r\n"
+            )
+    return path
+
+
+def write_xp_card_csv(
+    path: Path, rows: int, seed: int = 0, month: datetime = datetime(2025, 1, 1)
+) -> Path:
+    """Writes an XP credit card statement, with installments
+
+    Args:
+        path: file to write
+        rows: number of transactions
+        seed: seed of the random amounts, descriptions and installments
+        month: first day of the statement
+    """
+    random = Random(seed)
+    with open(path, "w", encoding="utf-8-sig", newline="") as file_obj:
+        file_obj.write("Data;Estabelecimento;Portador;Valor;Parcela\r\n")
+        for timestamp in _timestamps(rows, month):
+            cents = random.randint(-50_000, 300_000)
+            installment = _installment(random)
+            parcela = "-" if installment is None else "%i de %i" % installment
+            file_obj.write(
+                f"{timestamp:%d/%m/%Y};{random.choice(DESCRIPTIONS).upper()};"
+                f"TITULAR;{format_brl(cents, sign_first=False)};{parcela}\r\n"
+            )
+    return path
+
+
+def write_nubank_ofx(
+    path: Path, rows: int, seed: int = 0, month: datetime = datetime(2025, 1, 1)
+) -> Path:
+    """Writes a Nubank credit card OFX statement, with installments
+
+    Args:
+        path: file to write
+        rows: number of transactions
+        seed: seed of the random amounts, descriptions, ids and installments
+        month: first day of the statement
+    """
+    random = Random(seed)
+    ofx_date = "{:%Y%m%d%H%M%S}[-3:BRT]".format
+    timestamps = _timestamps(rows, month)
+    dtend = ofx_date(month + timedelta(days=28))
+    balance = 0
+    with open(path, "w", encoding="ascii", newline="\n") as file_obj:
+        file_obj.write(OFX_HEADER.format(dtstart=ofx_date(month), dtend=dtend))
+        for timestamp in reversed(timestamps):
+            cents = random.randint(-200_000, 20_000)
+            balance += cents
+            memo = random.choice(DESCRIPTIONS)
+            installment = _installment(random)
+            if installment is not None:
+                memo += " - Parcela %i/%i" % installment
+            file_obj.write(
+                OFX_TRANSACTION.format(
+                    type="DEBIT" if cents < 0 else "CREDIT",
+                    date=ofx_date(timestamp.replace(hour=0, minute=0, second=0)),
+                    amount=f"{cents / 100:.2f}",
+                    fitid=UUID(int=random.getrandbits(128), version=4),
+                    memo=memo,
+                )
+            )
+        file_obj.write(OFX_FOOTER.format(balance=f"{balance / 100:.2f}", dtend=dtend))
+    return path
+
+
+GENERATORS = {
+    "xpi-conta": (write_xp_checking_csv, "csv"),
+    "xpi-cartao": (write_xp_card_csv, "csv"),
+    "nubank-cartao": (write_nubank_ofx, "ofx"),
+}
@@ -0,0 +1,71 @@
+"""Compares MoneyParser against the previous float based implementation
+
+Run with `python -m benchmarks.money_parser --rows 100000`.
+"""
+
+import json
+import re
+from argparse import ArgumentParser
+from decimal import Decimal
+from random import Random
+from timeit import timeit
+
+from benchmarks.workspace import BenchmarkWorkspace
+from ofx_converter.parsing.account import Account
+from ofx_converter.parsing.account_config import AccountConfig
+from ofx_converter.parsing.money_parser import MoneyParser
+
+VALUE_REGEX = re.compile("(?P<sign>-)?R\\$ (?P<value>[\\d\\.,]+)$")
+
+
+def float_parse(value: str, sign: int) -> Decimal | None:
+    value_obj = VALUE_REGEX.match(value)
+    if value_obj is None:
+        return None
+    value_extracted = value_obj["value"].replace(".", "").replace(",", ".")
+    sign_extracted = value_obj.groupdict().get("sign")
+    value_converted = float(
+        "{sign}{value}".format(
+            sign=sign_extracted if sign_extracted is not None else "",
+            value=value_extracted,
+        )
+    )
+    return sign * Decimal(value_converted)
+
+
+def format_money(cents: int) -> str:
+    units, decimals = divmod(abs(cents), 100)
+    sign = "-" if cents < 0 else ""
+    thousands = f"{units:,}".replace(",", ".")
+    return f"{sign}R$ {thousands},{decimals:02d}"
+
+
+def make_values(rows: int, seed: int = 42) -> list[str]:
+    random = Random(seed)
+    return [format_money(random.randint(-10_000_000, 10_000_000)) for _ in range(rows)]
+
+
+def measure(rows: int) -> dict[str, float]:
+    values = make_values(rows)
+    with BenchmarkWorkspace():
+        parser = MoneyParser(AccountConfig(Account("xpi-conta")), VALUE_REGEX)
+        sign = parser.get_credit_debit_sign()
+        results = {
+            "float_parse": timeit(
+                lambda: [float_parse(v, sign) for v in values], number=1
+            ),
+            "parse": timeit(lambda: [parser.parse(v) for v in values], number=1),
+            "parse_many": timeit(lambda: parser.parse_many(values), number=1),
+        }
+    return {"rows": rows, **{k: v / rows * 1e9 for k, v in results.items()}}
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+    print(json.dumps({"money_parser_ns_per_row": measure(args.rows)}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Compares the ordering work of OfxClient before and after the single sort
+
+`before` sorts the transactions with Transaction.__lt__ as it used to, once
+for the header and again for the footer. `after` sorts them once with the
+timestamp as key, as OfxClient.sort_transactions does. Comparisons are
+counted on a separate run, since counting slows them down. Rows arrive
+mostly sorted with some shuffled, like statements listing the latest
+purchases first. Run with `python -m benchmarks.ofx_sort --rows 1000000`.
+"""
+
+import json
+from argparse import ArgumentParser
+from datetime import datetime, timedelta
+from decimal import Decimal
+from random import Random
+from time import perf_counter
+from typing import Any, Callable
+from zoneinfo import ZoneInfo
+
+from ofx_converter.ofx_client import OfxClient
+from ofx_converter.parsing.transaction import Transaction
+
+# The sorts of make_ofx_file and make_ofx_footer before the change
+SORTS_BEFORE = 2
+
+
+def make_transactions(rows: int, seed: int = 0) -> list[Transaction]:
+    random = Random(seed)
+    start = datetime(2020, 1, 1, tzinfo=ZoneInfo("America/Sao_Paulo"))
+    transactions = [
+        Transaction(start + timedelta(minutes=i), f"Store {i % 1000}", Decimal(i))
+        for i in range(rows)
+    ]
+    # Blocks of rows in reverse order, as card statements list them
+    block = 500
+    for position in range(0, rows, block):
+        if random.random() < 0.5:
+            transactions[position : position + block] = reversed(
+                transactions[position : position + block]
+            )
+    random.shuffle(transactions[: rows // 10])
+    return transactions
+
+
+class _CountedKey:
+    """Sort key counting its comparisons"""
+
+    __slots__ = ("value",)
+    comparisons = 0
+
+    def __init__(self, transaction: Transaction) -> None:
+        self.value = transaction.timestamp
+
+    def __lt__(self, other: "_CountedKey") -> bool:
+        _CountedKey.comparisons += 1
+        return self.value < other.value
+
+
+def sort_before(transactions: list[Transaction]) -> None:
+    for _ in range(SORTS_BEFORE):
+        sorted(transactions)
+
+
+def sort_after(transactions: list[Transaction]) -> None:
+    OfxClient.sort_transactions(transactions)
+
+
+def count_comparisons(transactions: list[Transaction]) -> int:
+    _CountedKey.comparisons = 0
+    sorted(transactions, key=_CountedKey)
+    return _CountedKey.comparisons
+
+
+def timed(function: Callable[[list[Transaction]], Any], rows: int, seed: int) -> float:
+    transactions = make_transactions(rows, seed)
+    start = perf_counter()
+    function(transactions)
+    return perf_counter() - start
+
+
+def measure(rows: int, seed: int = 0) -> dict[str, Any]:
+    comparisons = count_comparisons(make_transactions(rows, seed))
+    return {
+        "rows": rows,
+        # Each one a call to Transaction.__lt__
+        "comparisons_before": comparisons * SORTS_BEFORE,
+        # Made between datetimes, without calling back into Python
+        "comparisons_after": comparisons,
+        "seconds_before": timed(sort_before, rows, seed),
+        "seconds_after": timed(sort_after, rows, seed),
+    }
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(json.dumps({"ofx_sort": measure(args.rows, args.seed)}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
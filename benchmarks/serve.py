@@ -0,0 +1,109 @@
+"""Compares converting over `ofxc serve` with spawning `ofxc convert` per file
+
+`spawn` runs the CLI for the statement and reads the OFX file back, as tools
+do without the server. `serve` POSTs the statement to a warm server, one
+request at a time for the latency and from several clients at once for the
+throughput. Run with `python -m benchmarks.serve --rows 1000 --requests 50`.
+"""
+
+import json
+import subprocess
+import sys
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+from statistics import median, quantiles
+from threading import Thread
+from time import perf_counter
+from typing import Any, Callable
+from urllib.request import Request, urlopen
+
+from benchmarks.generators import GENERATORS
+from benchmarks.workspace import BenchmarkWorkspace
+from ofx_converter.runner import Runner
+from ofx_converter.server import ConversionServer
+
+
+def latencies(function: Callable[[], Any], runs: int) -> dict[str, float]:
+    timings = []
+    for _ in range(runs):
+        start = perf_counter()
+        function()
+        timings.append(perf_counter() - start)
+    p95 = quantiles(timings, n=20)[-1] if runs > 1 else timings[0]
+    return {"runs": runs, "median_ms": median(timings) * 1000, "p95_ms": p95 * 1000}
+
+
+def spawn(account_name: str, month: str) -> Callable[[], bytes]:
+    command = [sys.executable, "-m", "ofx_converter", "convert", account_name]
+    command += ["--from_date", month, "--to_date", month, "--force"]
+    output_path = Runner(account_name).account_config.file_out / f"{month}.ofx"
+
+    def inner() -> bytes:
+        subprocess.run(command, check=True, capture_output=True)
+        return output_path.read_bytes()
+
+    return inner
+
+
+def post(url: str, content: bytes) -> Callable[[], bytes]:
+    def inner() -> bytes:
+        request = Request(url, data=content, method="POST")
+        with urlopen(request) as response:
+            body: bytes = response.read()
+            return body
+
+    return inner
+
+
+def throughput(function: Callable[[], Any], requests: int, clients: int) -> float:
+    start = perf_counter()
+    with ThreadPoolExecutor(clients) as executor:
+        for future in [executor.submit(function) for _ in range(requests)]:
+            future.result()
+    return requests / (perf_counter() - start)
+
+
+def measure(
+    account_name: str, rows: int, requests: int, spawns: int, clients: int, jobs: int
+) -> dict[str, Any]:
+    with BenchmarkWorkspace() as workspace:
+        input_path = workspace.write_statement(account_name, rows)
+        content = input_path.read_bytes()
+        spawned = latencies(spawn(account_name, input_path.stem), spawns)
+        server = ConversionServer("127.0.0.1", 0, jobs)
+        Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            request = post(f"{server.url}/convert/{account_name}", content)
+            served = latencies(request, requests)
+            served["requests_per_second"] = throughput(request, requests, clients)
+        finally:
+            server.shutdown()
+            server.server_close()
+    spawned["requests_per_second"] = 1000 / spawned["median_ms"]
+    return {
+        "account": account_name,
+        "rows": rows,
+        "jobs": jobs,
+        "clients": clients,
+        "spawn": spawned,
+        "serve": served,
+    }
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--account", choices=list(GENERATORS), default="xpi-cartao")
+    parser.add_argument("--rows", type=int, default=1_000)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--spawns", type=int, default=5)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--jobs", type=int, default=1)
+    args = parser.parse_args()
+    results = measure(
+        args.account, args.rows, args.requests, args.spawns, args.clients, args.jobs
+    )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
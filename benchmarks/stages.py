@@ -0,0 +1,128 @@
+"""Times each stage of a conversion on a generated statement
+
+Every stage is run `repeat` times on the same input and the best time is kept.
+Stages that need the output of an earlier one get it prepared outside the timed
+section, so each figure only covers its own work.
+"""
+
+from io import StringIO
+from pathlib import Path
+from re import compile
+from time import perf_counter
+from typing import Any, Callable
+
+from ofx_converter.ofx_client import OfxClient
+from ofx_converter.parsing.account import Account
+from ofx_converter.parsing.account_config import AccountConfig
+from ofx_converter.parsing.builder import TransactionParserFactory
+from ofx_converter.parsing.date_parser import DateParser
+from ofx_converter.parsing.money_parser import MoneyParser
+from ofx_converter.parsing.transaction import Transaction
+from ofx_converter.reader_factory import ReaderFactory
+from ofx_converter.runner import Runner
+
+STAGES = ["reader", "parse", "money", "date", "render", "runner"]
+
+
+def best_time(function: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = perf_counter()
+        function()
+        timings.append(perf_counter() - start)
+    return min(timings)
+
+
+class StageBenchmark:
+    """Benchmarks the stages of one account on one statement file"""
+
+    def __init__(self, account_name: str, input_path: Path, repeat: int = 3) -> None:
+        self.account_name = account_name
+        self.input_path = input_path
+        self.repeat = repeat
+        self.account_config = AccountConfig.load(Account(account_name))
+        self.reader: Any = ReaderFactory().make(self.account_config)
+        self.parser: Any = TransactionParserFactory().make(self.account_config)
+        self._records: list[Any] | None = None
+
+    @property
+    def records(self) -> list[Any]:
+        if self._records is None:
+            self._records = list(self.reader.read_records(self.input_path))
+        return self._records
+
+    @property
+    def is_xp(self) -> bool:
+        return self.account_name.startswith("xpi-")
+
+    def reader_stage(self) -> float:
+        return best_time(
+            lambda: list(self.reader.read_records(self.input_path)), self.repeat
+        )
+
+    def parse_stage(self) -> float:
+        records = self.records
+        return best_time(lambda: self.parser.parse_multiple(records), self.repeat)
+
+    def money_stage(self) -> float | None:
+        if not self.is_xp:
+            return None
+        money_parser: MoneyParser = self.parser._money_parser
+        values = [record[self.parser.VALUE_COL] for record in self.records]
+        return best_time(lambda: [money_parser.parse(v) for v in values], self.repeat)
+
+    def date_stage(self) -> float | None:
+        if not self.is_xp:
+            return None
+        date_regex = compile(self.parser._date_pattern)
+        hour_col = self.parser.HOUR_COL
+        values = [
+            f"{record[self.parser.DATE_COL]} {record.get(hour_col) or '00:00:00'}"
+            for record in self.records
+        ]
+
+        def parse_dates() -> None:
+            # A new parser per run, so the cache starts cold every time
+            date_parser = DateParser(date_regex)
+            for value in values:
+                date_parser.parse(value)
+
+        return best_time(parse_dates, self.repeat)
+
+    def render_stage(self) -> float:
+        transactions: list[Transaction] = [
+            t for t in self.parser.parse_multiple(self.records) if t is not None
+        ]
+        ofx_client = OfxClient(self.account_config)
+        return best_time(
+            lambda: ofx_client.write_ofx_file(transactions, StringIO()), self.repeat
+        )
+
+    def runner_stage(self) -> float:
+        runner = Runner(self.account_name)
+        output_path = runner.output_path_for(self.input_path)
+
+        def convert() -> None:
+            result = runner.convert_file(self.input_path, output_path)
+            if not result.ok:
+                raise RuntimeError(result.error)
+
+        return best_time(convert, self.repeat)
+
+    def run(self, stages: list[str], rows: int) -> list[dict[str, Any]]:
+        results = []
+        for stage in stages:
+            seconds = getattr(self, f"{stage}_stage")()
+            if seconds is None:
+                continue
+            results.append(
+                {
+                    "account": self.account_name,
+                    "rows": rows,
+                    "stage": stage,
+                    "seconds": seconds,
+                    "us_per_row": seconds / rows * 1e6,
+                    "rows_per_second": rows / seconds if seconds > 0 else None,
+                }
+            )
+        return results
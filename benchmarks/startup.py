@@ -0,0 +1,65 @@
+"""Tracks the cold start latency of the ofxc CLI
+
+Runs `python -m ofx_converter --help` several times in fresh interpreters and
+parses `-X importtime` to report the cumulative import cost of the CLI and the
+heavy dependencies it pulls in. Run with `python -m benchmarks.startup`.
+"""
+
+import json
+import subprocess
+import sys
+from argparse import ArgumentParser
+from statistics import median
+from time import perf_counter
+
+HEAVY_MODULES = ["click", "dynaconf", "jinja2", "ofxparse", "dateutil"]
+
+
+def time_help(runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        start = perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", "ofx_converter", "--help"],
+            check=True,
+            capture_output=True,
+        )
+        timings.append(perf_counter() - start)
+    return median(timings)
+
+
+def import_times(module: str) -> dict[str, int]:
+    """Cumulative import time in microseconds per top level module"""
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    times: dict[str, int] = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        name = name.strip()
+        if name == module or name in HEAVY_MODULES:
+            times[name] = int(cumulative)
+    return times
+
+
+def measure(runs: int) -> dict[str, object]:
+    return {
+        "help_seconds": time_help(runs),
+        "import_us": import_times("ofx_converter.cli"),
+    }
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps({"startup": measure(args.runs)}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
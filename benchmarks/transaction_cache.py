@@ -0,0 +1,61 @@
+"""Compares parsing a statement with loading it from the transaction cache
+
+`parse` reads and parses the statement as a conversion without the cache
+does. `cached` digests the statement and loads its transactions from the
+cache entry, as a conversion does after templates or header settings change.
+Run with `python -m benchmarks.transaction_cache --rows 100000`.
+"""
+
+import json
+from argparse import ArgumentParser
+from time import perf_counter
+from typing import Any, Callable
+
+from benchmarks.generators import GENERATORS
+from benchmarks.workspace import BenchmarkWorkspace
+from ofx_converter.runner import Runner
+
+
+def best_time(function: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = perf_counter()
+        function()
+        timings.append(perf_counter() - start)
+    return min(timings)
+
+
+def measure(account_name: str, rows: int, repeat: int) -> dict[str, Any]:
+    with BenchmarkWorkspace() as workspace:
+        input_path = workspace.write_statement(account_name, rows)
+        parsing = Runner(account_name)
+        caching = Runner(account_name, cache=True)
+        transactions = caching._parse_file(input_path)
+        assert caching.transaction_cache is not None
+        entry_path = caching.transaction_cache.entry_path(input_path)
+        parse = best_time(lambda: parsing._parse_file(input_path), repeat)
+        cached = best_time(lambda: caching._parse_file(input_path), repeat)
+        return {
+            "account": account_name,
+            "rows": rows,
+            "transactions": len(transactions),
+            "statement_bytes": input_path.stat().st_size,
+            "entry_bytes": entry_path.stat().st_size,
+            "parse_s": parse,
+            "cached_s": cached,
+            "speedup": parse / cached,
+        }
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--accounts", nargs="+", default=list(GENERATORS))
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    results = [measure(name, args.rows, args.repeat) for name in args.accounts]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Measures the memory used per Transaction, including its cached fields
+
+The slotted Transaction is compared with BaselineTransaction, the previous
+layout keeping its fields and cached properties in an instance dict.
+Run with `python -m benchmarks.transaction_memory --rows 100000`.
+"""
+
+import gc
+import json
+import tracemalloc
+from argparse import ArgumentParser
+from base64 import b64encode
+from datetime import datetime, timedelta
+from decimal import Decimal
+from functools import cached_property
+from hashlib import md5
+from typing import Any, Callable
+from zoneinfo import ZoneInfo
+
+from ofx_converter.parsing.transaction import Transaction
+from ofx_converter.utils import to_ofx_time
+
+
+class BaselineTransaction:
+    """Dict based Transaction layout used before the slotted class"""
+
+    def __init__(
+        self,
+        timestamp: datetime,
+        description: str,
+        value: Decimal | float,
+        balance: Decimal | None = None,
+        transaction_id: str | None = None,
+        tran_type: str | None = None,
+    ) -> None:
+        self.timestamp = timestamp
+        self.description = description
+        self._value = value
+        self._balance = balance
+        self.transaction_id = transaction_id
+        self._tran_type = tran_type
+
+    @cached_property
+    def value(self) -> Decimal:
+        return Decimal(self._value).quantize(Decimal("0.01"))
+
+    @cached_property
+    def balance(self) -> Decimal | None:
+        if self._balance is None:
+            return None
+        return self._balance.quantize(Decimal("0.01"))
+
+    @cached_property
+    def transaction_type(self) -> str:
+        if self._tran_type is not None:
+            return self._tran_type.upper()
+        return "DEBIT" if self.value < 0 else "CREDIT"
+
+    @property
+    def ofx_date(self) -> str:
+        return to_ofx_time(self.timestamp)
+
+    @property
+    def fitid(self) -> str:
+        if self.transaction_id is not None:
+            return self.transaction_id
+        key = "-".join(
+            map(str, [self.timestamp.isoformat(), self.description, self.value])
+        )
+        return b64encode(md5(key.encode()).digest()).decode()
+
+
+def make_transactions(
+    rows: int, transaction_class: Callable[..., Any] = Transaction
+) -> list[Any]:
+    start = datetime(2020, 1, 1, tzinfo=ZoneInfo("America/Sao_Paulo"))
+    descriptions = [f"Store {i}" for i in range(100)]
+    return [
+        transaction_class(
+            start + timedelta(hours=i),
+            descriptions[i % len(descriptions)],
+            Decimal(i % 5000) / 100 - 25,
+            balance=Decimal(i) / 100,
+        )
+        for i in range(rows)
+    ]
+
+
+def touch(transactions: list[Any]) -> None:
+    for t in transactions:
+        t.value, t.balance, t.transaction_type, t.fitid, t.ofx_date
+
+
+def bytes_per_transaction(rows: int, transaction_class: Callable[..., Any]) -> float:
+    gc.collect()
+    tracemalloc.start()
+    transactions = make_transactions(rows, transaction_class)
+    touch(transactions)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del transactions
+    return current / rows
+
+
+def measure(rows: int) -> dict[str, float]:
+    baseline = bytes_per_transaction(rows, BaselineTransaction)
+    slotted = bytes_per_transaction(rows, Transaction)
+    return {
+        "rows": rows,
+        "baseline_bytes_per_transaction": baseline,
+        "bytes_per_transaction": slotted,
+        "ratio": slotted / baseline,
+    }
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+    print(json.dumps({"transaction_memory": measure(args.rows)}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Temporary settings and statement directories for the benchmarks"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from types import TracebackType
+from typing import Any
+
+from benchmarks.generators import GENERATORS
+from ofx_converter.config import clear_settings, reload_settings
+
+ACCOUNTS: dict[str, dict[str, Any]] = {
+    "xpi-conta": {
+        "files": {"format": "csv", "options": {"delimiter": ";"}},
+        "fi": {"id": 348, "org": "Banco XP S.A."},
+        "account": {"branch": "0001", "id": "2187146", "type": "checking"},
+    },
+    "xpi-cartao": {
+        "files": {
+            "format": "csv",
+            "options": {"delimiter": ";", "encoding": "utf-8-sig"},
+        },
+        "fi": {"id": 348, "org": "Banco XP S.A."},
+        "account": {
+            "branch": "0001",
+            "id": "635fc5d6-8a5b-48f3-93ce-a2a0fd6cbfae",
+            "type": "credit-card",
+        },
+    },
+    "nubank-cartao": {
+        "files": {
+            "format": "ofx",
+            "options": {"encoding": "us-ascii", "charset": 1252},
+        },
+        "fi": {"id": 260, "org": "NU PAGAMENTOS S.A."},
+        "account": {
+            "id": "61d7badc-f92a-469a-88b2-41a556f2fb29",
+            "type": "credit-card",
+        },
+    },
+}
+
+
+class BenchmarkWorkspace:
+    """Points the converter settings at generated accounts in a temp dir
+
+    While the workspace is open SETTINGS_FILE_FOR_DYNACONF names a settings
+    file whose accounts read from and write to the temp dir. The previous
+    settings are restored on exit.
+    """
+
+    settings_variable = "SETTINGS_FILE_FOR_DYNACONF"
+
+    def __init__(self, file_options: dict[str, Any] | None = None) -> None:
+        """Creates the workspace directories and settings on enter
+
+        Args:
+            file_options: reader options added to every account, such as
+                {"backend": "native"}
+        """
+        self._file_options = file_options or {}
+        self._dir = TemporaryDirectory(prefix="ofxc-bench-")
+        self.root = Path(self._dir.name)
+        self._previous_settings: str | None = None
+
+    def __enter__(self) -> "BenchmarkWorkspace":
+        accounts = {}
+        for name, account in ACCOUNTS.items():
+            options = {**account["files"].get("options", {}), **self._file_options}
+            files = {
+                **account["files"],
+                "options": options,
+                "in": str(self.input_dir(name)),
+                "out": str(self.root / name / "out"),
+            }
+            self.input_dir(name).mkdir(parents=True)
+            accounts[name] = {**account, "files": files, "lang": "por", "cur": "brl"}
+        settings_path = self.root / "settings.json"
+        converter = {"log": {"level": 40}, "accounts": accounts}
+        content = {"default": {"converter": converter}}
+        settings_path.write_text(json.dumps(content, indent=2))
+        self._previous_settings = os.environ.get(self.settings_variable)
+        os.environ[self.settings_variable] = str(settings_path)
+        reload_settings()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if self._previous_settings is None:
+            os.environ.pop(self.settings_variable, None)
+        else:
+            os.environ[self.settings_variable] = self._previous_settings
+        clear_settings()
+        self._dir.cleanup()
+
+    def input_dir(self, account_name: str) -> Path:
+        return self.root / account_name / "in"
+
+    def write_statement(
+        self,
+        account_name: str,
+        rows: int,
+        seed: int = 0,
+        month: datetime = datetime(2025, 1, 1),
+    ) -> Path:
+        """Generates a statement named after its month in the account input dir"""
+        generator, suffix = GENERATORS[account_name]
+        path = self.input_dir(account_name) / f"{month:%Y-%m}.{suffix}"
+        return generator(path, rows, seed, month)
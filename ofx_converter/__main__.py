@@ -0,0 +1,3 @@
+from ofx_converter.cli import main
+
+main()
@@ -0,0 +1,267 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from time import perf_counter
+
+from ofx_converter.bytes_converter import get_converter, warm_converters
+from ofx_converter.conversion_result import ConversionResult
+from ofx_converter.fitid_index import DedupMode
+from ofx_converter.logger import LogMixin
+from ofx_converter.profiler import NULL_PROFILER
+from ofx_converter.runner import Runner
+
+
+def render_in_worker(account_name: str, content: bytes) -> tuple[str | None, int]:
+    """Executor entry point parsing and rendering one statement
+
+    Returns:
+        The OFX file, None when there are no valid transactions, and the
+        number of transactions
+    """
+    converter = get_converter(account_name)
+    transactions = converter.parse(content)
+    if len(transactions) == 0:
+        return None, 0
+    return converter.render(transactions), len(transactions)
+
+
+@dataclass
+class QueueStats:
+    """Depth of a queue between two stages, sampled on every put"""
+
+    name: str
+    maxsize: int
+    puts: int = 0
+    max_depth: int = 0
+    total_depth: int = 0
+    # Puts that found the queue full and waited for the next stage
+    blocked: int = 0
+
+    @property
+    def mean_depth(self) -> float:
+        return self.total_depth / self.puts if self.puts > 0 else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name} queue: {self.puts} puts, mean depth "
+            f"{self.mean_depth:.2f}/{self.maxsize}, max depth {self.max_depth}, "
+            f"{self.blocked} blocked"
+        )
+
+
+@dataclass
+class _Item:
+    result: ConversionResult
+    output_path: Path
+    start: float
+    content: bytes | None = None
+    ofx: str | None = None
+
+
+class _Queue:
+    """Bounded queue between two stages, recording its depth"""
+
+    def __init__(self, name: str, maxsize: int) -> None:
+        self.queue: asyncio.Queue[_Item | None] = asyncio.Queue(maxsize)
+        self.stats = QueueStats(name, maxsize)
+
+    async def put(self, item: _Item | None) -> None:
+        if item is None:
+            await self.queue.put(item)
+            return
+        if self.queue.full():
+            self.stats.blocked += 1
+        await self.queue.put(item)
+        depth = self.queue.qsize()
+        self.stats.puts += 1
+        self.stats.total_depth += depth
+        self.stats.max_depth = max(self.stats.max_depth, depth)
+
+    async def get(self) -> _Item | None:
+        return await self.queue.get()
+
+
+class AsyncRunner(LogMixin):
+    """Converts files in a pipeline of reader, parse/render and writer stages
+
+    The stages run concurrently and pass files through bounded queues, so the
+    next statement is read and the previous OFX file written while the current
+    one is parsed and rendered in an executor. A full queue blocks the stage
+    before it, which bounds memory to about 2 * queue_size + jobs files.
+    The pipeline doesn't stream, deduplicate, cache or profile, so runners
+    set to do any of those are rejected.
+    """
+
+    def __init__(self, runner: Runner, jobs: int = 1, queue_size: int = 2) -> None:
+        """Wraps a runner, reusing its settings
+
+        Args:
+            runner: runner of the account to convert
+            jobs: number of files parsed and rendered at the same time, in
+                worker processes when more than 1
+            queue_size: files held by each queue between stages
+        """
+        super().__init__()
+        options = {
+            "stream": runner.stream,
+            "dedup": runner.dedup is not DedupMode.OFF,
+            "cache": runner.cache,
+            "profile": runner.profiler is not NULL_PROFILER,
+        }
+        unsupported = [name for name, enabled in options.items() if enabled]
+        if len(unsupported) > 0:
+            raise ValueError(f"AsyncRunner doesn't support {', '.join(unsupported)}")
+        self.runner = runner
+        self.jobs = max(jobs, 1)
+        self.queue_size = queue_size
+        self.stats: dict[str, QueueStats] = {}
+
+    @property
+    def account_name(self) -> str:
+        return self.runner.account.value
+
+    def _make_executor(self) -> Executor:
+        if self.jobs > 1:
+            return ProcessPoolExecutor(
+                self.jobs,
+                initializer=warm_converters,
+                initargs=([self.account_name],),
+            )
+        return ThreadPoolExecutor(1)
+
+    def _make_queue(self, name: str) -> _Queue:
+        queue = _Queue(name, self.queue_size)
+        self.stats[name] = queue.stats
+        return queue
+
+    async def _read(
+        self, conversions: list[tuple[Path, Path]], read_queue: _Queue
+    ) -> None:
+        for input_path, output_path in conversions:
+            result = ConversionResult(self.account_name, input_path)
+            item = _Item(result, output_path, perf_counter())
+            try:
+                item.content = await asyncio.to_thread(input_path.read_bytes)
+            except OSError as e:
+                self.log.error("Failed reading %s: %r", input_path, e)
+                result.error = repr(e)
+            await read_queue.put(item)
+        for _ in range(self.jobs):
+            await read_queue.put(None)
+
+    async def _render(
+        self, executor: Executor, read_queue: _Queue, write_queue: _Queue
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        while (item := await read_queue.get()) is not None:
+            if item.content is not None:
+                try:
+                    item.ofx, item.result.transactions = await loop.run_in_executor(
+                        executor, render_in_worker, self.account_name, item.content
+                    )
+                except Exception as e:
+                    self.log.error(
+                        "Failed converting %s: %r", item.result.input_path, e
+                    )
+                    item.result.error = repr(e)
+                # Only the rendered file is needed from here on
+                item.content = None
+            await write_queue.put(item)
+        await write_queue.put(None)
+
+    async def _write(
+        self, write_queue: _Queue, results: list[ConversionResult]
+    ) -> None:
+        finished = 0
+        while finished < self.jobs:
+            item = await write_queue.get()
+            if item is None:
+                finished += 1
+                continue
+            if item.ofx is not None:
+                try:
+                    await asyncio.to_thread(
+                        self._write_file, item.ofx, item.output_path
+                    )
+                    item.result.output_path = item.output_path
+                except OSError as e:
+                    self.log.error("Failed writing %s: %r", item.output_path, e)
+                    item.result.error = repr(e)
+            item.result.seconds = perf_counter() - item.start
+            results.append(item.result)
+
+    @staticmethod
+    def _write_file(ofx: str, output_path: Path) -> None:
+        partial_path = output_path.with_name(f"{output_path.name}.partial")
+        try:
+            partial_path.write_text(ofx)
+            partial_path.replace(output_path)
+        finally:
+            partial_path.unlink(missing_ok=True)
+
+    async def convert(
+        self, conversions: list[tuple[Path, Path]]
+    ) -> list[ConversionResult]:
+        """Converts files through the pipeline
+
+        A failing file gives a result with its error set and doesn't stop the
+        others. Results are returned in input order.
+
+        Args:
+            conversions: input and output path of each file
+        """
+        read_queue = self._make_queue("read")
+        write_queue = self._make_queue("write")
+        results: list[ConversionResult] = []
+        with self._make_executor() as executor:
+            await asyncio.gather(
+                self._read(conversions, read_queue),
+                *(
+                    self._render(executor, read_queue, write_queue)
+                    for _ in range(self.jobs)
+                ),
+                self._write(write_queue, results),
+            )
+        for stats in self.stats.values():
+            self.log.debug("%s", stats)
+        order = {input_path: i for i, (input_path, _) in enumerate(conversions)}
+        return sorted(results, key=lambda result: order[result.input_path])
+
+    def convert_files(self, files: list[Path]) -> list[ConversionResult]:
+        runner = self.runner
+        conversions = [(file, runner.output_path_for(file)) for file in files]
+        return asyncio.run(self.convert(conversions))
+
+    def run_account_conversion(
+        self,
+        from_date: datetime | None = None,
+        to_date: datetime | None = None,
+        force: bool = False,
+    ) -> list[ConversionResult]:
+        """Converts the account files within the date range through the pipeline
+
+        Args:
+            from_date: month to convert files from
+            to_date: month to convert files until
+            force: convert every file, ignoring the manifest
+        """
+        runner = self.runner
+        files = runner.find_files(from_date, to_date)
+        manifest = runner.load_manifest()
+        pending = runner.pending_files(files, manifest, force)
+        try:
+            converted = {r.input_path: r for r in self.convert_files(pending)}
+            for result in converted.values():
+                manifest.record(result)
+        finally:
+            manifest.save()
+        return [
+            (
+                converted[file]
+                if file in converted
+                else runner.skipped_result(file, manifest)
+            )
+            for file in files
+        ]
@@ -0,0 +1,100 @@
+from datetime import datetime
+from pathlib import Path
+
+from ofx_converter.config import get_settings
+from ofx_converter.conversion_summary import AccountSummary
+from ofx_converter.fitid_index import DedupMode
+from ofx_converter.logger import LogMixin
+from ofx_converter.manifest import ConversionManifest
+from ofx_converter.runner import Runner, convert_many
+
+
+class BatchRunner(LogMixin):
+    """Converts several configured accounts in a single process
+
+    The accounts section of the settings is read once, and files from every
+    account share the same worker pool.
+    """
+
+    def __init__(
+        self,
+        account_names: list[str] | None = None,
+        stream: bool = False,
+        dedup: DedupMode = DedupMode.OFF,
+        cache: bool = False,
+    ) -> None:
+        super().__init__()
+        self.stream = stream
+        self.dedup = dedup
+        self.cache = cache
+        configured = list(get_settings()["accounts"].keys())
+        if account_names is None or len(account_names) == 0:
+            account_names = configured
+        unknown = [name for name in account_names if name not in configured]
+        if len(unknown) > 0:
+            raise ValueError(f"Accounts not configured: {', '.join(unknown)}")
+        self.account_names = account_names
+        self.log.info("Instantiating batch runner with accounts %s", account_names)
+
+    def _make_runners(
+        self, summaries: dict[str, AccountSummary]
+    ) -> dict[str, Runner]:
+        runners: dict[str, Runner] = {}
+        for account_name in self.account_names:
+            try:
+                runners[account_name] = Runner(
+                    account_name, self.stream, dedup=self.dedup, cache=self.cache
+                )
+            except (KeyError, ValueError) as e:
+                self.log.error("Skipping account %s: %s", account_name, e)
+                summaries[account_name].errors.append(str(e))
+        return runners
+
+    def run(
+        self,
+        from_date: datetime | None = None,
+        to_date: datetime | None = None,
+        jobs: int = 1,
+        force: bool = False,
+    ) -> list[AccountSummary]:
+        """Converts all selected accounts and summarizes the results per account
+
+        Args:
+            from_date: month to convert files from
+            to_date: month to convert files until
+            jobs: number of worker processes shared by all accounts
+            force: convert every file, ignoring the manifests
+        """
+        summaries = {name: AccountSummary(name) for name in self.account_names}
+        runners = self._make_runners(summaries)
+        manifests: dict[str, ConversionManifest] = {}
+        conversions: list[tuple[str, Path, Path]] = []
+        for account_name, runner in runners.items():
+            files = runner.find_files(from_date, to_date)
+            manifest = runner.load_manifest()
+            manifests[account_name] = manifest
+            pending = runner.pending_files(files, manifest, force)
+            runner.open_fitid_index()
+            for file in files:
+                if file in pending:
+                    output_path = runner.output_path_for(file)
+                    conversions.append((account_name, file, output_path))
+                else:
+                    summaries[account_name].add(runner.skipped_result(file, manifest))
+        self.log.info(
+            "Converting %i files from %i accounts", len(conversions), len(runners)
+        )
+        try:
+            converted = convert_many(
+                runners, conversions, jobs, self.stream, self.cache
+            )
+            for result in converted:
+                manifests[result.account].record(result)
+                summaries[result.account].add(result)
+        finally:
+            for manifest in manifests.values():
+                manifest.save()
+            for runner in runners.values():
+                runner.save_fitid_index()
+                runner.evict_transaction_cache()
+        return list(summaries.values())
@@ -0,0 +1,90 @@
+from io import StringIO
+from typing import Any
+
+from ofx_converter.config import on_reload
+from ofx_converter.logger import LogMixin, get_logger
+from ofx_converter.ofx_client import OfxClient, header_codec
+from ofx_converter.parsing.account import Account
+from ofx_converter.parsing.account_config import AccountConfig
+from ofx_converter.parsing.builder import TransactionParserFactory
+from ofx_converter.parsing.transaction import Transaction
+from ofx_converter.parsing.transaction_parser import TransactionParser
+from ofx_converter.reader.abstract_reader import AbstractReader
+from ofx_converter.reader_factory import ReaderFactory
+
+logger = get_logger("bytes_converter")
+
+
+class BytesConverter(LogMixin):
+    """Converts in memory statements of one account
+
+    The account settings, reader and parser are built once and reused by
+    every conversion.
+    """
+
+    def __init__(self, account_name: str) -> None:
+        super().__init__()
+        self.account_config = AccountConfig.load(Account(account_name))
+        self.reader: AbstractReader = ReaderFactory().make(self.account_config)
+        self.parser: TransactionParser[Any] = TransactionParserFactory().make(
+            self.account_config
+        )
+        # Rendered files are sent encoded as their header declares
+        self.codec = header_codec(self.account_config.file_options)
+
+    def parse(self, content: bytes) -> list[Transaction]:
+        records = self.reader.read_buffer(content)
+        return [t for t in self.parser.parse_multiple(records) if t is not None]
+
+    def render(self, transactions: list[Transaction]) -> str:
+        buffer = StringIO()
+        OfxClient(self.account_config).write_ofx_file(transactions, buffer)
+        return buffer.getvalue()
+
+    def convert(self, content: bytes) -> str:
+        transactions = self.parse(content)
+        if len(transactions) == 0:
+            raise ValueError("Statement has no valid transactions")
+        return self.render(transactions)
+
+
+_converters: dict[str, BytesConverter] = {}
+on_reload(_converters.clear)
+
+
+def get_converter(account_name: str) -> BytesConverter:
+    """Returns the converter of an account, built once per process"""
+    converter = _converters.get(account_name)
+    if converter is None:
+        converter = BytesConverter(account_name)
+        _converters[account_name] = converter
+    return converter
+
+
+def convert_bytes(account_name: str, content: bytes) -> str:
+    """Converts a statement held in memory, reusing one converter per account
+
+    Args:
+        account_name: account the statement belongs to
+        content: bytes of the CSV or OFX statement
+    """
+    return get_converter(account_name).convert(content)
+
+
+def warm_converters(account_names: list[str]) -> list[str]:
+    """Builds the converters of the accounts ahead of the first conversion
+
+    Returns:
+        Names of the accounts that can be converted
+    """
+    ready = []
+    for account_name in account_names:
+        if account_name not in _converters:
+            try:
+                _converters[account_name] = BytesConverter(account_name)
+            # Reader options missing from the settings raise TypeError
+            except (KeyError, TypeError, ValueError) as e:
+                logger.error("Can't convert account %s: %s", account_name, e)
+                continue
+        ready.append(account_name)
+    return ready
@@ -0,0 +1,258 @@
+from datetime import datetime
+from pathlib import Path
+from time import perf_counter
+from typing import Callable
+
+from click import Choice
+from click import Path as ClickPath
+from click import UsageError, argument, echo, group, option
+
+from ofx_converter.logger import get_logger
+
+logger = get_logger("main")
+
+
+def _parse_window(
+    from_date: str | None, to_date: str | None
+) -> tuple[datetime, datetime]:
+    from dateutil.relativedelta import relativedelta
+
+    current_date = datetime.today()
+
+    parse_date: Callable[[str], datetime] = lambda dt: (datetime.strptime(dt, "%Y-%m"))
+    parsed_from_date: datetime = (
+        parse_date(from_date) if from_date else (current_date - relativedelta(months=5))
+    )
+    parsed_to_date: datetime = parse_date(to_date) if to_date else current_date
+    return parsed_from_date, parsed_to_date
+
+
+@group("main")
+def main() -> None:
+    pass
+
+
+@main.command("convert")
+@argument("account_name", type=str, required=True)
+@option("--from_date", type=str, required=False)
+@option("--to_date", type=str, required=False)
+@option("--jobs", type=int, default=1, show_default=True)
+@option("--force", is_flag=True, default=False)
+@option("--stream", is_flag=True, default=False)
+@option(
+    "--dedup",
+    type=Choice(["off", "drop", "report"]),
+    default="off",
+    show_default=True,
+)
+@option("--cache", is_flag=True, default=False)
+@option("--merge", is_flag=True, default=False)
+@option("--async", "use_async", is_flag=True, default=False)
+@option("--profile", is_flag=True, default=False)
+@option("--profile-output", type=ClickPath(dir_okay=False), required=False)
+def convert(
+    account_name: str,
+    from_date: str | None = None,
+    to_date: str | None = None,
+    jobs: int = 1,
+    force: bool = False,
+    stream: bool = False,
+    dedup: str = "off",
+    cache: bool = False,
+    merge: bool = False,
+    use_async: bool = False,
+    profile: bool = False,
+    profile_output: str | None = None,
+) -> None:
+    """Converts files for a given account name
+
+    Args:
+        account_name: name of the account
+        from_date: month to convert files from
+        to_date: month to convert files until
+        jobs: number of worker processes converting files in parallel
+        force: convert files even if they are unchanged since the last run
+        stream: stream transactions from the reader to the OFX file, keeping
+            memory bounded and the source order
+        dedup: drop or report transactions already converted from another
+            file of the account, converting files one at a time
+        cache: reuse the transactions parsed from unchanged files, so
+            changing templates or header settings skips parsing, unless streaming
+        merge: write a single OFX file with the transactions of every file
+            in the window, in date order
+        use_async: convert in a pipeline reading and writing files while
+            others are parsed, with --jobs parsing processes
+        profile: print the time, rows/s, bytes and peak memory of each stage
+            of every file
+        profile_output: file to dump cProfile stats to, implies --profile
+    """
+    from ofx_converter.fitid_index import DedupMode
+    from ofx_converter.profiler import NULL_PROFILER, NullProfiler, Profiler
+    from ofx_converter.runner import Runner
+
+    if use_async:
+        ignored = {
+            "--stream": stream,
+            "--dedup": dedup != "off",
+            "--cache": cache,
+            "--merge": merge,
+            "--profile": profile or profile_output is not None,
+        }
+        combined = [name for name, enabled in ignored.items() if enabled]
+        if len(combined) > 0:
+            raise UsageError(f"--async can't be combined with {', '.join(combined)}")
+    parsed_from_date, parsed_to_date = _parse_window(from_date, to_date)
+    logger.info(
+        "Converting account %s from date %s to date %s",
+        account_name,
+        parsed_from_date.isoformat(),
+        parsed_to_date.isoformat(),
+    )
+    profiler: Profiler | NullProfiler = NULL_PROFILER
+    if profile or profile_output is not None:
+        pstats_path = Path(profile_output) if profile_output is not None else None
+        profiler = Profiler(pstats_path=pstats_path)
+        if jobs > 1:
+            logger.warning("Profiling converts files in a single process")
+            jobs = 1
+    profiler.start()
+    try:
+        with profiler.stage("settings"):
+            runner = Runner(account_name, stream, profiler, DedupMode(dedup), cache)
+        if merge:
+            results = [runner.run_merged_conversion(parsed_from_date, parsed_to_date)]
+        elif use_async:
+            from ofx_converter.async_runner import AsyncRunner
+
+            results = AsyncRunner(runner, jobs).run_account_conversion(
+                parsed_from_date, parsed_to_date, force
+            )
+        else:
+            results = list(
+                runner.run_account_conversion(
+                    parsed_from_date, parsed_to_date, jobs, force
+                )
+            )
+    finally:
+        profiler.stop()
+    if isinstance(profiler, Profiler):
+        for line in profiler.report():
+            echo(line)
+    failures = [r for r in results if not r.ok]
+    for failure in failures:
+        logger.error("Failed converting %s: %s", failure.input_path, failure.error)
+    if len(failures) > 0:
+        raise SystemExit(1)
+
+
+@main.command("convert-all")
+@argument("account_names", type=str, nargs=-1)
+@option("--from_date", type=str, required=False)
+@option("--to_date", type=str, required=False)
+@option("--jobs", type=int, default=4, show_default=True)
+@option("--force", is_flag=True, default=False)
+@option("--stream", is_flag=True, default=False)
+@option(
+    "--dedup",
+    type=Choice(["off", "drop", "report"]),
+    default="off",
+    show_default=True,
+)
+@option("--cache", is_flag=True, default=False)
+def convert_all(
+    account_names: tuple[str, ...],
+    from_date: str | None = None,
+    to_date: str | None = None,
+    jobs: int = 4,
+    force: bool = False,
+    stream: bool = False,
+    dedup: str = "off",
+    cache: bool = False,
+) -> None:
+    """Converts files for every configured account, or the given subset
+
+    Args:
+        account_names: names of the accounts, all configured accounts if empty
+        from_date: month to convert files from
+        to_date: month to convert files until
+        jobs: number of worker processes shared by all accounts
+        force: convert files even if they are unchanged since the last run
+        stream: stream transactions from the reader to the OFX file, keeping
+            memory bounded and the source order
+        dedup: drop or report transactions already converted from another
+            file of the account, converting files one at a time
+        cache: reuse the transactions parsed from unchanged files, so
+            changing templates or header settings skips parsing, unless streaming
+    """
+    from ofx_converter.batch_runner import BatchRunner
+    from ofx_converter.fitid_index import DedupMode
+
+    parsed_from_date, parsed_to_date = _parse_window(from_date, to_date)
+    logger.info(
+        "Converting accounts from date %s to date %s",
+        parsed_from_date.isoformat(),
+        parsed_to_date.isoformat(),
+    )
+    start = perf_counter()
+    batch_runner = BatchRunner(list(account_names), stream, DedupMode(dedup), cache)
+    summaries = batch_runner.run(parsed_from_date, parsed_to_date, jobs, force)
+    for summary in summaries:
+        logger.info("%s", summary)
+        for error in summary.errors:
+            logger.error("%s: %s", summary.account, error)
+    logger.info(
+        "Converted %i files with %i transactions from %i accounts in %.2fs",
+        sum(s.converted for s in summaries),
+        sum(s.transactions for s in summaries),
+        len(summaries),
+        perf_counter() - start,
+    )
+    if not all(s.ok for s in summaries):
+        raise SystemExit(1)
+
+
+@main.command("watch")
+@argument("account_names", type=str, nargs=-1)
+@option("--interval", type=float, default=0.1, show_default=True)
+@option("--settle", type=float, default=0.3, show_default=True)
+def watch(
+    account_names: tuple[str, ...], interval: float = 0.1, settle: float = 0.3
+) -> None:
+    """Converts new statements as they land in the input directories
+
+    Args:
+        account_names: names of the accounts, all configured accounts if empty
+        interval: seconds between checks of the input directories
+        settle: seconds a new file must stay unchanged before converting it
+    """
+    from ofx_converter.watcher import StatementWatcher
+
+    watcher = StatementWatcher(list(account_names), interval, settle)
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        logger.info("Stopped watching")
+
+
+@main.command("serve")
+@option("--host", type=str, default="127.0.0.1", show_default=True)
+@option("--port", type=int, default=8080, show_default=True)
+@option("--jobs", type=int, default=1, show_default=True)
+def serve(host: str = "127.0.0.1", port: int = 8080, jobs: int = 1) -> None:
+    """Serves conversions over HTTP: POST a statement to /convert/<account>
+
+    Args:
+        host: address to listen on
+        port: port to listen on
+        jobs: number of worker processes converting statements in parallel
+    """
+    from ofx_converter.server import ConversionServer
+
+    server = ConversionServer(host, port, jobs)
+    logger.info("Serving conversions on %s", server.url)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Stopped serving")
+    finally:
+        server.server_close()
@@ -1,8 +1,44 @@
-from dynaconf import Dynaconf, LazySettings
+from typing import TYPE_CHECKING, Any, Callable
 
+if TYPE_CHECKING:
+    from dynaconf import LazySettings
 
-def get_settings() -> LazySettings:
-    settings = Dynaconf(use_dotenv=True, environments=True)
-    return settings["converter"]
+_settings: "LazySettings | None" = None
+_reload_hooks: list[Callable[[], None]] = []
 
-settings = get_settings()
+
+def get_settings() -> "LazySettings":
+    """Returns the converter settings, loading them once per process"""
+    global _settings
+    if _settings is None:
+        from dynaconf import Dynaconf
+
+        settings = Dynaconf(use_dotenv=True, environments=True)
+        _settings = settings["converter"]
+    return _settings
+
+
+def on_reload(hook: Callable[[], None]) -> None:
+    """Registers a callback that drops state derived from the settings"""
+    _reload_hooks.append(hook)
+
+
+def clear_settings() -> None:
+    """Drops the loaded settings, so the next access reads them again"""
+    global _settings
+    _settings = None
+    for hook in _reload_hooks:
+        hook()
+
+
+def reload_settings() -> "LazySettings":
+    """Reloads the settings from disk, for long running modes"""
+    clear_settings()
+    return get_settings()
+
+
+def __getattr__(name: str) -> Any:
+    # Settings are loaded on first access rather than on import
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
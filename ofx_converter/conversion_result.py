@@ -0,0 +1,17 @@
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass
+class ConversionResult:
+    account: str
+    input_path: Path
+    output_path: Path | None = None
+    transactions: int = 0
+    seconds: float = 0.0
+    error: str | None = None
+    skipped: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
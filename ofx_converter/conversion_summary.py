@@ -0,0 +1,40 @@
+from dataclasses import dataclass, field
+
+from ofx_converter.conversion_result import ConversionResult
+
+
+@dataclass
+class AccountSummary:
+    account: str
+    files: int = 0
+    converted: int = 0
+    failed: int = 0
+    skipped: int = 0
+    transactions: int = 0
+    seconds: float = 0.0
+    errors: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return len(self.errors) == 0
+
+    def add(self, result: ConversionResult) -> None:
+        self.files += 1
+        if result.skipped:
+            self.skipped += 1
+            return
+        self.transactions += result.transactions
+        self.seconds += result.seconds
+        if result.error is not None:
+            self.failed += 1
+            self.errors.append(f"{result.input_path}: {result.error}")
+        elif result.output_path is not None:
+            self.converted += 1
+
+    def __str__(self) -> str:
+        return (
+            f"{self.account}: {self.converted}/{self.files} files converted, "
+            f"{self.skipped} up to date, {self.failed} failed, "
+            f"{self.transactions} transactions "
+            f"in {self.seconds:.2f}s"
+        )
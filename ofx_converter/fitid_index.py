@@ -0,0 +1,155 @@
+import struct
+from enum import Enum
+from hashlib import blake2b
+from pathlib import Path
+from typing import Iterable
+
+from ofx_converter.logger import LogMixin
+from ofx_converter.parsing.account_config import AccountConfig
+
+INDEX_MAGIC = b"OFXCFID1"
+DIGEST_SIZE = 16
+
+# Magic, hasher key length, source count and entry count
+_header = struct.Struct(f"<{len(INDEX_MAGIC)}sHII")
+_source_length = struct.Struct("<H")
+# FITID digest and index of the source file it was first converted from
+_entry = struct.Struct(f"<{DIGEST_SIZE}sI")
+
+
+class DedupMode(Enum):
+    OFF = "off"
+    DROP = "drop"
+    REPORT = "report"
+
+
+def fitid_digest(fitid: str) -> bytes:
+    return blake2b(fitid.encode(), digest_size=DIGEST_SIZE).digest()
+
+
+class FitidIndex(LogMixin):
+    """Persistent set of the FITIDs already written for an account
+
+    Each FITID is kept as a 16 byte blake2b digest mapped to the input file it
+    was first converted from, so a transaction repeated by an overlapping
+    statement is found in O(1) without reading earlier outputs. Transactions
+    repeated within the same input file are not duplicates.
+
+    On disk the index is a header, the list of source files and fixed size
+    records of digest and source, about 20 bytes per transaction.
+    """
+
+    file_name = ".ofxc-fitids.bin"
+
+    def __init__(self, account_config: AccountConfig) -> None:
+        super().__init__()
+        self._path = account_config.file_out / self.file_name
+        hasher = account_config.fitid_hasher
+        # FITIDs built by another hash can't match, so the index starts over
+        self._hasher_key = f"{hasher.algorithm}-{hasher.digest_size}"
+        self._owners: dict[bytes, int] = {}
+        self._sources: list[str] = []
+        self._source_ids: dict[str, int] = {}
+        self._dirty = False
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def __len__(self) -> int:
+        return len(self._owners)
+
+    def __contains__(self, digest: bytes) -> bool:
+        return digest in self._owners
+
+    @classmethod
+    def load(cls, account_config: AccountConfig) -> "FitidIndex":
+        index = cls(account_config)
+        if not index.path.exists():
+            return index
+        try:
+            index._read(index.path.read_bytes())
+        except (OSError, ValueError, struct.error, UnicodeDecodeError):
+            index.log.warning("Ignoring unreadable FITID index %s", index.path)
+            index._owners, index._sources, index._source_ids = {}, [], {}
+        return index
+
+    def _read(self, content: bytes) -> None:
+        magic, key_length, source_count, entry_count = _header.unpack_from(content)
+        if magic != INDEX_MAGIC:
+            raise ValueError(f"Not a FITID index: {self.path}")
+        position = _header.size
+        hasher_key = content[position : position + key_length].decode()
+        position += key_length
+        if hasher_key != self._hasher_key:
+            self.log.info("FITID hash changed, ignoring index %s", self.path)
+            self._dirty = True
+            return
+        for _ in range(source_count):
+            (length,) = _source_length.unpack_from(content, position)
+            position += _source_length.size
+            self._add_source(content[position : position + length].decode())
+            position += length
+        entries_end = position + entry_count * _entry.size
+        if len(content) != entries_end:
+            raise ValueError(f"Truncated FITID index: {self.path}")
+        owners = dict(_entry.iter_unpack(content[position:entries_end]))
+        if len(owners) > 0 and max(owners.values()) >= source_count:
+            raise ValueError(f"Invalid source in FITID index: {self.path}")
+        self._owners = owners
+
+    def _add_source(self, source: str) -> int:
+        source_id = self._source_ids.get(source)
+        if source_id is None:
+            source_id = len(self._sources)
+            self._sources.append(source)
+            self._source_ids[source] = source_id
+        return source_id
+
+    def owner(self, digest: bytes) -> str | None:
+        """Input file a FITID digest was first converted from, if any"""
+        source_id = self._owners.get(digest)
+        return None if source_id is None else self._sources[source_id]
+
+    def replace_source(self, source: Path, digests: Iterable[bytes]) -> None:
+        """Records the FITIDs written for an input file
+
+        Digests of an earlier conversion of the same file are dropped first,
+        and digests already owned by another file keep their owner.
+
+        Args:
+            source: input file the FITIDs were converted from
+            digests: digests of the FITIDs written to its output
+        """
+        owners = self._owners
+        source_id = self._source_ids.get(str(source))
+        if source_id is None:
+            source_id = self._add_source(str(source))
+        else:
+            owners = {d: s for d, s in owners.items() if s != source_id}
+        for digest in digests:
+            owners.setdefault(digest, source_id)
+        self._owners = owners
+        self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        # Sources without entries left are dropped and the ids renumbered
+        used = sorted(set(self._owners.values()))
+        renumber = {source_id: i for i, source_id in enumerate(used)}
+        hasher_key = self._hasher_key.encode()
+        parts = [
+            _header.pack(INDEX_MAGIC, len(hasher_key), len(used), len(self._owners)),
+            hasher_key,
+        ]
+        for source_id in used:
+            source = self._sources[source_id].encode()
+            parts.append(_source_length.pack(len(source)))
+            parts.append(source)
+        pack = _entry.pack
+        parts.extend(pack(d, renumber[s]) for d, s in self._owners.items())
+        temp_path = self.path.with_suffix(".tmp")
+        temp_path.write_bytes(b"".join(parts))
+        temp_path.replace(self.path)
+        self._dirty = False
@@ -1,16 +1,42 @@
-import sys
 from abc import ABC
-from logging import INFO, Formatter, Logger, StreamHandler
+from functools import cache
+from logging import INFO, Formatter, Handler, Logger, StreamHandler, getLogger
 
-from ofx_converter.config import get_settings
+from ofx_converter.config import get_settings, on_reload
 
+_loggers: dict[str, Logger] = {}
 
-def get_logger(name: str, level: int = INFO) -> Logger:
-    logger = Logger(name, level)
+
+@cache
+def get_handler() -> Handler:
     formatter = Formatter("%(asctime)s - %(levelname)s - %(name)s - %(message)s")
     handler = StreamHandler()
     handler.setFormatter(formatter)
-    logger.addHandler(handler)
+    return handler
+
+
+@cache
+def default_level() -> int:
+    default_level = get_settings().get("log").get("level")
+    if default_level is not None:
+        return int(default_level)
+    return INFO
+
+
+on_reload(default_level.cache_clear)
+
+
+def get_logger(name: str, level: int = INFO) -> Logger:
+    """Returns the named logger, creating it with the shared handler once"""
+    logger = _loggers.get(name)
+    if logger is None:
+        logger = getLogger(name)
+        logger.setLevel(level)
+        logger.propagate = False
+        logger.addHandler(get_handler())
+        _loggers[name] = logger
+    elif logger.level != level:
+        logger.setLevel(level)
     return logger
 
 
@@ -20,11 +46,7 @@ class LogMixin(ABC):
         super().__init__()
         self._level = level
         if level is None:
-            default_level = get_settings().get("log").get("level")
-            if default_level is not None:
-                level = int(default_level)
-            else:
-                level = INFO
+            level = default_level()
         self._log = get_logger(self.__class__.__name__, level)
 
     @property
@@ -0,0 +1,157 @@
+import json
+from hashlib import file_digest as hash_file
+from hashlib import sha256
+from pathlib import Path
+from typing import Any, Mapping
+
+from ofx_converter.conversion_result import ConversionResult
+from ofx_converter.logger import LogMixin
+from ofx_converter.parsing.account_config import AccountConfig
+
+MANIFEST_VERSION = 1
+TEMPLATES_PATH = Path(__file__).parent / "templates"
+
+
+def file_digest(path: Path) -> str:
+    with open(path, "rb") as file_obj:
+        return hash_file(file_obj, "sha256").hexdigest()
+
+
+class ConversionManifest(LogMixin):
+    """Records which input files were converted, to skip them on later runs
+
+    The manifest lives next to the converted files and is only valid for the
+    account settings, templates and run options it was built with.
+    """
+
+    file_name = ".ofxc-manifest.json"
+
+    def __init__(
+        self,
+        account_config: AccountConfig,
+        options: Mapping[str, Any] | None = None,
+    ) -> None:
+        """Starts an empty manifest
+
+        Args:
+            account_config: settings of the account
+            options: run options changing the output files, such as dedup
+        """
+        super().__init__()
+        self._path = account_config.file_out / self.file_name
+        self._fingerprint = self.make_fingerprint(account_config, options)
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._stamps: dict[str, dict[str, Any]] = {}
+        self._dirty = False
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def fingerprint(self) -> str:
+        return self._fingerprint
+
+    @staticmethod
+    def make_fingerprint(
+        account_config: AccountConfig, options: Mapping[str, Any] | None = None
+    ) -> str:
+        digest = sha256(str(MANIFEST_VERSION).encode())
+        settings = json.dumps(account_config.raw_settings, sort_keys=True, default=str)
+        digest.update(settings.encode())
+        digest.update(json.dumps(dict(options or {}), sort_keys=True).encode())
+        for template in sorted(TEMPLATES_PATH.rglob("*.ofx")):
+            digest.update(str(template.relative_to(TEMPLATES_PATH)).encode())
+            digest.update(template.read_bytes())
+        return digest.hexdigest()
+
+    @classmethod
+    def load(
+        cls, account_config: AccountConfig, options: Mapping[str, Any] | None = None
+    ) -> "ConversionManifest":
+        manifest = cls(account_config, options)
+        if not manifest.path.exists():
+            return manifest
+        try:
+            with open(manifest.path, "r") as file_obj:
+                content = json.load(file_obj)
+        except (OSError, ValueError):
+            manifest.log.warning("Ignoring unreadable manifest %s", manifest.path)
+            return manifest
+        if content.get("fingerprint") != manifest.fingerprint:
+            manifest.log.info(
+                "Account settings, templates or run options changed, ignoring manifest"
+            )
+            manifest._dirty = True
+            return manifest
+        manifest._entries = content.get("files", {})
+        return manifest
+
+    def is_up_to_date(self, input_path: Path) -> bool:
+        entry = self._entries.get(str(input_path))
+        if entry is None:
+            return False
+        output = entry.get("output")
+        if output is not None and not Path(output).exists():
+            return False
+        try:
+            stat = input_path.stat()
+        except OSError:
+            return False
+        if stat.st_size != entry["size"]:
+            return False
+        if stat.st_mtime_ns == entry["mtime_ns"]:
+            return True
+        try:
+            if file_digest(input_path) != entry["sha256"]:
+                return False
+        except OSError:
+            return False
+        entry["mtime_ns"] = stat.st_mtime_ns
+        self._dirty = True
+        return True
+
+    def output_for(self, input_path: Path) -> Path | None:
+        entry = self._entries.get(str(input_path), {})
+        output = entry.get("output")
+        return Path(output) if output is not None else None
+
+    def stamp(self, input_path: Path) -> str:
+        """Captures the size, mtime and digest of a file about to be converted
+
+        The stamp is what gets recorded once the conversion succeeds, so a file
+        rewritten while it was converted doesn't match the manifest later.
+
+        Returns:
+            The hex sha256 of the file
+        """
+        stat = input_path.stat()
+        digest = file_digest(input_path)
+        self._stamps[str(input_path)] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": digest,
+        }
+        return digest
+
+    def record(self, result: ConversionResult) -> None:
+        stamp = self._stamps.pop(str(result.input_path), None)
+        if not result.ok or result.skipped or stamp is None:
+            return
+        output = str(result.output_path) if result.output_path else None
+        self._entries[str(result.input_path)] = {**stamp, "output": output}
+        self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        content = {
+            "version": MANIFEST_VERSION,
+            "fingerprint": self.fingerprint,
+            "files": self._entries,
+        }
+        temp_path = self.path.with_suffix(".tmp")
+        with open(temp_path, "w") as file_obj:
+            json.dump(content, file_obj, indent=2, sort_keys=True)
+        temp_path.replace(self.path)
+        self._dirty = False
@@ -1,45 +1,60 @@
 from datetime import datetime
-from functools import reduce
-from typing import Callable
+from io import StringIO
+from operator import attrgetter
+from shutil import copyfileobj
+from tempfile import SpooledTemporaryFile
+from typing import Any, Callable, Iterable, Mapping, TextIO
 
-from jinja2 import BaseLoader, ChoiceLoader, Environment, PackageLoader, Template
+from jinja2 import BaseLoader, Template
 
 from ofx_converter.logger import LogMixin
 from ofx_converter.parsing.account import Account
 from ofx_converter.parsing.account_config import AccountConfig
 from ofx_converter.parsing.transaction import Transaction
+from ofx_converter.profiler import NULL_PROFILER, NullProfiler, Profiler
+from ofx_converter.statement_bounds import StatementBounds
+from ofx_converter.template_registry import get_template_registry
 from ofx_converter.utils import to_ofx_time
 
+_timestamp = attrgetter("timestamp")
+
+
+def header_codec(file_options: Mapping[str, Any]) -> str:
+    """Python codec of the ENCODING and CHARSET the OFX header declares
+
+    Args:
+        file_options: file options of the account, giving the header values
+    """
+    encoding = str(file_options.get("encoding") or "UTF-8").upper()
+    if encoding.replace("-", "") != "USASCII":
+        return "utf-8"
+    charset = file_options.get("charset")
+    if charset is None:
+        return "ascii"
+    return "iso-8859-1" if str(charset) == "8859-1" else f"cp{charset}"
+
 
 class OfxClient(LogMixin):
     _header_template = "ofx_header.ofx"
     _footer_template = "ofx_footer.ofx"
     _transaction_template = "ofx_transaction.ofx"
+    _spool_size = 8 * 1024 * 1024
 
-    def __init__(self, account_config: AccountConfig) -> None:
+    def __init__(
+        self,
+        account_config: AccountConfig,
+        profiler: Profiler | NullProfiler = NULL_PROFILER,
+    ) -> None:
         super().__init__()
         self._account_config = account_config
+        self._profiler = profiler
         self.dtnow = datetime.now().astimezone()
-        self._template_reader = Environment(loader=self._make_template_loader())
+        self._template_path = account_config.account_type.template_path()
+        self._templates = get_template_registry()
         self.log.info("Creating ofx client for account %s", self._account)
 
     def _make_template_loader(self) -> BaseLoader:
-        account_type_template_path = self._account_config.account_type.template_path()
-        template_paths = [f"templates/{account_type_template_path}", "templates"]
-        loaders = []
-        base_package = "ofx_converter"
-        for path in template_paths:
-            try:
-                loader = PackageLoader(base_package, path)
-                loaders.append(loader)
-            except ValueError:
-                self.log.warning(
-                    "PackageLoader instantiation failed for path %s in package %s",
-                    path,
-                    base_package,
-                )
-        loader = ChoiceLoader(loaders)
-        return loader
+        return self._templates.make_loader(self._template_path)
 
     @property
     def _account(self) -> Account:
@@ -47,24 +62,32 @@ class OfxClient(LogMixin):
 
     @property
     def header_template(self) -> Template:
-        return self._template_reader.get_template(self._header_template)
+        with self._profiler.stage("templates"):
+            return self._templates.get_template(
+                self._template_path, self._header_template
+            )
 
     @property
     def transaction_template(self) -> Template:
-        return self._template_reader.get_template(self._transaction_template)
+        with self._profiler.stage("templates"):
+            return self._templates.get_template(
+                self._template_path, self._transaction_template
+            )
 
     @property
     def footer_template(self) -> Template:
-        return self._template_reader.get_template(self._footer_template)
+        with self._profiler.stage("templates"):
+            return self._templates.get_template(
+                self._template_path, self._footer_template
+            )
 
     @property
     def ofx_now(self) -> str:
         return to_ofx_time(self.dtnow)
 
-    def make_ofx_header(self, transactions: list[Transaction]) -> str:
-        self.log.info("Making OFX header for account %s", self._account)
-        dtstart = transactions[0].ofx_date
-        dtend = transactions[-1].ofx_date
+    def _header_payload(self, first: Transaction, last: Transaction) -> dict[str, Any]:
+        dtstart = first.ofx_date
+        dtend = last.ofx_date
         file_options = self._account_config.file_options
         encoding, charset = file_options.get("encoding"), file_options.get("charset")
         maybe_as_upper: Callable[[str | None], str | None] = lambda v: (
@@ -87,19 +110,43 @@ class OfxClient(LogMixin):
             "charset": maybe_as_upper(charset),
             "accttype_msgserver": self._account_config.account_type.msg_server(),
         }
+        return payload
+
+    @staticmethod
+    def sort_transactions(transactions: Iterable[Transaction]) -> list[Transaction]:
+        """Orders transactions by timestamp, keeping ties in their order
+
+        The header, body and footer are all built from this single order:
+        the first and last transactions give the statement dates and the
+        last one the balance.
+        """
+        return sorted(transactions, key=_timestamp)
+
+    def make_ofx_header(self, transactions: list[Transaction]) -> str:
+        """Renders the header, dated from the first to the last transaction
+
+        Transactions may be in any order, they are sorted to find the dates.
+        write_ofx_file doesn't use this, it sorts once for the whole file.
+        """
+        self.log.info("Making OFX header for account %s", self._account)
+        sorted_transactions = self.sort_transactions(transactions)
+        payload = self._header_payload(sorted_transactions[0], sorted_transactions[-1])
         header = self.header_template.render(**payload)
         return header
 
+    @staticmethod
+    def _transaction_payload(t: Transaction) -> dict[str, Any]:
+        return {
+            "trn_type": t.transaction_type,
+            "dt_posted": t.ofx_date,
+            "amount": t.value,
+            "desc": t.description,
+            "fitid": t.fitid,
+        }
+
     def make_ofx_transaction(self, template: Template) -> Callable[[Transaction], str]:
         def inner(t: Transaction) -> str:
-            payload = {
-                "trn_type": t.transaction_type,
-                "dt_posted": t.ofx_date,
-                "amount": t.value,
-                "desc": t.description,
-                "fitid": t.fitid,
-            }
-            trn_formatted = template.render(**payload)
+            trn_formatted = template.render(**self._transaction_payload(t))
             return trn_formatted
 
         return inner
@@ -115,26 +162,93 @@ class OfxClient(LogMixin):
         )
         return ofx_transactions
 
-    def make_ofx_footer(self, transactions: list[Transaction]) -> str:
-        self.log.info("Making OFX footer for account %s", self._account)
-        sorted_transactions = sorted(transactions)
-        dtend = sorted_transactions[-1].ofx_date
-        last_balance = sorted_transactions[-1].balance
+    def _footer_payload(self, last: Transaction) -> dict[str, Any]:
+        dtend = last.ofx_date
+        last_balance = last.balance
         payload = {
             "last_balance": last_balance,
             "dt_end": dtend,
             "accttype_abbreviation": self._account_config.account_type.abbreviation(),
             "accttype_msgserver": self._account_config.account_type.msg_server(),
         }
-        footer = self.footer_template.render(**payload)
+        return payload
+
+    def make_ofx_footer(self, transactions: list[Transaction]) -> str:
+        """Renders the footer with the balance of the last transaction
+
+        Transactions may be in any order, they are sorted to find the last one.
+        """
+        self.log.info("Making OFX footer for account %s", self._account)
+        last = self.sort_transactions(transactions)[-1]
+        footer = self.footer_template.render(**self._footer_payload(last))
         return footer
 
+    def write_ofx_file(self, transactions: list[Transaction], file_obj: TextIO) -> None:
+        """Streams the OFX file into an open text file
+
+        Transactions are written sorted by timestamp. Header, transactions and
+        footer are rendered chunk by chunk through the templates' generate
+        API, so the file is never held in memory.
+
+        Args:
+            transactions: transactions to write
+            file_obj: text file to write to
+        """
+        self.log.info("Writing OFX file for account %s", self._account)
+        with self._profiler.stage("sort"):
+            sorted_transactions = self.sort_transactions(transactions)
+        first, last = sorted_transactions[0], sorted_transactions[-1]
+        with self._profiler.stage("render"):
+            header_payload = self._header_payload(first, last)
+            file_obj.writelines(self.header_template.generate(**header_payload))
+            template = self.transaction_template
+            for t in sorted_transactions:
+                file_obj.write("\n")
+                file_obj.writelines(template.generate(**self._transaction_payload(t)))
+            file_obj.write("\n")
+            footer_payload = self._footer_payload(last)
+            file_obj.writelines(self.footer_template.generate(**footer_payload))
+
+    def write_ofx_stream(
+        self, transactions: Iterable[Transaction], file_obj: TextIO
+    ) -> int:
+        """Streams transactions into an OFX file in a single pass
+
+        Transactions are rendered in the order they arrive into a spooled
+        body, keeping only the statement bounds needed by the header and
+        footer. Nothing is written when there are no transactions.
+
+        Args:
+            transactions: transactions to write, consumed once
+            file_obj: text file to write to
+
+        Returns:
+            Number of transactions written
+        """
+        self.log.info("Streaming OFX file for account %s", self._account)
+        bounds = StatementBounds()
+        template = self.transaction_template
+        with SpooledTemporaryFile(max_size=self._spool_size, mode="w+") as body:
+            with self._profiler.stage("render"):
+                for t in transactions:
+                    bounds.add(t)
+                    body.write("\n")
+                    body.writelines(template.generate(**self._transaction_payload(t)))
+                if bounds.first is None or bounds.last is None:
+                    return 0
+                header_payload = self._header_payload(bounds.first, bounds.last)
+                file_obj.writelines(self.header_template.generate(**header_payload))
+            with self._profiler.stage("write"):
+                body.seek(0)
+                copyfileobj(body, file_obj)
+        with self._profiler.stage("render"):
+            file_obj.write("\n")
+            footer_payload = self._footer_payload(bounds.last)
+            file_obj.writelines(self.footer_template.generate(**footer_payload))
+        return bounds.count
+
     def make_ofx_file(self, transactions: list[Transaction]) -> str:
         self.log.info("Making OFX file for account %s", self._account)
-        reducer = lambda x, y: x + "\n" + y
-        sorted_transactions = sorted(transactions)
-        body = reduce(reducer, self.make_ofx_transactions(transactions))
-        header = self.make_ofx_header(sorted_transactions)
-        footer = self.make_ofx_footer(sorted_transactions)
-        total_file = reduce(reducer, [header, body, footer])
-        return total_file
+        buffer = StringIO()
+        self.write_ofx_file(transactions, buffer)
+        return buffer.getvalue()
@@ -1,17 +1,88 @@
+import json
 from pathlib import Path
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Mapping
 
-from ofx_converter.config import get_settings
+from ofx_converter.config import get_settings, on_reload
 from ofx_converter.parsing.account import Account
 from ofx_converter.parsing.account_type import AccountType
+from ofx_converter.parsing.fitid import FitidHasher
 from ofx_converter.utils import FileType
 
 
 class AccountConfig:
+    """Immutable snapshot of an account's settings
+
+    Every field is resolved once when the snapshot is taken, so reading it
+    costs no settings lookups.
+    """
+
+    __slots__ = (
+        "_account",
+        "_raw_settings",
+        "_account_type",
+        "_file_format",
+        "_file_options",
+        "_file_in",
+        "_file_out",
+        "_recursive",
+        "_fiorg",
+        "_fiid",
+        "_bankid",
+        "_branchid",
+        "_acctid",
+        "_accttype",
+        "_lang",
+        "_cur",
+        "_fitid_hasher",
+    )
+    _snapshots: dict[Account, "AccountConfig"] = {}
+
     def __init__(self, account: Account) -> None:
+        account_settings = get_settings()["accounts"][account.value]
+        raw_settings = json.loads(json.dumps(account_settings, default=str))
+        files, fi, account_info = (
+            account_settings["files"],
+            account_settings["fi"],
+            account_settings["account"],
+        )
         self._account = account
-        self._settings = get_settings()
-        self._account_settings = self._settings["accounts"][account.value]
+        self._raw_settings = raw_settings
+        self._account_type = AccountType(account_info["type"])
+        self._file_format = FileType(files["format"])
+        self._file_options = MappingProxyType(dict(files.get("options", {})))
+        self._file_in = Path(files["in"])
+        self._file_out = Path(files["out"])
+        self._recursive = bool(files.get("recursive", False))
+        self._fiorg: str = fi["org"]
+        self._fiid: str = fi["id"]
+        self._bankid = str(fi["id"]).rjust(4, "0")
+        self._branchid: str | None = account_info.get("branch")
+        self._acctid: str = account_info["id"]
+        self._accttype = str(account_info["type"]).upper()
+        self._lang = str(account_settings["lang"]).upper()
+        self._cur = str(account_settings["cur"]).upper()
+        fitid = account_settings.get("fitid", {})
+        self._fitid_hasher = FitidHasher(
+            fitid.get("hash", FitidHasher.MD5), int(fitid.get("digest_size", 12))
+        )
+
+    @classmethod
+    def load(cls, account: Account) -> "AccountConfig":
+        """Returns the cached snapshot for the account, taking it if needed"""
+        snapshot = cls._snapshots.get(account)
+        if snapshot is None:
+            snapshot = cls(account)
+            cls._snapshots[account] = snapshot
+        return snapshot
+
+    @classmethod
+    def clear_snapshots(cls) -> None:
+        cls._snapshots.clear()
+
+    @property
+    def raw_settings(self) -> dict[str, Any]:
+        return json.loads(json.dumps(self._raw_settings))
 
     @property
     def account(self) -> Account:
@@ -19,54 +90,63 @@ class AccountConfig:
 
     @property
     def account_type(self) -> AccountType:
-        account_type_str = self._account_settings.account.type
-        account_type = AccountType(account_type_str)
-        return account_type
+        return self._account_type
 
     @property
     def file_format(self) -> FileType:
-        return FileType(self._account_settings["files"]["format"])
+        return self._file_format
 
     @property
-    def file_options(self) -> dict[str, Any]:
-        return self._account_settings["files"]["options"]
+    def file_options(self) -> Mapping[str, Any]:
+        return self._file_options
 
     @property
     def file_in(self) -> Path:
-        return Path(self._account_settings["files"]["in"])
+        return self._file_in
 
     @property
     def file_out(self) -> Path:
-        return Path(self._account_settings["files"]["out"])
+        return self._file_out
+
+    @property
+    def recursive(self) -> bool:
+        return self._recursive
 
     @property
     def fiorg(self) -> str:
-        return self._account_settings["fi"]["org"]
+        return self._fiorg
 
     @property
     def fiid(self) -> str:
-        return self._account_settings["fi"]["id"]
+        return self._fiid
 
     @property
     def bankid(self) -> str:
-        return str(self._account_settings["fi"]["id"]).rjust(4, "0")
+        return self._bankid
 
     @property
     def branchid(self) -> str | None:
-        return self._account_settings["account"].get("branch")
+        return self._branchid
 
     @property
     def acctid(self) -> str:
-        return self._account_settings["account"]["id"]
+        return self._acctid
 
     @property
     def accttype(self) -> str:
-        return str(self._account_settings["account"]["type"]).upper()
+        return self._accttype
 
     @property
     def lang(self) -> str:
-        return str(self._account_settings["lang"]).upper()
+        return self._lang
 
     @property
     def cur(self) -> str:
-        return str(self._account_settings["cur"]).upper()
+        return self._cur
+
+    @property
+    def fitid_hasher(self) -> FitidHasher:
+        return self._fitid_hasher
+
+
+on_reload(AccountConfig.clear_snapshots)
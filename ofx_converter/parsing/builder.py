@@ -1,32 +1,40 @@
+from importlib import import_module
 from typing import Any, Type
 
 from ofx_converter.logger import LogMixin
 from ofx_converter.parsing.account import Account
 from ofx_converter.parsing.account_config import AccountConfig
-from ofx_converter.parsing.nubank_transaction_parser import NubankTransactionParser
-from ofx_converter.parsing.ofx_transaction_parser import OfxTransactionParser
 from ofx_converter.parsing.transaction_parser import TransactionParser
-from ofx_converter.parsing.xp_transaction_parser import (
-    XPCardTransactionParser,
-    XPTransactionParser,
-)
 from ofx_converter.utils import FileType
 
 
 class TransactionParserFactory(LogMixin):
 
-    _parser_map: dict[Account, Type[TransactionParser[Any]]] = {
-        Account.XP_CONTA: XPTransactionParser,
-        Account.XP_CARTAO: XPCardTransactionParser,
-        Account.XP_INVESTIMENTOS: XPTransactionParser,
-        Account.NUBANK_CARD: NubankTransactionParser,
+    # Parsers are imported on first use, so an account only loads its own
+    _parser_map: dict[Account, str] = {
+        Account.XP_CONTA: "xp_transaction_parser.XPTransactionParser",
+        Account.XP_CARTAO: "xp_transaction_parser.XPCardTransactionParser",
+        Account.XP_INVESTIMENTOS: "xp_transaction_parser.XPTransactionParser",
+        Account.NUBANK_CARD: "nubank_transaction_parser.NubankTransactionParser",
     }
+    _default_ofx_parser = "ofx_transaction_parser.OfxTransactionParser"
 
-    def make(self, account_config: AccountConfig) -> TransactionParser[Any]:
+    @staticmethod
+    def _load(path: str) -> Type[TransactionParser[Any]]:
+        module_name, class_name = path.rsplit(".", 1)
+        module = import_module(f"ofx_converter.parsing.{module_name}")
+        parser_class: Type[TransactionParser[Any]] = getattr(module, class_name)
+        return parser_class
+
+    def parser_path(self, account_config: AccountConfig) -> str:
+        """Module and class of the parser of an account"""
         account = account_config.account
         if account in self._parser_map:
-            return self._parser_map[account](account_config)
+            return self._parser_map[account]
         elif account_config.file_format == FileType.OFX:
-            return OfxTransactionParser(account_config)
+            return self._default_ofx_parser
         else:
             raise NotImplementedError("Parser for account %s not implemented", account)
+
+    def make(self, account_config: AccountConfig) -> TransactionParser[Any]:
+        return self._load(self.parser_path(account_config))(account_config)
@@ -1,6 +1,9 @@
 import re
 from datetime import datetime
+from functools import lru_cache
+from logging import DEBUG
 from traceback import print_exc
+from typing import Callable
 from zoneinfo import ZoneInfo
 
 from ofx_converter.logger import LogMixin
@@ -9,51 +12,102 @@ from ofx_converter.parsing.abstract_value_parser import StringParser
 
 class DateParser(LogMixin, StringParser[datetime]):
     _default_timezone = ZoneInfo("America/Sao_Paulo")
+    _default_cache_size = 4096
+    _fields = ("year", "month", "day", "hour", "min", "sec")
 
     def __init__(
-        self, date_regex: re.Pattern[str], timezone: ZoneInfo = _default_timezone
+        self,
+        date_regex: re.Pattern[str],
+        timezone: ZoneInfo = _default_timezone,
+        cache_size: int | None = _default_cache_size,
     ) -> None:
+        """Parses dates matched by a regex with named groups
+
+        Args:
+            date_regex: pattern with year and optionally month, day, hour, min
+                and sec groups
+            timezone: timezone of the parsed dates
+            cache_size: number of raw strings memoized, 0 or None to disable
+        """
         super().__init__()
         self._date_regex = date_regex
         self._timezone = timezone
+        self._century = datetime.now().year // 100
+        self._convert = self._compile(date_regex)
+        self._parse_cached: Callable[[str], datetime | None] = self._parse_uncached
+        if cache_size:
+            self._parse_cached = lru_cache(maxsize=cache_size)(self._parse_uncached)
 
     @property
     def timezone(self) -> ZoneInfo:
         return self._timezone
 
-    def parse(self, input: str | None) -> datetime | None:
-        if input is None:
+    @property
+    def cache_hit_rate(self) -> float | None:
+        cache_info = getattr(self._parse_cached, "cache_info", None)
+        if cache_info is None:
             return None
+        info = cache_info()
+        total = info.hits + info.misses
+        return info.hits / total if total > 0 else 0.0
+
+    def _compile(
+        self, date_regex: re.Pattern[str]
+    ) -> Callable[[re.Match[str]], datetime]:
+        groups = [
+            (date_regex.groupindex[field] if field in date_regex.groupindex else None)
+            for field in self._fields
+        ]
+        year_group, *other_groups = groups
+        if year_group is None:
+            raise ValueError("Date regex %s has no year group", date_regex.pattern)
+        defaults = (1, 1, 0, 0, 0)
+        timezone = self._timezone
+        adjust_year = self._adjust_century
+
+        def convert(match: re.Match[str]) -> datetime:
+            month, day, hour, minute, second = [
+                default if group is None or match[group] is None else int(match[group])
+                for group, default in zip(other_groups, defaults)
+            ]
+            year = adjust_year(match[year_group])
+            return datetime(year, month, day, hour, minute, second, tzinfo=timezone)
+
+        return convert
+
+    def _adjust_century(self, year: str) -> int:
+        len_year = len(year)
+        if len_year == 4:
+            return int(year)
+        elif len_year == 2:
+            prefix = self._century if int(year) < 50 else self._century - 1
+            return prefix * 100 + int(year)
+        else:
+            raise ValueError("Invalid year %s", year)
+
+    def _parse_uncached(self, input: str) -> datetime | None:
         date_obj = self._date_regex.match(input)
         if date_obj is None:
             return None
-        date_string = self.make_iso_string(**date_obj.groupdict())
         try:
-            date_converted = datetime.fromisoformat(date_string)
-            date_converted = date_converted.replace(tzinfo=self.timezone)
+            return self._convert(date_obj)
         except ValueError:
             print_exc()
-            self.log.error("Failed converting date %s, returning None", date_string)
+            self.log.error("Failed converting date %s, returning None", input)
             return None
-        return date_converted
 
-    @staticmethod
-    def _adjust_year(year: str | int) -> str:
-        len_year = len(str(year))
-        if len_year == 4:
-            return str(year)
-        elif len_year == 2:
-            current_century = datetime.now().year // 100
-            past_century = current_century - 1
-            prefix = current_century if int(year) < 50 else past_century
-            adjusted_year = f"{prefix}{year}"
-            return adjusted_year
-        else:
-            raise ValueError("Invalid year %s", year)
+    def parse(self, input: str | None) -> datetime | None:
+        if input is None:
+            return None
+        return self._parse_cached(input)
+
+    def log_cache_stats(self) -> None:
+        if self.log.isEnabledFor(DEBUG):
+            self.log.debug("Date cache hit rate %s", self.cache_hit_rate)
 
     def make_iso_string(self, **match_dict: str) -> str:
         defaults = dict(month="01", day="01", hour="00", min="00", sec="00")
         values = {**defaults, **match_dict}
-        values["year"] = self._adjust_year(values["year"])
+        values["year"] = str(self._adjust_century(values["year"]))
         date_string = "{year}-{month}-{day}T{hour}:{min}:{sec}.000".format(**values)
         return date_string
@@ -0,0 +1,80 @@
+from binascii import b2a_base64
+from datetime import datetime, timedelta
+from functools import partial
+from hashlib import blake2b, md5
+from typing import TYPE_CHECKING, Any, Callable, Iterable
+
+if TYPE_CHECKING:
+    from ofx_converter.parsing.transaction import Transaction
+
+
+class FitidHasher:
+    """Builds FITIDs for transactions without an id from the bank
+
+    The id is the base64 digest of the timestamp, description and value of
+    the transaction. md5 is the default and keeps the ids of files converted
+    before, so already imported transactions aren't duplicated. blake2b with a
+    short digest is faster and gives shorter ids, for new accounts.
+    """
+
+    MD5 = "md5"
+    BLAKE2B = "blake2b"
+
+    def __init__(self, algorithm: str = MD5, digest_size: int = 12) -> None:
+        """Validates the hash settings
+
+        Args:
+            algorithm: "md5" or "blake2b"
+            digest_size: bytes of the blake2b digest, from 1 to 64
+        """
+        self.algorithm = algorithm
+        self.digest_size = digest_size
+        self._digest: Callable[[bytes], Any]
+        if algorithm == self.MD5:
+            self._digest = md5
+        elif algorithm == self.BLAKE2B:
+            if not 1 <= digest_size <= 64:
+                raise ValueError(f"Invalid blake2b digest size: {digest_size}")
+            self._digest = partial(blake2b, digest_size=digest_size)
+        else:
+            raise ValueError(f"Invalid FITID hash algorithm: {algorithm}")
+
+    @staticmethod
+    def key(transaction: "Transaction", timestamp: str | None = None) -> bytes:
+        if timestamp is None:
+            timestamp = transaction.timestamp.isoformat()
+        return f"{timestamp}-{transaction.description}-{transaction.value}".encode()
+
+    def hash_key(self, key: bytes) -> str:
+        return b2a_base64(self._digest(key).digest(), newline=False).decode()
+
+    def fitid(self, transaction: "Transaction") -> str:
+        return self.hash_key(self.key(transaction))
+
+    def assign(self, transactions: Iterable["Transaction | None"]) -> None:
+        """Hashes the FITIDs of a batch of transactions at once
+
+        Transactions with an id from the bank, or a FITID already assigned,
+        are left untouched.
+
+        Args:
+            transactions: transactions to assign FITIDs to, None entries skipped
+        """
+        digest, key, encode = self._digest, self.key, b2a_base64
+        # Rows of the same date share their timestamp, and formatting an aware
+        # datetime costs more than hashing the key. Equal datetimes with the
+        # same UTC offset have the same isoformat.
+        timestamps: dict[tuple[datetime, timedelta | None], str] = {}
+        for t in transactions:
+            if t is None or t.transaction_id is not None or t._fitid is not None:
+                continue
+            value = (t.timestamp, t.timestamp.utcoffset())
+            timestamp = timestamps.get(value)
+            if timestamp is None:
+                timestamp = t.timestamp.isoformat()
+                timestamps[value] = timestamp
+            hashed = digest(key(t, timestamp)).digest()
+            t._fitid = encode(hashed, newline=False).decode()
+
+
+MD5_HASHER = FitidHasher()
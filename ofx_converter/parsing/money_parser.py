@@ -1,6 +1,6 @@
 import re
-from decimal import Decimal
-from typing import Literal
+from decimal import Decimal, InvalidOperation
+from typing import Iterable
 
 from ofx_converter.logger import LogMixin
 from ofx_converter.parsing.abstract_value_parser import StringParser
@@ -16,20 +16,22 @@ class MoneyParser(LogMixin, StringParser[Decimal]):
         super().__init__()
         self._account_config = account
         self._value_regex = value_regex
+        self._has_sign = "sign" in value_regex.groupindex
+        self._sign = -1 if account.account_type.is_liability else 1
 
     def extract_value(self, value: str) -> Decimal | None:
         value_obj = self._value_regex.match(value)
         if value_obj is None:
             return None
         value_extracted = value_obj["value"].replace(".", "").replace(",", ".")
-        sign_extracted = value_obj.groupdict().get("sign")
-        value_converted = float(
-            "{sign}{value}".format(
-                sign=sign_extracted if sign_extracted is not None else "",
-                value=value_extracted,
-            )
-        )
-        return Decimal(value_converted)
+        try:
+            value_converted = Decimal(value_extracted)
+        except InvalidOperation:
+            self.log.warning("Failed converting value %s, returning None", value)
+            return None
+        if self._has_sign and value_obj["sign"] is not None:
+            return -value_converted
+        return value_converted
 
     def parse(self, input: str | None) -> Decimal | None:
         if input is None:
@@ -37,12 +39,21 @@ class MoneyParser(LogMixin, StringParser[Decimal]):
         value_converted = self.extract_value(input)
         if value_converted is None:
             return None
-        value_signed = self.get_credit_debit_sign() * value_converted
+        value_signed = self._sign * value_converted
         return value_signed
 
+    def parse_many(self, inputs: Iterable[str | None]) -> list[Decimal | None]:
+        """Parses a whole column of values, in the same order
+
+        Args:
+            inputs: values as found in the statement
+        """
+        extract, sign = self.extract_value, self._sign
+        values: list[Decimal | None] = []
+        for input in inputs:
+            value = extract(input) if input is not None else None
+            values.append(sign * value if value is not None else None)
+        return values
+
     def get_credit_debit_sign(self) -> int:
-        if self._account_config.account_type.is_liability:
-            sign = -1
-        else:
-            sign = 1
-        return sign
+        return self._sign
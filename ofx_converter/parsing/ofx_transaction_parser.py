@@ -1,15 +1,24 @@
 import re
 from datetime import datetime
 from decimal import Decimal
-
-from ofxparse.ofxparse import Transaction as OfxTransaction
+from typing import Protocol
 
 from ofx_converter.parsing.account_config import AccountConfig
 from ofx_converter.parsing.transaction import Transaction
 from ofx_converter.parsing.transaction_parser import TransactionParser
 
 
-class OfxTransactionParser(TransactionParser[OfxTransaction]):
+class OfxRecord(Protocol):
+    """Transaction record read from an OFX file, such as ofxparse's Transaction"""
+
+    id: str
+    date: datetime
+    type: str
+    memo: str
+    amount: Decimal
+
+
+class OfxTransactionParser(TransactionParser[OfxRecord]):
 
     def __init__(self, account: AccountConfig) -> None:
         super().__init__(account)
@@ -28,7 +37,7 @@ class OfxTransactionParser(TransactionParser[OfxTransaction]):
             return None
         return tran_id
 
-    def parse(self, record: OfxTransaction) -> Transaction | None:
+    def parse(self, record: OfxRecord) -> Transaction | None:
         date: datetime
         desc: str
         value: Decimal
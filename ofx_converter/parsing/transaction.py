@@ -1,40 +1,49 @@
-from base64 import b64encode
 from datetime import datetime
 from decimal import Decimal
-from functools import cached_property, reduce
-from hashlib import md5
+from functools import reduce
 from typing import Any, Callable
 
+from ofx_converter.parsing.fitid import MD5_HASHER
 from ofx_converter.utils import to_ofx_time
 
+_CENTS = Decimal("0.01")
+
 
 class Transaction:
+    __slots__ = (
+        "timestamp",
+        "description",
+        "value",
+        "balance",
+        "transaction_id",
+        "_tran_type",
+        "_transaction_type",
+        "_ofx_date",
+        "_fitid",
+    )
+
     def __init__(
         self,
         timestamp: datetime,
         description: str,
-        value: Decimal | float,
+        value: Decimal | float | None,
         balance: Decimal | None = None,
         transaction_id: str | None = None,
         tran_type: str | None = None,
     ) -> None:
         self.timestamp = timestamp
         self.description = description
-        self._value = value
-        self._balance = balance
+        self.value: Decimal | None = (
+            Decimal(value).quantize(_CENTS) if value is not None else None
+        )
+        self.balance: Decimal | None = (
+            balance.quantize(_CENTS) if balance is not None else None
+        )
         self.transaction_id = transaction_id
         self._tran_type = tran_type
-
-    @cached_property
-    def value(self) -> Decimal:
-        return Decimal(self._value).quantize(Decimal("0.01"))
-
-    @cached_property
-    def balance(self) -> Decimal | None:
-        balance = self._balance
-        if balance is None:
-            return None
-        return balance.quantize(Decimal("0.01"))
+        self._transaction_type: str | None = None
+        self._ofx_date: str | None = None
+        self._fitid: str | None = None
 
     @property
     def _has_valid_tran_type(self) -> bool:
@@ -42,6 +51,8 @@ class Transaction:
         if self._tran_type is not None:
             value = self.value
             tran_type = self._tran_type
+            if value is None:
+                return False
             valid = (value >= 0 and tran_type.lower() == "credit") or (
                 value <= 0 and tran_type.lower() == "debit"
             )
@@ -49,8 +60,13 @@ class Transaction:
         else:
             return True
 
-    @cached_property
+    @property
     def transaction_type(self) -> str:
+        if self._transaction_type is None:
+            self._transaction_type = self._make_transaction_type()
+        return self._transaction_type
+
+    def _make_transaction_type(self) -> str:
         if self._tran_type is not None:
             if not self._has_valid_tran_type:
                 raise ValueError(
@@ -59,31 +75,36 @@ class Transaction:
                     self.value,
                 )
             return self._tran_type.upper()
+        elif self.value is None:
+            raise ValueError("Transaction without an amount has no type")
         else:
             return "DEBIT" if self.value < 0 else "CREDIT"
 
     @property
     def ofx_date(self) -> str:
-        return to_ofx_time(self.timestamp)
+        if self._ofx_date is None:
+            self._ofx_date = to_ofx_time(self.timestamp)
+        return self._ofx_date
 
     @property
     def fitid(self) -> str:
         if self.transaction_id is not None:
             return self.transaction_id
-        key = "-".join(
-            map(
-                lambda x: str(x),
-                [self.timestamp.isoformat(), self.description, self.value],
-            )
-        )
-        digest = b64encode(md5(key.encode()).digest()).decode()
-        return digest
+        if self._fitid is None:
+            self._fitid = self._make_fitid()
+        return self._fitid
+
+    def _make_fitid(self) -> str:
+        return MD5_HASHER.fitid(self)
 
     def __lt__(self, other: Any) -> bool:
-        if isinstance(other, Transaction):
+        # Checking the type only once comparing fails keeps sorts cheap
+        try:
             return self.timestamp < other.timestamp
-        else:
-            raise ValueError(f"Can't compare Transaction to type {type(other)}")
+        except AttributeError:
+            raise ValueError(
+                f"Can't compare Transaction to type {type(other)}"
+            ) from None
 
     def __str__(self) -> str:
         return f"Transaction(date:{self.timestamp},desc:{self.description},value:{self.value})"
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Iterable
+from typing import Iterable, Iterator
 
 from ofx_converter.config import get_settings
 from ofx_converter.logger import LogMixin
@@ -8,6 +8,8 @@ from ofx_converter.parsing.transaction import Transaction
 
 
 class TransactionParser[A](LogMixin, ABC):
+    # Transactions buffered by parse_iter to hash their FITIDs together
+    fitid_chunk_size = 1024
 
     def __init__(self, account: AccountConfig) -> None:
         super().__init__()
@@ -19,5 +21,44 @@ class TransactionParser[A](LogMixin, ABC):
 
     def parse_multiple(self, records: Iterable[A]) -> list[Transaction | None]:
         transactions = list(map(self.parse, records))
-        self.log.info("Parsed %i records into transactions", len(transactions))
+        self._account_config.fitid_hasher.assign(transactions)
+        dropped = transactions.count(None)
+        self.log.info(
+            "Parsed %i records into %i transactions, dropped %i invalid records",
+            len(transactions),
+            len(transactions) - dropped,
+            dropped,
+        )
         return transactions
+
+    def parse_iter(self, records: Iterable[A]) -> Iterator[Transaction]:
+        """Lazily parses records, dropping invalid ones as they come
+
+        Transactions are yielded in chunks of `fitid_chunk_size`, so their
+        FITIDs are hashed a batch at a time while memory stays bounded.
+
+        Args:
+            records: records to parse, consumed once
+        """
+        parsed, dropped = 0, 0
+        assign_fitids = self._account_config.fitid_hasher.assign
+        chunk: list[Transaction] = []
+        for record in records:
+            parsed += 1
+            transaction = self.parse(record)
+            if transaction is None:
+                dropped += 1
+                continue
+            chunk.append(transaction)
+            if len(chunk) >= self.fitid_chunk_size:
+                assign_fitids(chunk)
+                yield from chunk
+                chunk = []
+        assign_fitids(chunk)
+        yield from chunk
+        self.log.info(
+            "Parsed %i records into %i transactions, dropped %i invalid records",
+            parsed,
+            parsed - dropped,
+            dropped,
+        )
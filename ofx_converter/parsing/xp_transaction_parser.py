@@ -1,5 +1,6 @@
+from logging import DEBUG
 from re import compile
-from typing import Any
+from typing import Any, Iterable, Iterator
 
 from dateutil.relativedelta import relativedelta
 
@@ -27,6 +28,17 @@ class XPTransactionParser(TransactionParser[dict[str, Any]]):
         self._money_parser = MoneyParser(account, value_regex)
         self._date_parser = DateParser(date_regex)
 
+    def parse_multiple(
+        self, records: Iterable[dict[str, Any]]
+    ) -> list[Transaction | None]:
+        transactions = super().parse_multiple(records)
+        self._date_parser.log_cache_stats()
+        return transactions
+
+    def parse_iter(self, records: Iterable[dict[str, Any]]) -> Iterator[Transaction]:
+        yield from super().parse_iter(records)
+        self._date_parser.log_cache_stats()
+
     def _parse_installment(
         self, installment_description: str | None
     ) -> tuple[int, int] | None:
@@ -62,7 +74,8 @@ class XPTransactionParser(TransactionParser[dict[str, Any]]):
             if current_installment > 1 and date_parsed is not None:
                 date_parsed += relativedelta(months=current_installment - 1)
         transaction = Transaction(date_parsed, desc, value_converted, balance_converted)  # type: ignore
-        self._log.info(str(transaction))
+        if self._log.isEnabledFor(DEBUG):
+            self._log.debug("%s", transaction)
         if not transaction.is_valid:
             return None
         return transaction
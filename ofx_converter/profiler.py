@@ -0,0 +1,227 @@
+import tracemalloc
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from cProfile import Profile
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Iterable, Iterator, TextIO
+
+from ofx_converter.logger import LogMixin
+
+
+@dataclass
+class FileProfile:
+    """Timings and sizes of one converted file, or of the setup work"""
+
+    input_path: Path | None = None
+    seconds: float = 0.0
+    rows: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    peak_memory: int = 0
+    stages: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+    def add(self, other: "FileProfile") -> None:
+        self.seconds += other.seconds
+        self.rows += other.rows
+        self.bytes_in += other.bytes_in
+        self.bytes_out += other.bytes_out
+        self.peak_memory = max(self.peak_memory, other.peak_memory)
+        for name, seconds in other.stages.items():
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def describe(self, name: str) -> str:
+        stages = ", ".join(
+            f"{stage} {seconds * 1000:.1f}ms"
+            for stage, seconds in sorted(self.stages.items(), key=lambda x: -x[1])
+        )
+        return (
+            f"{name}: {self.seconds * 1000:.1f}ms, {self.rows} rows "
+            f"({self.rows_per_second:.0f} rows/s), {self.bytes_in} bytes in, "
+            f"{self.bytes_out} bytes out, peak memory {self.peak_memory} bytes"
+            f" [{stages}]"
+        )
+
+    def __str__(self) -> str:
+        return self.describe(self.input_path.name if self.input_path else "setup")
+
+
+class _TimedWriter:
+    """Text file proxy timing writes as a profiler stage"""
+
+    def __init__(self, file_obj: TextIO, profiler: "Profiler") -> None:
+        self._file_obj = file_obj
+        self._profiler = profiler
+
+    def write(self, content: str) -> int:
+        with self._profiler.stage("write"):
+            return self._file_obj.write(content)
+
+    def writelines(self, lines: Iterable[str]) -> None:
+        # Lines are usually rendered lazily, so only the writes are timed
+        for line in lines:
+            self.write(line)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._file_obj, name)
+
+
+class Profiler(LogMixin):
+    """Records where the time of a conversion run goes
+
+    Stages nest: the time of a stage excludes the stages running inside it,
+    so the stage times of a file add up to its wall time. Stages running
+    outside of a file, such as loading settings, are kept in the setup
+    profile.
+    """
+
+    enabled = True
+
+    def __init__(
+        self, trace_memory: bool = True, pstats_path: Path | None = None
+    ) -> None:
+        """Profiles conversions once started
+
+        Args:
+            trace_memory: track the peak memory of each file with tracemalloc
+            pstats_path: file to dump cProfile stats to when stopped
+        """
+        super().__init__()
+        self.setup = FileProfile()
+        self.files: list[FileProfile] = []
+        self._current = self.setup
+        self._stack: list[list[float]] = []
+        self._trace_memory = trace_memory
+        self._pstats_path = pstats_path
+        self._cprofile: Profile | None = None
+
+    def start(self) -> None:
+        if self._trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if self._pstats_path is not None:
+            self._cprofile = Profile()
+            self._cprofile.enable()
+
+    def stop(self) -> None:
+        if self._cprofile is not None and self._pstats_path is not None:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self._pstats_path)
+            self.log.info("Wrote profile stats to %s", self._pstats_path)
+            self._cprofile = None
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        # Each frame holds its start time and the time spent in nested stages
+        frame = [perf_counter(), 0.0]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            elapsed = perf_counter() - frame[0]
+            stages = self._current.stages
+            stages[name] = stages.get(name, 0.0) + elapsed - frame[1]
+            if len(self._stack) > 0:
+                self._stack[-1][1] += elapsed
+
+    def iterate[T](self, name: str, iterable: Iterable[T]) -> Iterator[T]:
+        """Times the production of every item of a lazy iterable as a stage"""
+        iterator = iter(iterable)
+        while True:
+            with self.stage(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def writer(self, file_obj: TextIO) -> TextIO:
+        """Wraps a text file so its writes are timed as the write stage"""
+        writer: Any = _TimedWriter(file_obj, self)
+        return writer
+
+    @contextmanager
+    def file(self, input_path: Path, output_path: Path) -> Iterator[None]:
+        """Collects the profile of a single file conversion"""
+        profile = FileProfile(input_path)
+        previous, self._current = self._current, profile
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            profile.seconds = perf_counter() - start
+            # Logging, bookkeeping and anything else outside a stage
+            other = profile.seconds - sum(profile.stages.values())
+            profile.stages["other"] = profile.stages.get("other", 0.0) + other
+            if tracemalloc.is_tracing():
+                _, peak = tracemalloc.get_traced_memory()
+                profile.peak_memory = peak - baseline
+            # A missing input is reported by the conversion, not the profiler
+            try:
+                profile.bytes_in = input_path.stat().st_size
+            except OSError:
+                profile.bytes_in = 0
+            try:
+                profile.bytes_out = output_path.stat().st_size
+            except OSError:
+                profile.bytes_out = 0
+            self.files.append(profile)
+            self._current = previous
+
+    def count(self, rows: int) -> None:
+        self._current.rows += rows
+
+    @property
+    def total(self) -> FileProfile:
+        total = FileProfile()
+        for profile in self.files:
+            total.add(profile)
+        return total
+
+    def report(self) -> list[str]:
+        self.setup.seconds = sum(self.setup.stages.values())
+        lines = [str(self.setup)] + [str(profile) for profile in self.files]
+        lines.append(self.total.describe("total"))
+        return lines
+
+
+class NullProfiler:
+    """Profiler doing nothing, used when profiling is off"""
+
+    enabled = False
+    _null_context = nullcontext()
+
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    def stage(self, name: str) -> AbstractContextManager[None]:
+        return self._null_context
+
+    def iterate[T](self, name: str, iterable: Iterable[T]) -> Iterable[T]:
+        return iterable
+
+    def writer(self, file_obj: TextIO) -> TextIO:
+        return file_obj
+
+    def file(
+        self, input_path: Path, output_path: Path
+    ) -> AbstractContextManager[None]:
+        return self._null_context
+
+    def count(self, rows: int) -> None:
+        pass
+
+
+NULL_PROFILER = NullProfiler()
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator
 
 from ofx_converter.logger import LogMixin
 from ofx_converter.parsing.transaction import Transaction
@@ -9,11 +9,29 @@ from ofx_converter.parsing.transaction_parser import TransactionParser
 
 class AbstractReader(LogMixin, ABC):
 
+    @abstractmethod
+    def read_records(self, file_path: Path) -> Iterable[Any]:
+        """Reads the raw records of a file, before any parsing"""
+        ...
+
+    @abstractmethod
+    def read_buffer(self, content: bytes) -> Iterable[Any]:
+        """Reads the raw records of a file already in memory"""
+        ...
+
     @abstractmethod
     def read_transactions(
         self, parser: TransactionParser[Any], file_path: Path
     ) -> list[Transaction | None]: ...
 
+    def iter_transactions(
+        self, parser: TransactionParser[Any], file_path: Path
+    ) -> Iterator[Transaction]:
+        """Yields the valid transactions of a file one at a time"""
+        for transaction in self.read_transactions(parser, file_path):
+            if transaction is not None:
+                yield transaction
+
 
 class BaseReader(AbstractReader):
 
@@ -1,10 +1,13 @@
+from contextlib import ExitStack, contextmanager
 from csv import DictReader
+from io import StringIO
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator
 
 from ofx_converter.parsing.transaction import Transaction
 from ofx_converter.parsing.transaction_parser import TransactionParser
 from ofx_converter.reader.abstract_reader import BaseReader
+from ofx_converter.reader.mapped_file import MappedFile
 
 
 class CSVReader(BaseReader):
@@ -15,21 +18,74 @@ class CSVReader(BaseReader):
         encoding: str = "utf-8",
         quote_char: str = '"',
         newline: str = "",
+        use_mmap: bool = False,
         **_: Any
     ) -> None:
+        """Reads CSV statements
+
+        Args:
+            delimiter: field delimiter
+            encoding: file encoding, utf-8-sig skips a leading BOM
+            quote_char: character used to quote fields
+            newline: newline mode used when opening the file
+            use_mmap: map the file in memory and decode it one line at a time
+        """
+        super().__init__()
         self._delimiter = delimiter
         self._encoding = encoding
         self._quote_char = quote_char
         self._newline = newline
+        self._use_mmap = use_mmap
+        if use_mmap and not MappedFile.supports(encoding):
+            self.log.warning(
+                "Memory mapped input doesn't support %s, reading files buffered",
+                encoding,
+            )
+            self._use_mmap = False
+
+    @contextmanager
+    def _open_rows(self, file_path: Path) -> Iterator[DictReader[str]]:
+        lines: Iterable[str]
+        with ExitStack() as stack:
+            if self._use_mmap:
+                mapped_file = stack.enter_context(
+                    MappedFile(file_path, self._encoding)
+                )
+                lines = mapped_file.lines()
+            else:
+                lines = stack.enter_context(
+                    open(
+                        file_path,
+                        newline=self._newline,
+                        mode="r",
+                        encoding=self._encoding,
+                    )
+                )
+            yield DictReader(
+                lines, delimiter=self._delimiter, quotechar=self._quote_char
+            )
+
+    def read_records(self, file_path: Path) -> Iterator[dict[str, Any]]:
+        """Yields the rows of a CSV file, keyed by the header columns"""
+        with self._open_rows(file_path) as reader:
+            yield from reader
+
+    def read_buffer(self, content: bytes) -> Iterator[dict[str, Any]]:
+        """Yields the rows of an in memory CSV file, keyed by the header columns"""
+        lines = StringIO(content.decode(self._encoding), newline=self._newline)
+        yield from DictReader(
+            lines, delimiter=self._delimiter, quotechar=self._quote_char
+        )
 
     def read_transactions(
         self, parser: TransactionParser[dict[str, Any]], file_path: Path
     ) -> list[Transaction | None]:
-        with open(
-            file_path, newline=self._newline, mode="r", encoding=self._encoding
-        ) as csvfile:
-            reader = DictReader(
-                csvfile, delimiter=self._delimiter, quotechar=self._quote_char
-            )
+        with self._open_rows(file_path) as reader:
             transactions = parser.parse_multiple(reader)
         return transactions
+
+    def iter_transactions(
+        self, parser: TransactionParser[dict[str, Any]], file_path: Path
+    ) -> Iterator[Transaction]:
+        with self._open_rows(file_path) as reader:
+            yield from parser.parse_iter(reader)
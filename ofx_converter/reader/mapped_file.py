@@ -0,0 +1,81 @@
+import codecs
+import mmap
+from pathlib import Path
+from types import TracebackType
+from typing import Iterator
+
+
+class MappedFile:
+    """Read only memory map of a statement file
+
+    Record boundaries are scanned directly in the mapped buffer and only the
+    slices that are needed get decoded. Works with encodings where a newline
+    is the single byte b"\\n" (ASCII, latin-1, cp125x, utf-8 and utf-8-sig).
+    """
+
+    def __init__(self, file_path: Path, encoding: str = "utf-8") -> None:
+        if not self.supports(encoding):
+            raise ValueError(f"Memory mapped files can't be read as {encoding}")
+        self._file_path = file_path
+        self._encoding = encoding
+        self._mmap: mmap.mmap | None = None
+        self.buffer: bytes | mmap.mmap = b""
+        self.start = 0
+
+    @staticmethod
+    def supports(encoding: str) -> bool:
+        """Whether lines of the encoding can be split on the b"\\n" byte"""
+        if codecs.lookup(encoding).name == "utf-8-sig":
+            return True
+        return "a\n".encode(encoding) == b"a\n"
+
+    def __enter__(self) -> "MappedFile":
+        with open(self._file_path, mode="rb") as file_obj:
+            # Empty files can't be mapped
+            if file_obj.seek(0, 2) > 0:
+                self._mmap = mmap.mmap(
+                    file_obj.fileno(), 0, access=mmap.ACCESS_READ
+                )
+                self.buffer = self._mmap
+        if codecs.lookup(self._encoding).name == "utf-8-sig":
+            self._encoding = "utf-8"
+            if self.buffer[: len(codecs.BOM_UTF8)] == codecs.BOM_UTF8:
+                self.start = len(codecs.BOM_UTF8)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self.buffer = b""
+
+    def __len__(self) -> int:
+        return len(self.buffer)
+
+    def decode(self, start: int, end: int) -> str:
+        return self.buffer[start:end].decode(self._encoding)
+
+    def lines(
+        self, start: int | None = None, end: int | None = None
+    ) -> Iterator[str]:
+        """Yields decoded lines, line breaks included
+
+        Args:
+            start: offset of the first line, after the BOM by default
+            end: offset where reading stops, end of the buffer by default
+        """
+        position = self.start if start is None else start
+        end = len(self.buffer) if end is None else end
+        while position < end:
+            line_end = self.buffer.find(b"\n", position, end)
+            line_end = end if line_end == -1 else line_end + 1
+            yield self.decode(position, line_end)
+            position = line_end
@@ -1,33 +1,90 @@
+from io import BytesIO
 from pathlib import Path
-from typing import Any
-
-from ofxparse import Account, OfxParser, Statement
-from ofxparse import Transaction as OfxTransaction
-from ofxparse.ofxparse import Ofx
+from typing import TYPE_CHECKING, Any, Iterable, Iterator
 
+from ofx_converter.parsing.ofx_transaction_parser import OfxRecord
 from ofx_converter.parsing.transaction import Transaction
 from ofx_converter.parsing.transaction_parser import TransactionParser
 from ofx_converter.reader.abstract_reader import BaseReader
+from ofx_converter.reader.mapped_file import MappedFile
+from ofx_converter.reader.ofx_tokenizer import OfxTokenizer
+
+if TYPE_CHECKING:
+    from ofxparse.ofxparse import Ofx
 
 
 class OfxReader(BaseReader):
+    OFXPARSE_BACKEND = "ofxparse"
+    NATIVE_BACKEND = "native"
+
+    def __init__(
+        self,
+        encoding: str,
+        backend: str = OFXPARSE_BACKEND,
+        use_mmap: bool = False,
+        **_: Any,
+    ) -> None:
+        """Reads OFX statements
 
-    def __init__(self, encoding: str, **_: Any) -> None:
+        Args:
+            encoding: encoding used when the file headers declare none
+            backend: "ofxparse" to build the full document with ofxparse, or
+                "native" to scan transactions in a single pass
+            use_mmap: map the file in memory and scan records in the mapped
+                buffer, only supported by the native backend
+        """
         super().__init__()
+        if backend not in (self.OFXPARSE_BACKEND, self.NATIVE_BACKEND):
+            raise ValueError(f"Invalid OFX reader backend: {backend}")
         self._encoding = encoding
+        self._backend = backend
+        self._use_mmap = use_mmap
+        if use_mmap and backend != self.NATIVE_BACKEND:
+            self.log.warning(
+                "Memory mapped input needs the native backend, "
+                "reading files with ofxparse"
+            )
+
+    def _read_ofx(self, file_path: Path) -> "Ofx":
+        from ofxparse import OfxParser
 
-    def _read_ofx(self, file_path: Path) -> Ofx:
         with open(file_path, mode="rb") as file_obj:
             ofx_file = OfxParser.parse(file_obj)
             file_obj.close()
         return ofx_file
 
+    def _scan_ofx(self, file_path: Path) -> Iterator[OfxRecord]:
+        tokenizer = OfxTokenizer(self._encoding)
+        if self._use_mmap:
+            with MappedFile(file_path) as mapped_file:
+                yield from tokenizer.iter_buffer(mapped_file.buffer)
+            return
+        with open(file_path, mode="rb") as file_obj:
+            yield from tokenizer.iter_file(file_obj)
+
+    def read_records(self, file_path: Path) -> Iterable[OfxRecord]:
+        if self._backend == self.NATIVE_BACKEND:
+            return self._scan_ofx(file_path)
+        ofx = self._read_ofx(file_path)
+        records: list[OfxRecord] = ofx.account.statement.transactions
+        return records
+
+    def read_buffer(self, content: bytes) -> Iterable[OfxRecord]:
+        if self._backend == self.NATIVE_BACKEND:
+            return OfxTokenizer(self._encoding).iter_buffer(content)
+        from ofxparse import OfxParser
+
+        ofx = OfxParser.parse(BytesIO(content))
+        records: list[OfxRecord] = ofx.account.statement.transactions
+        return records
+
     def read_transactions(
-        self, parser: TransactionParser[OfxTransaction], file_path: Path
+        self, parser: TransactionParser[OfxRecord], file_path: Path
     ) -> list[Transaction | None]:
-        ofx = self._read_ofx(file_path)
-        account: Account = ofx.account
-        statement: Statement = account.statement
-        transactions: list[OfxTransaction] = statement.transactions
-        parsed = parser.parse_multiple(transactions)
+        parsed = parser.parse_multiple(self.read_records(file_path))
         return parsed
+
+    def iter_transactions(
+        self, parser: TransactionParser[OfxRecord], file_path: Path
+    ) -> Iterator[Transaction]:
+        yield from parser.parse_iter(self.read_records(file_path))
@@ -0,0 +1,140 @@
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+from html import unescape
+from mmap import mmap
+from typing import BinaryIO, Iterator
+
+from ofx_converter.logger import LogMixin
+
+
+@dataclass(slots=True)
+class OfxTransactionRecord:
+    id: str
+    date: datetime
+    type: str
+    memo: str
+    amount: Decimal
+
+
+class OfxTokenizer(LogMixin):
+    """Single pass scanner for STMTTRN records of OFX 1.x SGML and 2.x XML files
+
+    Records are yielded as soon as their closing tag is read, without building
+    a document tree. Values are converted the same way ofxparse does: lower
+    case transaction types, decimal amounts and dates shifted to naive UTC.
+    """
+
+    _chunk_size = 64 * 1024
+    _header_size = 10 * 1024
+    _record_regex = re.compile(
+        rb"<STMTTRN>(.*?)</STMTTRN>", re.DOTALL | re.IGNORECASE
+    )
+    _open_regex = re.compile(rb"<STMTTRN>", re.IGNORECASE)
+    _tag_tail = len(b"<STMTTRN>") - 1
+    _field_regex = re.compile(rb"<([A-Za-z0-9.]+)>([^<]*)")
+    _xml_encoding_regex = re.compile(rb"<\?xml[^>]*encoding=[\"']([\w.-]+)[\"']")
+    _date_regex = re.compile(
+        r"^(?P<datetime>\d{8}(?:\d{6})?)(?:\.(?P<fraction>\d{0,5}))?\d*"
+        r"(?:\[(?P<tz>[-+]?\d+\.?\d*)(?::\w*)?\])?$"
+    )
+    _fields = {b"FITID", b"DTPOSTED", b"TRNTYPE", b"TRNAMT", b"MEMO"}
+
+    def __init__(self, default_encoding: str = "ascii") -> None:
+        super().__init__()
+        self._default_encoding = default_encoding
+
+    def detect_encoding(self, head: bytes) -> str:
+        """Resolves the encoding declared by the OFX headers, like ofxparse"""
+        xml_match = self._xml_encoding_regex.search(head)
+        if xml_match is not None:
+            return xml_match.group(1).decode("ascii")
+        if head.lstrip().startswith(b"<?xml"):
+            return "utf-8"
+        headers: dict[str, str] = {}
+        for line in head[: head.find(b"<")].splitlines():
+            key, _, value = line.decode("ascii", "replace").partition(":")
+            headers[key.strip().upper()] = value.strip()
+        encoding_type = headers.get("ENCODING")
+        if encoding_type == "USASCII":
+            charset = headers.get("CHARSET", "1252")
+            return "iso-8859-1" if charset == "8859-1" else f"cp{charset}"
+        elif encoding_type in ("UNICODE", "UTF-8"):
+            return "utf-8"
+        return self._default_encoding
+
+    def iter_buffer(self, buffer: bytes | mmap) -> Iterator[OfxTransactionRecord]:
+        """Yields the records of a whole OFX document held in a buffer
+
+        Args:
+            buffer: any bytes-like object, including a memory map
+        """
+        encoding = self.detect_encoding(bytes(buffer[: self._header_size]))
+        for match in self._record_regex.finditer(buffer):
+            yield self.make_record(match.group(1), encoding)
+
+    def iter_file(self, file_obj: BinaryIO) -> Iterator[OfxTransactionRecord]:
+        """Yields the records of an OFX file, reading it in chunks
+
+        Args:
+            file_obj: file opened in binary mode
+        """
+        pending = b""
+        encoding: str | None = None
+        while chunk := file_obj.read(self._chunk_size):
+            pending += chunk
+            if encoding is None:
+                encoding = self.detect_encoding(pending[: self._header_size])
+            position = 0
+            for match in self._record_regex.finditer(pending):
+                yield self.make_record(match.group(1), encoding)
+                position = match.end()
+            # Keep only an open record, or a tail that may hold a split tag,
+            # so stretches without records are scanned once
+            opening = self._open_regex.search(pending, position)
+            if opening is not None:
+                pending = pending[opening.start() :]
+            else:
+                pending = pending[max(position, len(pending) - self._tag_tail) :]
+
+    def make_record(self, content: bytes, encoding: str) -> OfxTransactionRecord:
+        values: dict[bytes, str] = {}
+        for tag, value in self._field_regex.findall(content):
+            tag = tag.upper()
+            if tag in self._fields and tag not in values:
+                values[tag] = unescape(value.decode(encoding)).strip()
+        if b"TRNAMT" not in values:
+            raise ValueError("Missing Transaction Amount (a required field)")
+        if b"DTPOSTED" not in values:
+            raise ValueError("Missing Transaction Date (a required field)")
+        return OfxTransactionRecord(
+            id=values.get(b"FITID", ""),
+            date=self.parse_date(values[b"DTPOSTED"]),
+            type=values.get(b"TRNTYPE", "").lower(),
+            memo=values.get(b"MEMO", ""),
+            amount=self.parse_amount(values[b"TRNAMT"]),
+        )
+
+    def parse_date(self, value: str) -> datetime:
+        match = self._date_regex.match(value)
+        if match is None:
+            raise ValueError(f"Invalid Transaction Date: '{value}'")
+        date_string = match.group("datetime")
+        date_format = "%Y%m%d%H%M%S" if len(date_string) == 14 else "%Y%m%d"
+        date = datetime.strptime(date_string, date_format)
+        offset = timedelta(hours=float(match.group("tz") or 0))
+        fraction = timedelta(seconds=float("0." + (match.group("fraction") or "0")))
+        return date - offset + fraction
+
+    @staticmethod
+    def parse_amount(value: str) -> Decimal:
+        if value in ("null", "-null"):
+            return Decimal(0)
+        if re.search(r"\..*,", value):
+            value = value.replace(".", "")
+        if re.search(r",.*\.", value):
+            value = value.replace(",", "")
+        if "." not in value and "," in value:
+            value = value.replace(",", ".")
+        return Decimal(value.replace(" ", "").replace("+", ""))
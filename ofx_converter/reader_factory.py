@@ -1,20 +1,23 @@
 from ofx_converter.logger import LogMixin
 from ofx_converter.parsing.account_config import AccountConfig
 from ofx_converter.reader.abstract_reader import AbstractReader
-from ofx_converter.reader.csv_reader import CSVReader
-from ofx_converter.reader.ofx_reader import OfxReader
 from ofx_converter.utils import FileType
 
 
 class ReaderFactory(LogMixin):
 
     def make(self, account_config: AccountConfig) -> AbstractReader:
+        # Readers are imported here so that ofxparse is only loaded for OFX files
         file_type = account_config.file_format
         reader: AbstractReader
         if file_type == FileType.CSV:
+            from ofx_converter.reader.csv_reader import CSVReader
+
             options = account_config.file_options
             reader = CSVReader(**options)
         elif file_type == FileType.OFX:
+            from ofx_converter.reader.ofx_reader import OfxReader
+
             options = account_config.file_options
             reader = OfxReader(**options)
         else:
@@ -1,32 +1,60 @@
-import re
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from heapq import merge
+from operator import attrgetter
 from pathlib import Path
-from typing import Callable, Generator
+from time import perf_counter
+from typing import Any, Generator, Iterable, Iterator
 
-from dateutil.relativedelta import relativedelta
-
-from ofx_converter.logger import LogMixin
+from ofx_converter.config import reload_settings
+from ofx_converter.conversion_result import ConversionResult
+from ofx_converter.fitid_index import DedupMode, FitidIndex, fitid_digest
+from ofx_converter.logger import LogMixin, get_logger
+from ofx_converter.manifest import ConversionManifest
 from ofx_converter.ofx_client import OfxClient
 from ofx_converter.parsing.account import Account
 from ofx_converter.parsing.account_config import AccountConfig
 from ofx_converter.parsing.builder import TransactionParserFactory
+from ofx_converter.parsing.transaction import Transaction
+from ofx_converter.parsing.transaction_parser import TransactionParser
+from ofx_converter.profiler import NULL_PROFILER, NullProfiler, Profiler
 from ofx_converter.reader_factory import ReaderFactory
+from ofx_converter.statement_catalogue import StatementCatalogue
+from ofx_converter.transaction_cache import TransactionCache
+
+logger = get_logger("runner")
 
 
 class Runner(LogMixin):
 
-    def __init__(self, account_name: str) -> None:
+    def __init__(
+        self,
+        account_name: str,
+        stream: bool = False,
+        profiler: Profiler | NullProfiler = NULL_PROFILER,
+        dedup: DedupMode = DedupMode.OFF,
+        cache: bool = False,
+    ) -> None:
         super().__init__()
         account: Account = Account(account_name)
         self.account = account
+        self.stream = stream
+        self.profiler = profiler
+        self.dedup = dedup
+        self.cache = cache
+        self.fitid_index: FitidIndex | None = None
+        self.transaction_cache: TransactionCache | None = None
+        # sha256 of the pending files from their manifest stamps
+        self._digests: dict[Path, str] = {}
         self.account_config = self.init_settings()
+        self.open_transaction_cache()
         self.log.info(
             "Instantiating runner with account %s",
             account_name,
         )
 
     def init_settings(self) -> AccountConfig:
-        account_config = AccountConfig(self.account)
+        account_config = AccountConfig.load(self.account)
         input_path = Path(account_config.file_in)
         if not input_path.exists():
             raise ValueError(f"Input dir is invalid: {input_path}")
@@ -35,75 +63,470 @@ class Runner(LogMixin):
             output_path.mkdir(parents=True)
         return account_config
 
-    def file_to_ofx(self, input_path: Path, output_path: Path) -> Path | None:
+    def reload(self) -> None:
+        """Reloads the settings, for runners living across settings changes"""
+        reload_settings()
+        self.account_config = self.init_settings()
+        self.open_transaction_cache()
+
+    def open_transaction_cache(self) -> None:
+        """Opens the parsed transaction cache of the account when caching"""
+        if self.cache:
+            parser_path = TransactionParserFactory().parser_path(self.account_config)
+            self.transaction_cache = TransactionCache(self.account_config, parser_path)
+
+    def evict_transaction_cache(self) -> None:
+        if self.transaction_cache is not None:
+            self.transaction_cache.evict()
+
+    @property
+    def output_options(self) -> dict[str, Any]:
+        """Run options changing the output files, part of the manifest"""
+        return {"stream": self.stream, "dedup": self.dedup.value}
+
+    def load_manifest(self) -> ConversionManifest:
+        return ConversionManifest.load(self.account_config, self.output_options)
+
+    def open_fitid_index(self) -> None:
+        """Loads the FITID index of the account when deduplicating"""
+        if self.dedup is not DedupMode.OFF:
+            self.fitid_index = FitidIndex.load(self.account_config)
+
+    def save_fitid_index(self) -> None:
+        if self.fitid_index is not None:
+            self.fitid_index.save()
+
+    def _deduplicate(
+        self,
+        transactions: Iterable[Transaction],
+        input_path: Path,
+        digests: list[bytes],
+    ) -> Iterator[Transaction]:
+        """Drops or reports transactions already converted from another file
+
+        Args:
+            transactions: parsed transactions of the input file
+            input_path: input file being converted
+            digests: collects the FITID digests of the transactions kept
+        """
+        assert self.fitid_index is not None
+        owner, source = self.fitid_index.owner, str(input_path)
+        drop = self.dedup is DedupMode.DROP
+        duplicates: dict[str, int] = {}
+        for t in transactions:
+            digest = fitid_digest(t.fitid)
+            previous = owner(digest)
+            if previous is not None and previous != source:
+                duplicates[previous] = duplicates.get(previous, 0) + 1
+                if drop:
+                    continue
+            digests.append(digest)
+            yield t
+        for previous, count in duplicates.items():
+            self.log.warning(
+                "%s %i transactions of %s already converted from %s",
+                "Dropped" if drop else "Found",
+                count,
+                input_path.name,
+                previous,
+            )
+
+    def _open_records(
+        self, input_path: Path
+    ) -> tuple[TransactionParser[Any], Iterable[Any]]:
+        profiler = self.profiler
+        with profiler.stage("parser_factory"):
+            parser = TransactionParserFactory().make(self.account_config)
+        with profiler.stage("reader_factory"):
+            reader = ReaderFactory().make(self.account_config)
+        # Some readers load the whole file up front, others as records are pulled
+        with profiler.stage("read"):
+            raw_records = reader.read_records(input_path)
+        return parser, profiler.iterate("read", raw_records)
+
+    def _parse_file(self, input_path: Path) -> list[Transaction]:
+        cache = self.transaction_cache
+        if cache is not None:
+            with self.profiler.stage("cache"):
+                sha256_digest = self._digests.pop(input_path, None)
+                digest, cached = cache.lookup(input_path, sha256_digest)
+            if cached is not None:
+                self.log.info("Loaded %i cached transactions", len(cached))
+                return cached
+        parser, records = self._open_records(input_path)
+        with self.profiler.stage("parse"):
+            transactions = [x for x in parser.parse_multiple(records) if x is not None]
+        if cache is not None:
+            with self.profiler.stage("cache"):
+                cache.store(input_path, digest, transactions)
+        return transactions
+
+    def _write_ofx(self, input_path: Path, output_path: Path) -> int:
         # Read the CSV file
         account_config = self.account_config
         self.log.info("Converting file to OFX for %s account", account_config.account)
         self.log.info("Converting from %s to %s", input_path, output_path)
-        parser = TransactionParserFactory().make(account_config)
-        reader = ReaderFactory().make(account_config)
+        profiler = self.profiler
+        digests: list[bytes] = []
+        if self.stream:
+            parser, records = self._open_records(input_path)
+            transactions_iter = profiler.iterate("parse", parser.parse_iter(records))
+            if self.fitid_index is not None:
+                transactions_iter = profiler.iterate(
+                    "dedup", self._deduplicate(transactions_iter, input_path, digests)
+                )
+            count = self._stream_ofx(transactions_iter, output_path)
+            self._index_fitids(input_path, output_path, digests)
+            return count
 
-        transactions = [
-            x for x in reader.read_transactions(parser, input_path) if x is not None
-        ]
+        transactions = self._parse_file(input_path)
+        if self.fitid_index is not None:
+            with profiler.stage("dedup"):
+                transactions = list(
+                    self._deduplicate(transactions, input_path, digests)
+                )
+            if len(transactions) == 0:
+                self._index_fitids(input_path, output_path, digests)
 
         if len(transactions) == 0:
-            return None
-
-        ofx_client = OfxClient(account_config)
+            return 0
 
-        total_file = ofx_client.make_ofx_file(transactions)
+        ofx_client = OfxClient(account_config, profiler)
 
         # Write the OFX file
         self.log.info("Writing OFX file with %i transactions", len(transactions))
         with open(output_path, "w") as ofxfile:
-            ofxfile.write(total_file)
-            ofxfile.close()
+            ofx_client.write_ofx_file(transactions, profiler.writer(ofxfile))
+        self._index_fitids(input_path, output_path, digests)
+        return len(transactions)
+
+    def _index_fitids(
+        self, input_path: Path, output_path: Path, digests: list[bytes]
+    ) -> None:
+        # Only once the output is written, so a failed file leaves no trace
+        if self.fitid_index is None:
+            return
+        with self.profiler.stage("dedup"):
+            self.fitid_index.replace_source(input_path, digests)
+        if len(digests) == 0:
+            # An output from before would import the dropped transactions again
+            output_path.unlink(missing_ok=True)
+
+    def _stream_ofx(
+        self, transactions: Iterable[Transaction], output_path: Path
+    ) -> int:
+        ofx_client = OfxClient(self.account_config, self.profiler)
+        partial_path = output_path.with_name(f"{output_path.name}.partial")
+        try:
+            with open(partial_path, "w") as ofxfile:
+                count = ofx_client.write_ofx_stream(transactions, ofxfile)
+            if count > 0:
+                self.log.info("Wrote OFX file with %i transactions", count)
+                partial_path.replace(output_path)
+        finally:
+            partial_path.unlink(missing_ok=True)
+        return count
+
+    def file_to_ofx(self, input_path: Path, output_path: Path) -> Path | None:
+        if self._write_ofx(input_path, output_path) == 0:
+            return None
         return output_path
 
-    def filter_files_with_dates(
-        self, files: list[Path], from_date: datetime | None, to_date: datetime | None
-    ) -> list[Path]:
-        if from_date is None and to_date is None:
-            return files
-
-        def is_within_range(file: Path) -> bool:
-            date_match = re.search("(?P<year>\\d{4})-(?P<month>\\d{2})", file.name)
-            if date_match is None:
-                return False
-            year, month = date_match.group("year"), date_match.group("month")
-            date = datetime(year=int(year), month=int(month), day=1)
-            if from_date is None:
-                assert to_date is not None
-                return date <= to_date
-            elif to_date is None:
-                return from_date <= date
-            else:
-                return from_date <= date and date <= to_date
-
-        filtered_files = list(filter(is_within_range, files))
-        return filtered_files
+    def convert_file(self, input_path: Path, output_path: Path) -> ConversionResult:
+        """Converts a single file, capturing any failure in the result
 
-    def run_account_parsing(
-        self, from_date: datetime | None = None, to_date: datetime | None = None
-    ) -> Generator[Path | None, None, None]:
-        self.log.info("Starting account parsing")
-        account_config = self.init_settings()
-        file_suffix = account_config.file_format.value
-        input_files = [
-            x
-            for x in account_config.file_in.iterdir()
-            if x.suffix.endswith(file_suffix)
+        Args:
+            input_path: statement file to convert
+            output_path: OFX file to write
+        """
+        result = ConversionResult(self.account.value, input_path)
+        start = perf_counter()
+        with self.profiler.file(input_path, output_path):
+            try:
+                result.transactions = self._write_ofx(input_path, output_path)
+                if result.transactions > 0:
+                    result.output_path = output_path
+            except Exception as e:
+                self.log.exception("Failed converting %s", input_path)
+                result.error = repr(e)
+            self.profiler.count(result.transactions)
+        result.seconds = perf_counter() - start
+        return result
+
+    def output_path_for(self, input_path: Path) -> Path:
+        return self.account_config.file_out / f"{input_path.stem}.ofx"
+
+    def convert_files(
+        self, files: list[Path], jobs: int = 1
+    ) -> Generator[ConversionResult, None, None]:
+        """Converts files, spreading them across a process pool when jobs > 1
+
+        Results are yielded in input order. A failing file yields a result with
+        its error set and does not stop the remaining conversions.
+
+        Args:
+            files: statement files to convert
+            jobs: number of worker processes
+        """
+        conversions = [
+            (self.account.value, file, self.output_path_for(file)) for file in files
         ]
-        if len(input_files) == 0:
+        yield from convert_many(
+            {self.account.value: self}, conversions, jobs, self.stream, self.cache
+        )
+
+    def find_files(
+        self, from_date: datetime | None = None, to_date: datetime | None = None
+    ) -> list[Path]:
+        catalogue = StatementCatalogue.load(self.account_config)
+        catalogue.refresh()
+        catalogue.save()
+        if len(catalogue) == 0:
             self.log.error("Found no files to convert")
-            return
-        self.log.info("Found %s files to convert", len(input_files))
-        filtered_files = self.filter_files_with_dates(input_files, from_date, to_date)
+            return []
+        self.log.info("Found %s files to convert", len(catalogue))
+        filtered_files = catalogue.files(from_date, to_date)
         if len(filtered_files) == 0:
             self.log.error("No files found for conversion")
-            return
+            return []
         self.log.info("Filtered %s files to convert", len(filtered_files))
-        for file in filtered_files:
-            output_file = account_config.file_out / f"{file.stem}.ofx"
-            yield self.file_to_ofx(file, output_file)
+        return filtered_files
+
+    def pending_files(
+        self, files: list[Path], manifest: ConversionManifest, force: bool = False
+    ) -> list[Path]:
+        """Selects the files to convert and stamps them in the manifest
+
+        A file that can't be read is still selected, so its conversion gives
+        a failed result like any other failure of a single file.
+
+        Args:
+            files: statement files found for the account
+            manifest: manifest of the account output directory
+            force: select every file, ignoring the manifest
+        """
+        if force:
+            pending = files
+        else:
+            pending = [file for file in files if not manifest.is_up_to_date(file)]
+            self.log.info("Skipping %i up to date files", len(files) - len(pending))
+        for file in pending:
+            try:
+                digest = manifest.stamp(file)
+            except OSError as e:
+                # Left to the conversion of the file to fail on its own
+                self.log.warning("Failed stamping %s: %r", file, e)
+                continue
+            if self.transaction_cache is not None:
+                self._digests[file] = digest
+        return pending
+
+    def skipped_result(
+        self, input_path: Path, manifest: ConversionManifest
+    ) -> ConversionResult:
+        output_path = manifest.output_for(input_path)
+        return ConversionResult(
+            self.account.value, input_path, output_path=output_path, skipped=True
+        )
+
+    def run_account_conversion(
+        self,
+        from_date: datetime | None = None,
+        to_date: datetime | None = None,
+        jobs: int = 1,
+        force: bool = False,
+    ) -> Generator[ConversionResult, None, None]:
+        """Converts the account files within the date range
+
+        Files already converted with the current settings and templates are
+        skipped according to the manifest in the output directory. When
+        deduplicating, files are converted one at a time in order, so each one
+        sees the FITIDs of the files before it.
+
+        Args:
+            from_date: month to convert files from
+            to_date: month to convert files until
+            jobs: number of worker processes
+            force: convert every file, ignoring the manifest
+        """
+        self.log.info("Starting account parsing")
+        with self.profiler.stage("find_files"):
+            files = self.find_files(from_date, to_date)
+        with self.profiler.stage("manifest"):
+            manifest = self.load_manifest()
+            pending = self.pending_files(files, manifest, force)
+        with self.profiler.stage("fitid_index"):
+            self.open_fitid_index()
+        pending_set = set(pending)
+        converted = self.convert_files(pending, jobs)
+        try:
+            for file in files:
+                if file in pending_set:
+                    result = next(converted)
+                    manifest.record(result)
+                else:
+                    result = self.skipped_result(file, manifest)
+                yield result
+        finally:
+            converted.close()
+            manifest.save()
+            self.save_fitid_index()
+            self.evict_transaction_cache()
+
+    def run_account_parsing(
+        self,
+        from_date: datetime | None = None,
+        to_date: datetime | None = None,
+        jobs: int = 1,
+        force: bool = False,
+    ) -> Generator[Path | None, None, None]:
+        for result in self.run_account_conversion(from_date, to_date, jobs, force):
+            yield result.output_path
+
+    def merged_output_path(
+        self,
+        files: list[Path],
+        from_date: datetime | None = None,
+        to_date: datetime | None = None,
+    ) -> Path:
+        first = f"{from_date:%Y-%m}" if from_date is not None else files[0].stem
+        last = f"{to_date:%Y-%m}" if to_date is not None else files[-1].stem
+        return self.account_config.file_out / f"{first}_{last}.ofx"
+
+    def merge_files(self, files: list[Path], output_path: Path) -> int:
+        """Writes the transactions of several files into a single OFX file
+
+        The transactions of each file are sorted once, and the sorted files are
+        combined with a k-way merge streaming into the writer, which takes the
+        statement bounds from the merged order. Ties keep the order of files.
+
+        Args:
+            files: statement files to merge, in order
+            output_path: OFX file to write
+        """
+        timestamp = attrgetter("timestamp")
+        sorted_files: list[list[Transaction]] = []
+        for input_path in files:
+            self.log.info("Reading %s to merge", input_path)
+            transactions = self._parse_file(input_path)
+            if self.fitid_index is not None:
+                digests: list[bytes] = []
+                with self.profiler.stage("dedup"):
+                    transactions = list(
+                        self._deduplicate(transactions, input_path, digests)
+                    )
+                    # The next files are deduplicated against this one
+                    self.fitid_index.replace_source(input_path, digests)
+            with self.profiler.stage("sort"):
+                transactions.sort(key=timestamp)
+            sorted_files.append(transactions)
+        merged = merge(*sorted_files, key=timestamp)
+        try:
+            return self._stream_ofx(
+                self.profiler.iterate("merge", merged), output_path
+            )
+        except Exception:
+            # Nothing was written, so the FITIDs recorded above are dropped
+            self.open_fitid_index()
+            raise
+
+    def run_merged_conversion(
+        self, from_date: datetime | None = None, to_date: datetime | None = None
+    ) -> ConversionResult:
+        """Converts the account files within the date range into one OFX file
+
+        The file is named after the months of the range, or of the first and
+        last files when the range is open. Merged files are always written,
+        the manifest only tracks the conversion of single files.
+
+        Args:
+            from_date: month to convert files from
+            to_date: month to convert files until
+        """
+        account_config = self.account_config
+        result = ConversionResult(self.account.value, account_config.file_in)
+        with self.profiler.stage("find_files"):
+            files = sorted(self.find_files(from_date, to_date))
+        if len(files) == 0:
+            return result
+        output_path = self.merged_output_path(files, from_date, to_date)
+        self.log.info("Merging %i files into %s", len(files), output_path)
+        start = perf_counter()
+        self.open_fitid_index()
+        try:
+            result.transactions = self.merge_files(files, output_path)
+            if result.transactions > 0:
+                result.output_path = output_path
+        except Exception as e:
+            self.log.exception("Failed merging files into %s", output_path)
+            result.error = repr(e)
+        finally:
+            self.save_fitid_index()
+            self.evict_transaction_cache()
+        self.profiler.count(result.transactions)
+        result.seconds = perf_counter() - start
+        return result
+
+
+_worker_runners: dict[str, Runner] = {}
+
+
+def convert_in_worker(
+    account_name: str,
+    input_path: Path,
+    output_path: Path,
+    stream: bool = False,
+    cache: bool = False,
+) -> ConversionResult:
+    """Process pool entry point, reusing one Runner per account in each worker"""
+    runner = _worker_runners.get(account_name)
+    if runner is None:
+        runner = Runner(account_name)
+        _worker_runners[account_name] = runner
+    runner.stream = stream
+    if runner.cache != cache:
+        runner.cache = cache
+        runner.transaction_cache = None
+        runner.open_transaction_cache()
+    return runner.convert_file(input_path, output_path)
+
+
+def convert_many(
+    runners: dict[str, Runner],
+    conversions: list[tuple[str, Path, Path]],
+    jobs: int = 1,
+    stream: bool = False,
+    cache: bool = False,
+) -> Generator[ConversionResult, None, None]:
+    """Converts files, spreading them across a process pool when jobs > 1
+
+    Results are yielded in input order. A failing file yields a result with
+    its error set and does not stop the remaining conversions.
+
+    Args:
+        runners: runners by account name, used when converting in process
+        conversions: account name, input path and output path of each file
+        jobs: number of worker processes
+        stream: stream transactions from the reader to the OFX file
+        cache: load and store parsed transactions in the transaction cache
+    """
+    deduplicating = any(r.fitid_index is not None for r in runners.values())
+    if deduplicating and jobs > 1:
+        logger.warning("Deduplicating FITIDs converts files in a single process")
+        jobs = 1
+    if jobs <= 1 or len(conversions) <= 1:
+        for account_name, input_path, output_path in conversions:
+            yield runners[account_name].convert_file(input_path, output_path)
+        return
+    logger.info("Converting %i files with %i jobs", len(conversions), jobs)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+            executor.submit(convert_in_worker, account_name, i, o, stream, cache)
+            for account_name, i, o in conversions
+        ]
+        for (account_name, input_path, _), future in zip(conversions, futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                logger.error("Worker failed converting %s: %r", input_path, e)
+                yield ConversionResult(account_name, input_path, error=repr(e))
@@ -0,0 +1,121 @@
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from ofx_converter.bytes_converter import (
+    convert_bytes,
+    get_converter,
+    warm_converters,
+)
+from ofx_converter.config import get_settings
+from ofx_converter.logger import get_logger
+
+logger = get_logger("server")
+
+
+class ConversionRequestHandler(BaseHTTPRequestHandler):
+    """Handles POST /convert/<account name> with the statement as the body"""
+
+    server: "ConversionServer"
+    protocol_version = "HTTP/1.1"
+    max_body_size = 64 * 1024 * 1024
+
+    def do_POST(self) -> None:
+        prefix, _, account_name = self.path.partition("/convert/")
+        if prefix != "" or account_name not in self.server.account_names:
+            self._reply(HTTPStatus.NOT_FOUND, f"Unknown account: {account_name}")
+            return
+        length = self._content_length()
+        if length is None:
+            return
+        content = self.rfile.read(length)
+        future = self.server.executor.submit(convert_bytes, account_name, content)
+        try:
+            ofx = future.result()
+        except (ValueError, KeyError, UnicodeDecodeError) as e:
+            self._reply(HTTPStatus.UNPROCESSABLE_ENTITY, str(e))
+            return
+        except Exception as e:
+            logger.exception("Failed converting statement of %s", account_name)
+            self._reply(HTTPStatus.INTERNAL_SERVER_ERROR, repr(e))
+            return
+        codec = get_converter(account_name).codec
+        self._reply(HTTPStatus.OK, ofx, "application/x-ofx", codec)
+
+    def _content_length(self) -> int | None:
+        """Validated length of the request body, None once an error is sent"""
+        header = self.headers.get("Content-Length")
+        if header is None:
+            self._reply(HTTPStatus.LENGTH_REQUIRED, "Content-Length required")
+            return None
+        length = int(header) if header.strip().isdigit() else -1
+        if length < 0:
+            self._reply(HTTPStatus.BAD_REQUEST, f"Invalid Content-Length: {header}")
+            return None
+        if length > self.max_body_size:
+            self._reply(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Statement too large")
+            return None
+        return length
+
+    def _reply(
+        self,
+        status: HTTPStatus,
+        body: str,
+        content_type: str = "text/plain",
+        codec: str = "utf-8",
+    ) -> None:
+        encoded = body.encode(codec, "replace")
+        if status is not HTTPStatus.OK:
+            # The body may not have been read, so the connection can't be reused
+            self.close_connection = True
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset={codec}")
+        self.send_header("Content-Length", str(len(encoded)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.info("%s - %s", self.address_string(), format % args)
+
+
+class ConversionServer(ThreadingHTTPServer):
+    """HTTP server converting statements of the configured accounts
+
+    Requests are handled in threads, and conversions run in a bounded pool:
+    a single thread when jobs is 1, or worker processes that keep their
+    converters warm across requests.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self, host: str = "127.0.0.1", port: int = 8080, jobs: int = 1
+    ) -> None:
+        """Loads the converters of every configured account and binds
+
+        Args:
+            host: address to listen on
+            port: port to listen on, 0 picks a free one
+            jobs: number of conversions running at the same time
+        """
+        self.account_names = warm_converters(list(get_settings()["accounts"].keys()))
+        self.executor: Executor
+        if jobs > 1:
+            self.executor = ProcessPoolExecutor(
+                jobs, initializer=warm_converters, initargs=(self.account_names,)
+            )
+        else:
+            self.executor = ThreadPoolExecutor(1)
+        super().__init__((host, port), ConversionRequestHandler)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.executor.shutdown(cancel_futures=True)
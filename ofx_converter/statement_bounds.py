@@ -0,0 +1,23 @@
+from ofx_converter.parsing.transaction import Transaction
+
+
+class StatementBounds:
+    """Running first and last transaction of a statement, by timestamp
+
+    Ties resolve like a stable sort: the first transaction wins the start and
+    the last one wins the end.
+    """
+
+    __slots__ = ("count", "first", "last")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.first: Transaction | None = None
+        self.last: Transaction | None = None
+
+    def add(self, transaction: Transaction) -> None:
+        self.count += 1
+        if self.first is None or transaction.timestamp < self.first.timestamp:
+            self.first = transaction
+        if self.last is None or transaction.timestamp >= self.last.timestamp:
+            self.last = transaction
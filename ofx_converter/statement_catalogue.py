@@ -0,0 +1,193 @@
+import json
+import os
+import re
+import time
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from ofx_converter.logger import LogMixin
+from ofx_converter.parsing.account_config import AccountConfig
+
+CATALOGUE_VERSION = 2
+# Coarsest mtime resolution of the file systems in use, FAT's two seconds
+MTIME_TICK_NS = 2_000_000_000
+_month_regex = re.compile(r"(?P<year>\d{4})-(?P<month>\d{2})")
+
+
+def month_of(file_name: str) -> str | None:
+    """YYYY-MM month in the name of a statement file, if any"""
+    match = _month_regex.search(file_name)
+    if match is None:
+        return None
+    return f"{match.group('year')}-{match.group('month')}"
+
+
+class StatementCatalogue(LogMixin):
+    """Index of the statement files of an input directory by month
+
+    Every directory listed is kept with its mtime and the month of each of its
+    files. Refreshing only lists again the directories whose mtime changed, so
+    an archive with years of statements costs a stat per directory. A
+    directory modified within an mtime tick of being listed is racy, a later
+    change could keep its mtime, so it's listed again on the next refresh.
+    Months are kept sorted and date ranges are answered by binary search.
+    Subdirectories, such as year folders, are scanned when recursive, without
+    following symlinks so a link to a parent doesn't loop.
+    """
+
+    file_name = ".ofxc-catalogue.json"
+
+    def __init__(
+        self,
+        directory: Path,
+        suffix: str,
+        index_path: Path | None = None,
+        recursive: bool = False,
+    ) -> None:
+        """Starts with an empty catalogue
+
+        Args:
+            directory: input directory of the statements
+            suffix: suffix of the statement files, such as "csv"
+            index_path: file the catalogue is saved to, not saved if None
+            recursive: scan the subdirectories too
+        """
+        super().__init__()
+        self.directory = directory
+        self.suffix = suffix
+        self.recursive = recursive
+        self._index_path = index_path
+        # Relative path of each directory to its mtime, subdirectories and
+        # statement files with their month
+        self._directories: dict[str, dict[str, Any]] = {}
+        self._months: list[datetime] = []
+        self._files_by_month: list[list[Path]] = []
+        self._undated: list[Path] = []
+        self._dirty = False
+
+    @classmethod
+    def load(cls, account_config: AccountConfig) -> "StatementCatalogue":
+        """Loads the catalogue of an account saved in its output directory"""
+        catalogue = cls(
+            account_config.file_in,
+            account_config.file_format.value,
+            account_config.file_out / cls.file_name,
+            account_config.recursive,
+        )
+        catalogue._read()
+        return catalogue
+
+    @property
+    def _key(self) -> dict[str, Any]:
+        return {
+            "version": CATALOGUE_VERSION,
+            "directory": str(self.directory),
+            "suffix": self.suffix,
+            "recursive": self.recursive,
+        }
+
+    def _read(self) -> None:
+        if self._index_path is None or not self._index_path.exists():
+            return
+        try:
+            with open(self._index_path, "r") as file_obj:
+                content = json.load(file_obj)
+        except (OSError, ValueError):
+            self.log.warning("Ignoring unreadable catalogue %s", self._index_path)
+            return
+        if {k: content.get(k) for k in self._key} != self._key:
+            self.log.info("Input settings changed, ignoring catalogue")
+            return
+        self._directories = content.get("directories", {})
+
+    def _scan(self, relative: str, mtime_ns: int) -> dict[str, Any]:
+        racy = time.time_ns() - mtime_ns < MTIME_TICK_NS
+        files: dict[str, str | None] = {}
+        subdirectories: list[str] = []
+        with os.scandir(self.directory / relative) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if self.recursive:
+                        subdirectories.append(entry.name)
+                elif entry.is_file() and Path(entry.name).suffix.endswith(self.suffix):
+                    files[entry.name] = month_of(entry.name)
+        return {
+            "mtime_ns": mtime_ns,
+            "racy": racy,
+            "dirs": subdirectories,
+            "files": files,
+        }
+
+    def refresh(self) -> None:
+        """Lists again the directories that changed since the last refresh"""
+        directories: dict[str, dict[str, Any]] = {}
+        pending = [""]
+        while len(pending) > 0:
+            relative = pending.pop()
+            try:
+                mtime_ns = (self.directory / relative).stat().st_mtime_ns
+            except FileNotFoundError:
+                continue
+            entry = self._directories.get(relative)
+            if entry is None or entry["racy"] or entry["mtime_ns"] != mtime_ns:
+                entry = self._scan(relative, mtime_ns)
+                self._dirty = True
+            directories[relative] = entry
+            pending.extend(os.path.join(relative, name) for name in entry["dirs"])
+        if directories.keys() != self._directories.keys():
+            self._dirty = True
+        self._directories = directories
+        self._build_index()
+
+    def _build_index(self) -> None:
+        by_month: dict[str, list[Path]] = {}
+        undated: list[Path] = []
+        for relative, entry in self._directories.items():
+            directory = self.directory / relative
+            for name, month in entry["files"].items():
+                if month is None:
+                    undated.append(directory / name)
+                else:
+                    by_month.setdefault(month, []).append(directory / name)
+        months = sorted(by_month)
+        self._months = [datetime.strptime(month, "%Y-%m") for month in months]
+        self._files_by_month = [sorted(by_month[month]) for month in months]
+        self._undated = sorted(undated)
+
+    def __len__(self) -> int:
+        return sum(len(files) for files in self._files_by_month) + len(self._undated)
+
+    def files(
+        self, from_date: datetime | None = None, to_date: datetime | None = None
+    ) -> list[Path]:
+        """Statement files of the months within the range, in month order
+
+        Files without a month in their name are only returned when there is
+        no range.
+
+        Args:
+            from_date: first month, files of months starting before it excluded
+            to_date: last month, files of months starting after it excluded
+        """
+        start = 0 if from_date is None else bisect_left(self._months, from_date)
+        end = (
+            len(self._months)
+            if to_date is None
+            else bisect_right(self._months, to_date)
+        )
+        files = [file for files in self._files_by_month[start:end] for file in files]
+        if from_date is None and to_date is None:
+            files.extend(self._undated)
+        return files
+
+    def save(self) -> None:
+        if not self._dirty or self._index_path is None:
+            return
+        content = {**self._key, "directories": self._directories}
+        temp_path = self._index_path.with_suffix(".tmp")
+        with open(temp_path, "w") as file_obj:
+            json.dump(content, file_obj, sort_keys=True)
+        temp_path.replace(self._index_path)
+        self._dirty = False
@@ -0,0 +1,102 @@
+from logging import DEBUG
+from pathlib import Path
+
+from jinja2 import (
+    BaseLoader,
+    BytecodeCache,
+    ChoiceLoader,
+    Environment,
+    FileSystemBytecodeCache,
+    PackageLoader,
+    Template,
+)
+
+from ofx_converter.config import get_settings, on_reload
+from ofx_converter.logger import LogMixin
+
+
+class TemplateRegistry(LogMixin):
+    """Process-wide cache of compiled OFX templates
+
+    Templates are keyed by the account type template path and compiled once,
+    optionally persisting the compiled bytecode to disk between runs.
+    """
+
+    _base_package = "ofx_converter"
+
+    def __init__(self, bytecode_cache_dir: Path | None = None) -> None:
+        super().__init__()
+        self._bytecode_cache: BytecodeCache | None = None
+        if bytecode_cache_dir is not None:
+            bytecode_cache_dir.mkdir(parents=True, exist_ok=True)
+            self._bytecode_cache = FileSystemBytecodeCache(str(bytecode_cache_dir))
+        self._environments: dict[str, Environment] = {}
+        self._templates: dict[tuple[str, str], Template] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def make_loader(self, template_path: str) -> BaseLoader:
+        template_paths = [f"templates/{template_path}", "templates"]
+        loaders: list[BaseLoader] = []
+        for path in template_paths:
+            try:
+                loader = PackageLoader(self._base_package, path)
+                loaders.append(loader)
+            except ValueError:
+                self.log.warning(
+                    "PackageLoader instantiation failed for path %s in package %s",
+                    path,
+                    self._base_package,
+                )
+        return ChoiceLoader(loaders)
+
+    def environment(self, template_path: str) -> Environment:
+        environment = self._environments.get(template_path)
+        if environment is None:
+            environment = Environment(
+                loader=self.make_loader(template_path),
+                bytecode_cache=self._bytecode_cache,
+                auto_reload=False,
+            )
+            self._environments[template_path] = environment
+        return environment
+
+    def get_template(self, template_path: str, name: str) -> Template:
+        key = (template_path, name)
+        template = self._templates.get(key)
+        if template is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            template = self.environment(template_path).get_template(name)
+            self._templates[key] = template
+        if self.log.isEnabledFor(DEBUG):
+            self.log.debug(
+                "Template %s/%s (%i hits, %i misses)",
+                template_path,
+                name,
+                self.hits,
+                self.misses,
+            )
+        return template
+
+
+_registry: TemplateRegistry | None = None
+
+
+def get_template_registry() -> TemplateRegistry:
+    global _registry
+    if _registry is None:
+        cache_dir = get_settings().get("templates", {}).get("bytecode_cache")
+        _registry = TemplateRegistry(
+            Path(cache_dir).expanduser() if cache_dir is not None else None
+        )
+    return _registry
+
+
+def _reset_template_registry() -> None:
+    global _registry
+    _registry = None
+
+
+on_reload(_reset_template_registry)
@@ -0,0 +1,355 @@
+import json
+import struct
+import sys
+from array import array
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from functools import cache
+from hashlib import blake2b, sha256
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Iterable
+
+from ofx_converter.logger import LogMixin
+from ofx_converter.manifest import file_digest
+from ofx_converter.parsing.account_config import AccountConfig
+from ofx_converter.parsing.transaction import Transaction
+
+CACHE_VERSION = 1
+CACHE_MAGIC = b"OFXCTXC1"
+PACKAGE_PATH = Path(__file__).parent
+# Modules whose code decides the transactions parsed from a file
+PARSING_SOURCES = ["parsing", "reader", "reader_factory.py", "utils.py"]
+
+# Magic, parser key and content digests, source length, row, string and
+# time zone counts
+_header = struct.Struct(f"<{len(CACHE_MAGIC)}s32s32sHIII")
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+# Offset of naive timestamps in the time zone table
+_NAIVE = -(2**31)
+# Flags of the nullable columns
+_VALUE = 1
+_BALANCE = 2
+_TRANSACTION_ID = 4
+_TRAN_TYPE = 8
+# Type codes of the columns, in the order they are written
+_COLUMNS = {
+    "micros": "q",
+    "zones": "H",
+    "flags": "B",
+    "values": "q",
+    "balances": "q",
+    "descriptions": "I",
+    "transaction_ids": "I",
+    "tran_types": "I",
+    "fitids": "I",
+}
+
+
+@cache
+def parsing_version() -> str:
+    """Package version and digest of the source of the parsing modules
+
+    Any change to the readers, parsers or FITID rules gives another version,
+    installed or not, so cached transactions are never stale.
+    """
+    try:
+        package_version = version("ofx-converter")
+    except PackageNotFoundError:
+        package_version = "unknown"
+    digest = sha256(package_version.encode())
+    for source in PARSING_SOURCES:
+        path = PACKAGE_PATH / source
+        modules = sorted(path.rglob("*.py")) if path.is_dir() else [path]
+        for module in modules:
+            digest.update(str(module.relative_to(PACKAGE_PATH)).encode())
+            digest.update(module.read_bytes())
+    return digest.hexdigest()
+
+
+def parser_key(account_config: AccountConfig, parser_path: str) -> str:
+    """Digest of everything that changes the parsed transactions of a file
+
+    Only the parser, the parsing code and the file and FITID settings are part
+    of it, so changing the statement header settings, such as fi or lang,
+    keeps the cache.
+
+    Args:
+        account_config: settings of the account
+        parser_path: module and class of the account parser
+    """
+    raw_settings = account_config.raw_settings
+    files = raw_settings.get("files", {})
+    hasher = account_config.fitid_hasher
+    key = {
+        "version": CACHE_VERSION,
+        "parsing": parsing_version(),
+        "parser": parser_path,
+        "format": files.get("format"),
+        "options": files.get("options", {}),
+        "fitid": f"{hasher.algorithm}-{hasher.digest_size}",
+    }
+    return sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+
+
+class _Strings:
+    """Interns strings into a table, referenced by their index"""
+
+    def __init__(self) -> None:
+        self.indices: dict[str, int] = {}
+
+    def __call__(self, value: str | None) -> int:
+        if value is None:
+            return 0
+        index = self.indices.get(value)
+        if index is None:
+            index = len(self.indices)
+            self.indices[value] = index
+        return index
+
+
+class TransactionCache(LogMixin):
+    """Columnar cache of the transactions parsed from each input file
+
+    Re-rendering files after changing the templates or the header settings
+    loads their transactions from here instead of reading and parsing the
+    statements again. Each input file has an entry named after its path,
+    valid for the sha256 of its content and the parser key. Entries are
+    written by the process converting the file, so workers share the cache.
+
+    An entry stores one array per field: timestamps as wall clock
+    microseconds and an index in a table of UTC offsets, amounts as integer
+    cents, and descriptions, ids and FITIDs as indices in a table of the
+    distinct strings. Null fields are marked in a flags column.
+    """
+
+    dir_name = ".ofxc-cache"
+
+    def __init__(self, account_config: AccountConfig, parser_path: str) -> None:
+        """Opens the cache in the output directory of the account
+
+        Args:
+            account_config: settings of the account
+            parser_path: module and class of the account parser
+        """
+        super().__init__()
+        self._directory = account_config.file_out / self.dir_name
+        self._key = bytes.fromhex(parser_key(account_config, parser_path))
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    def entry_path(self, input_path: Path) -> Path:
+        name = blake2b(str(input_path).encode(), digest_size=16).hexdigest()
+        return self._directory / f"{name}.bin"
+
+    def lookup(
+        self, input_path: Path, sha256_digest: str | None = None
+    ) -> tuple[bytes, list[Transaction] | None]:
+        """Digests an input file and loads its cached transactions, if any
+
+        Args:
+            input_path: input file to load the transactions of
+            sha256_digest: hex sha256 of the file when already known, such as
+                from its manifest stamp, so it isn't read twice
+
+        Returns:
+            The digest of the file, to store its transactions with once parsed,
+            and the transactions or None when they aren't cached
+        """
+        if sha256_digest is None:
+            sha256_digest = file_digest(input_path)
+        digest = bytes.fromhex(sha256_digest)
+        entry_path = self.entry_path(input_path)
+        try:
+            content = entry_path.read_bytes()
+        except FileNotFoundError:
+            return digest, None
+        try:
+            return digest, self._read(content, digest)
+        except (OSError, ValueError, struct.error, UnicodeDecodeError):
+            self.log.warning("Ignoring unreadable cache entry %s", entry_path)
+            return digest, None
+
+    def _read(self, content: bytes, digest: bytes) -> list[Transaction] | None:
+        magic, key, content_digest, source_length, rows, strings, zones = (
+            _header.unpack_from(content)
+        )
+        if magic != CACHE_MAGIC:
+            raise ValueError("Not a transaction cache entry")
+        if key != self._key or content_digest != digest:
+            return None
+        view = memoryview(content)
+        position = _header.size + source_length
+        offsets = array("i")
+        position = self._read_array(offsets, view, position, zones)
+        table_size = array("I")
+        position = self._read_array(table_size, view, position, 1)
+        end = position + table_size[0]
+        table = str(view[position:end], "utf-8").split("\0") if strings > 0 else []
+        if len(table) != strings:
+            raise ValueError("Invalid string table")
+        position = end
+        columns: dict[str, array[int]] = {}
+        for name, type_code in _COLUMNS.items():
+            columns[name] = array(type_code)
+            position = self._read_array(columns[name], view, position, rows)
+        if position != len(content):
+            raise ValueError("Truncated transaction cache entry")
+        return self._make_transactions(columns, offsets, table)
+
+    @staticmethod
+    def _read_array(
+        column: "array[int]", view: memoryview, position: int, count: int
+    ) -> int:
+        end = position + count * column.itemsize
+        if end > len(view):
+            raise ValueError("Truncated transaction cache entry")
+        column.frombytes(view[position:end])
+        if sys.byteorder == "big":
+            column.byteswap()
+        return end
+
+    @staticmethod
+    def _make_transactions(
+        columns: dict[str, "array[int]"], offsets: "array[int]", table: list[str]
+    ) -> list[Transaction]:
+        # Adding to an aware epoch keeps the wall clock time and the offset
+        epochs = [
+            (
+                _EPOCH
+                if offset == _NAIVE
+                else _EPOCH.replace(tzinfo=timezone(timedelta(seconds=offset)))
+            )
+            for offset in offsets
+        ]
+        timestamps = [
+            epochs[zone] + micros * _MICROSECOND
+            for micros, zone in zip(columns["micros"], columns["zones"])
+        ]
+        transactions = []
+        rows = zip(
+            timestamps,
+            columns["flags"],
+            columns["values"],
+            columns["balances"],
+            columns["descriptions"],
+            columns["transaction_ids"],
+            columns["tran_types"],
+            columns["fitids"],
+        )
+        for timestamp, flags, value, balance, description, tid, tran, fitid in rows:
+            transaction = Transaction(
+                timestamp,
+                table[description],
+                Decimal(value).scaleb(-2) if flags & _VALUE else None,
+                Decimal(balance).scaleb(-2) if flags & _BALANCE else None,
+                table[tid] if flags & _TRANSACTION_ID else None,
+                table[tran] if flags & _TRAN_TYPE else None,
+            )
+            if not flags & _TRANSACTION_ID:
+                # Restored as parsed, so no FITID is hashed again
+                transaction._fitid = table[fitid]
+            transactions.append(transaction)
+        return transactions
+
+    def store(
+        self, input_path: Path, digest: bytes, transactions: Iterable[Transaction]
+    ) -> None:
+        """Writes the parsed transactions of an input file to its entry
+
+        Args:
+            input_path: input file the transactions were parsed from
+            digest: digest of the file given by lookup, before it was parsed
+            transactions: valid transactions parsed from the file
+        """
+        strings = _Strings()
+        zone_indices: dict[int, int] = {}
+        columns = {name: array(type_code) for name, type_code in _COLUMNS.items()}
+        micros, zones, flags = columns["micros"], columns["zones"], columns["flags"]
+        values, balances = columns["values"], columns["balances"]
+        descriptions, tids = columns["descriptions"], columns["transaction_ids"]
+        tran_types, fitids = columns["tran_types"], columns["fitids"]
+        for t in transactions:
+            timestamp = t.timestamp
+            offset = timestamp.utcoffset()
+            seconds = _NAIVE if offset is None else int(offset.total_seconds())
+            micros.append((timestamp.replace(tzinfo=None) - _EPOCH) // _MICROSECOND)
+            zones.append(zone_indices.setdefault(seconds, len(zone_indices)))
+            row_flags = 0
+            if t.value is not None:
+                row_flags |= _VALUE
+            if t.balance is not None:
+                row_flags |= _BALANCE
+            if t.transaction_id is not None:
+                row_flags |= _TRANSACTION_ID
+            if t._tran_type is not None:
+                row_flags |= _TRAN_TYPE
+            flags.append(row_flags)
+            values.append(int(t.value.scaleb(2)) if t.value is not None else 0)
+            balances.append(int(t.balance.scaleb(2)) if t.balance is not None else 0)
+            descriptions.append(strings(t.description))
+            tids.append(strings(t.transaction_id))
+            tran_types.append(strings(t._tran_type))
+            fitids.append(0 if t.transaction_id is not None else strings(t.fitid))
+        if any("\0" in value for value in strings.indices):
+            self.log.debug("Not caching %s, its strings hold NUL", input_path)
+            return
+        source = str(input_path).encode()
+        table = "\0".join(strings.indices).encode()
+        offsets = array("i", zone_indices)
+        table_size = array("I", [len(table)])
+        parts = [
+            _header.pack(
+                CACHE_MAGIC,
+                self._key,
+                digest,
+                len(source),
+                len(micros),
+                len(strings.indices),
+                len(offsets),
+            ),
+            source,
+        ]
+        for column in (offsets, table_size):
+            parts.append(self._to_bytes(column))
+        parts.append(table)
+        parts.extend(self._to_bytes(column) for column in columns.values())
+        self._directory.mkdir(exist_ok=True)
+        entry_path = self.entry_path(input_path)
+        temp_path = entry_path.with_suffix(".tmp")
+        temp_path.write_bytes(b"".join(parts))
+        temp_path.replace(entry_path)
+
+    @staticmethod
+    def _to_bytes(column: "array[int]") -> bytes:
+        if sys.byteorder == "big":
+            column = array(column.typecode, column)
+            column.byteswap()
+        return column.tobytes()
+
+    def evict(self) -> int:
+        """Deletes the entries of input files that no longer exist
+
+        Returns:
+            The number of entries deleted
+        """
+        if not self._directory.exists():
+            return 0
+        evicted = 0
+        for entry_path in self._directory.glob("*.bin"):
+            try:
+                with open(entry_path, "rb") as file_obj:
+                    header = file_obj.read(_header.size)
+                    source_length = _header.unpack(header)[3]
+                    source = file_obj.read(source_length).decode()
+            except (OSError, struct.error, UnicodeDecodeError):
+                source = None
+            if source is None or not Path(source).exists():
+                entry_path.unlink(missing_ok=True)
+                evicted += 1
+        if evicted > 0:
+            self.log.info("Evicted %i transaction cache entries", evicted)
+        return evicted
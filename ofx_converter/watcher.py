@@ -0,0 +1,247 @@
+import os
+from pathlib import Path
+from time import monotonic, sleep
+from typing import Callable
+
+from ofx_converter.config import get_settings
+from ofx_converter.conversion_result import ConversionResult
+from ofx_converter.logger import LogMixin
+from ofx_converter.manifest import ConversionManifest
+from ofx_converter.runner import Runner
+
+
+class DirectoryPoller(LogMixin):
+    """Finds files created or modified in a directory, once fully written
+
+    The directory is only listed again when its mtime changes, which happens
+    when files are created, renamed into it or removed. Files already found
+    are stat-ed on every poll, so rewriting one in place is seen too. A new
+    or modified file is followed until its size and mtime stay the same for
+    `settle_seconds`, so a file still being written is never returned.
+    Subdirectories, not symlinked ones, are watched when recursive.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        suffix: str,
+        settle_seconds: float = 0.3,
+        clock: Callable[[], float] = monotonic,
+        recursive: bool = False,
+    ) -> None:
+        """Starts with every file of the directory as new
+
+        Args:
+            directory: directory to watch
+            suffix: suffix of the files to return, such as "csv"
+            settle_seconds: time a file must stay unchanged to be returned
+            clock: monotonic time source, in seconds
+            recursive: watch the subdirectories too
+        """
+        super().__init__()
+        self.directory = directory
+        self.suffix = suffix
+        self.settle_seconds = settle_seconds
+        self.recursive = recursive
+        self._clock = clock
+        # Relative path of each directory listed to its mtime and subdirectories
+        self._directories: dict[str, tuple[int, list[str]]] = {}
+        # Size and mtime of the files already returned
+        self._known: dict[str, tuple[int, int]] = {}
+        # Size, mtime and since when they are unchanged, of files being written
+        self._pending: dict[str, tuple[int, int, float]] = {}
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def _list(self, relative: str) -> list[str]:
+        subdirectories = []
+        with os.scandir(self.directory / relative) as entries:
+            for entry in entries:
+                name = os.path.join(relative, entry.name)
+                if entry.is_dir(follow_symlinks=False):
+                    if self.recursive:
+                        subdirectories.append(name)
+                    continue
+                if not entry.name.endswith(self.suffix) or not entry.is_file():
+                    continue
+                # Files already found are stat-ed on their own
+                if name not in self._known and name not in self._pending:
+                    stat = entry.stat()
+                    self._follow(name, (stat.st_size, stat.st_mtime_ns))
+        return subdirectories
+
+    def _scan(self) -> None:
+        directories = {}
+        pending = [""]
+        while len(pending) > 0:
+            relative = pending.pop()
+            try:
+                mtime_ns = (self.directory / relative).stat().st_mtime_ns
+                listed = self._directories.get(relative)
+                if listed is None or listed[0] != mtime_ns:
+                    listed = (mtime_ns, self._list(relative))
+            except FileNotFoundError:
+                continue
+            directories[relative] = listed
+            pending.extend(listed[1])
+        self._directories = directories
+
+    def _follow(self, name: str, state: tuple[int, int]) -> None:
+        pending = self._pending.get(name)
+        if pending is None or pending[:2] != state:
+            self._pending[name] = (*state, self._clock())
+
+    def retry(self, path: Path) -> None:
+        """Follows a returned file again, to return it once more when settled"""
+        name = str(path.relative_to(self.directory))
+        self._known.pop(name, None)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return
+        self._pending[name] = (stat.st_size, stat.st_mtime_ns, self._clock())
+
+    def poll(self) -> list[Path]:
+        """Returns the files that were created or modified and are complete"""
+        if not self.directory.exists():
+            self.log.warning("Watched directory %s is missing", self.directory)
+            return []
+        self._scan()
+        for name, state in list(self._known.items()):
+            try:
+                stat = (self.directory / name).stat()
+            except FileNotFoundError:
+                del self._known[name]
+                continue
+            if (stat.st_size, stat.st_mtime_ns) != state:
+                del self._known[name]
+                self._follow(name, (stat.st_size, stat.st_mtime_ns))
+        ready = []
+        now = self._clock()
+        for name, (size, mtime_ns, since) in list(self._pending.items()):
+            try:
+                stat = (self.directory / name).stat()
+            except FileNotFoundError:
+                del self._pending[name]
+                continue
+            state = (stat.st_size, stat.st_mtime_ns)
+            if state != (size, mtime_ns):
+                self._pending[name] = (*state, now)
+            elif size > 0 and now - since >= self.settle_seconds:
+                del self._pending[name]
+                self._known[name] = state
+                ready.append(self.directory / name)
+        return sorted(ready)
+
+
+class StatementWatcher(LogMixin):
+    """Converts statements as they land in the input directories
+
+    Runners, settings and templates are loaded once and stay warm between
+    conversions. Files that are up to date in the account manifest, such as
+    the ones converted before the watcher started, are skipped.
+    """
+
+    def __init__(
+        self,
+        account_names: list[str] | None = None,
+        interval: float = 0.1,
+        settle_seconds: float = 0.3,
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        """Loads the runners of the accounts to watch
+
+        Args:
+            account_names: accounts to watch, all configured accounts if empty
+            interval: seconds between polls
+            settle_seconds: time a file must stay unchanged to be converted
+            clock: monotonic time source, in seconds
+        """
+        super().__init__()
+        self.interval = interval
+        configured = list(get_settings()["accounts"].keys())
+        if account_names is None or len(account_names) == 0:
+            account_names = configured
+        unknown = [name for name in account_names if name not in configured]
+        if len(unknown) > 0:
+            raise ValueError(f"Accounts not configured: {', '.join(unknown)}")
+        self.runners: dict[str, Runner] = {}
+        self.pollers: dict[str, DirectoryPoller] = {}
+        self.manifests: dict[str, ConversionManifest] = {}
+        for account_name in account_names:
+            try:
+                runner = Runner(account_name)
+            except (KeyError, ValueError) as e:
+                self.log.error("Not watching account %s: %s", account_name, e)
+                continue
+            account_config = runner.account_config
+            self.runners[account_name] = runner
+            self.pollers[account_name] = DirectoryPoller(
+                account_config.file_in,
+                account_config.file_format.value,
+                settle_seconds,
+                clock,
+                account_config.recursive,
+            )
+            self.manifests[account_name] = runner.load_manifest()
+        if len(self.runners) == 0:
+            raise ValueError("No account to watch")
+
+    def poll(self) -> list[ConversionResult]:
+        """Converts the files completed since the last poll
+
+        A file that can't be read is logged and tried again on a later poll.
+        """
+        results = []
+        for account_name, poller in self.pollers.items():
+            try:
+                files = poller.poll()
+            except OSError as e:
+                self.log.error("Failed polling %s: %r", poller.directory, e)
+                continue
+            if len(files) == 0:
+                continue
+            runner, manifest = self.runners[account_name], self.manifests[account_name]
+            for file in files:
+                try:
+                    if manifest.is_up_to_date(file):
+                        continue
+                    manifest.stamp(file)
+                except OSError as e:
+                    self.log.warning("Failed reading %s, retrying: %r", file, e)
+                    poller.retry(file)
+                    continue
+                result = runner.convert_file(file, runner.output_path_for(file))
+                manifest.record(result)
+                if result.ok:
+                    self.log.info(
+                        "Converted %s with %i transactions in %.3fs",
+                        file,
+                        result.transactions,
+                        result.seconds,
+                    )
+                else:
+                    self.log.error("Failed converting %s: %s", file, result.error)
+                results.append(result)
+            try:
+                manifest.save()
+            except OSError as e:
+                self.log.error("Failed saving %s: %r", manifest.path, e)
+        return results
+
+    def run(self, polls: int | None = None) -> None:
+        """Polls the input directories until interrupted
+
+        Args:
+            polls: number of polls to run, forever if None
+        """
+        self.log.info(
+            "Watching %s", ", ".join(str(p.directory) for p in self.pollers.values())
+        )
+        count = 0
+        while polls is None or count < polls:
+            self.poll()
+            count += 1
+            sleep(self.interval)
@@ -0,0 +1,38 @@
+from pathlib import Path
+
+from ofx_converter.config import get_settings, reload_settings
+from ofx_converter.parsing.account import Account
+from ofx_converter.parsing.account_config import AccountConfig
+from ofx_converter.parsing.account_type import AccountType
+from ofx_converter.utils import FileType
+from tests.base_test_case import BaseTestCase
+
+
+class AccountConfigTestSuite(BaseTestCase):
+
+    def test_snapshot_fields(self) -> None:
+        config = AccountConfig(Account("nubank-cartao"))
+        self.assertEqual(config.account_type, AccountType.CREDIT_CARD)
+        self.assertEqual(config.file_format, FileType.OFX)
+        self.assertEqual(config.file_in, Path("./tests/files/nubank/card"))
+        self.assertEqual(config.bankid, "0260")
+        self.assertEqual(config.accttype, "CREDIT-CARD")
+        self.assertEqual(config.lang, "POR")
+        self.assertIsNone(config.branchid)
+        self.assertEqual(config.file_options["encoding"], "us-ascii")
+        with self.assertRaises(TypeError):
+            config.file_options["encoding"] = "utf-8"  # type: ignore
+        with self.assertRaises(AttributeError):
+            config.lang = "ENG"
+
+    def test_missing_file_options(self) -> None:
+        config = AccountConfig(Account("xpi-conta"))
+        self.assertEqual(dict(config.file_options), {})
+
+    def test_settings_and_snapshots_are_cached(self) -> None:
+        self.assertIs(get_settings(), get_settings())
+        account = Account("nubank-cartao")
+        snapshot = AccountConfig.load(account)
+        self.assertIs(AccountConfig.load(account), snapshot)
+        reload_settings()
+        self.assertIsNot(AccountConfig.load(account), snapshot)
@@ -76,3 +76,30 @@ class DateParserTestCase(BaseTestCase):
         for input, expected in test_cases:
             result = parser.parse(input)
             self.assertEqual(result, expected)
+
+    def test_cache_hit_rate(self) -> None:
+        date_regex = re.compile("^(?P<day>\\d{2})/(?P<month>\\d{2})/(?P<year>\\d{4})$")
+        parser = DateParser(date_regex)
+        self.assertEqual(parser.cache_hit_rate, 0.0)
+        first = parser.parse("07/02/2025")
+        second = parser.parse("07/02/2025")
+        parser.parse("08/02/2025")
+        parser.parse("08/02/2025")
+        self.assertIs(first, second)
+        self.assertEqual(parser.cache_hit_rate, 0.5)
+
+    def test_uncached_parser(self) -> None:
+        date_regex = re.compile(
+            "^(?P<day>\\d{2})/(?P<month>\\d{2})/(?P<year>\\d{2})\\s(?P<hour>\\d{2}):(?P<min>\\d{2})$"
+        )
+        parser = DateParser(date_regex, cache_size=None)
+        self.assertIsNone(parser.cache_hit_rate)
+        self.assertEqual(
+            parser.parse("09/11/99 14:08"),
+            datetime(1999, 11, 9, 14, 8, tzinfo=parser.timezone),
+        )
+        self.assertEqual(
+            parser.make_iso_string(year="24", month="11", day="09"),
+            "2024-11-09T00:00:00.000",
+        )
+        self.assertIsNone(parser.parse("31/02/24 14:08"))
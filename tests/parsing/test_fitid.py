@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from unittest.mock import patch
+
+from ofx_converter.parsing.account import Account
+from ofx_converter.parsing.account_config import AccountConfig
+from ofx_converter.parsing.builder import TransactionParserFactory
+from ofx_converter.parsing.fitid import FitidHasher
+from ofx_converter.parsing.transaction import Transaction
+from tests.base_test_case import BaseTestCase
+
+
+class FitidHasherTestSuite(BaseTestCase):
+
+    @staticmethod
+    def _transactions() -> list[Transaction | None]:
+        date = datetime(2025, 3, 7)
+        return [
+            Transaction(date, "Store", Decimal("-10.456"), Decimal("5")),
+            None,
+            Transaction(date, "Store", 10, transaction_id="abc"),
+            Transaction(datetime(2025, 3, 8), "Other", 3),
+        ]
+
+    def test_md5_keeps_existing_ids(self) -> None:
+        transactions = self._transactions()
+        expected = [t.fitid for t in self._transactions() if t is not None]
+        FitidHasher().assign(transactions)
+        self.assertEqual([t.fitid for t in transactions if t is not None], expected)
+        self.assertEqual(expected[0], "7XOJRfTlKNuU8qSl2wRyCA==")
+        self.assertEqual(expected[1], "abc")
+
+    def test_blake2b_digest_size(self) -> None:
+        hasher = FitidHasher(FitidHasher.BLAKE2B, 12)
+        transactions = self._transactions()
+        hasher.assign(transactions)
+        first, _, with_id, last = transactions
+        assert first is not None and with_id is not None and last is not None
+        self.assertEqual(len(first.fitid), 16)
+        self.assertEqual(first.fitid, hasher.fitid(first))
+        self.assertNotEqual(first.fitid, last.fitid)
+        self.assertEqual(with_id.fitid, "abc")
+
+    def test_invalid_settings(self) -> None:
+        with self.assertRaises(ValueError):
+            FitidHasher("sha1")
+        with self.assertRaises(ValueError):
+            FitidHasher(FitidHasher.BLAKE2B, 65)
+
+    def test_parser_assigns_account_hash(self) -> None:
+        account_config = AccountConfig(Account("xpi-cartao"))
+        self.assertEqual(account_config.fitid_hasher.algorithm, FitidHasher.MD5)
+        parser = TransactionParserFactory().make(account_config)
+        record = {
+            "Data": "07/02/2025",
+            "Estabelecimento": "Store",
+            "Valor": "R$ 1.000,80",
+            "Parcela": "-",
+        }
+        (transaction,) = parser.parse_multiple([record])
+        assert transaction is not None
+        self.assertIsNotNone(transaction._fitid)
+        expected = account_config.fitid_hasher.fitid(transaction)
+        self.assertEqual(transaction.fitid, expected)
+
+    def test_timestamps_formatted_by_value_and_offset(self) -> None:
+        hasher = FitidHasher()
+        utc = datetime(2025, 3, 7, 15, tzinfo=timezone.utc)
+        # The same instant in another offset has another isoformat
+        brt = utc.astimezone(timezone(timedelta(hours=-3)))
+        transactions = [
+            Transaction(datetime(2025, 3, 7), "Store", 1),
+            Transaction(datetime(2025, 3, 7), "Store", 2),
+            Transaction(utc, "Store", 1),
+            Transaction(brt, "Store", 1),
+        ]
+        hasher.assign(transactions)
+        self.assertEqual(
+            [t.fitid for t in transactions], [hasher.fitid(t) for t in transactions]
+        )
+        self.assertNotEqual(transactions[2].fitid, transactions[3].fitid)
+
+    def test_parse_iter_assigns_fitids_in_chunks(self) -> None:
+        account_config = AccountConfig(Account("xpi-cartao"))
+        parser = TransactionParserFactory().make(account_config)
+        parser.fitid_chunk_size = 2
+        record = {
+            "Data": "07/02/2025",
+            "Estabelecimento": "Store",
+            "Valor": "R$ 1.000,80",
+            "Parcela": "-",
+        }
+        hasher = account_config.fitid_hasher
+        with patch.object(hasher, "assign", wraps=hasher.assign) as assign:
+            transactions = list(parser.parse_iter([record] * 5))
+        self.assertEqual(
+            [len(list(call.args[0])) for call in assign.call_args_list], [2, 2, 1]
+        )
+        for transaction in transactions:
+            self.assertEqual(transaction.fitid, hasher.fitid(transaction))
@@ -1,5 +1,6 @@
 import re
 from decimal import Decimal
+from random import Random
 
 from ofx_converter.parsing.account import Account
 from ofx_converter.parsing.account_config import AccountConfig
@@ -8,6 +9,14 @@ from tests.base_test_case import BaseTestCase
 
 
 class MoneyParsingTestSuite(BaseTestCase):
+    value_regex = re.compile("(?P<sign>-)?R\\$ (?P<value>[\\d\\.,]+)$")
+
+    @staticmethod
+    def _format_money(cents: int) -> str:
+        units, decimals = divmod(abs(cents), 100)
+        sign = "-" if cents < 0 else ""
+        thousands = f"{units:,}".replace(",", ".")
+        return f"{sign}R$ {thousands},{decimals:02d}"
 
     @staticmethod
     def _round_decimal(decimal: Decimal | None, places: int = 2) -> Decimal | None:
@@ -45,3 +54,23 @@ class MoneyParsingTestSuite(BaseTestCase):
             expected_rounded = self._round_decimal(expected)
             result_rounded = self._round_decimal(result)
             self.assertEqual(result_rounded, expected_rounded)
+
+    def test_exact_values(self) -> None:
+        config = AccountConfig(Account("xpi-conta"))
+        parser = MoneyParser(config, value_regex=self.value_regex)
+        random = Random(1234)
+        for _ in range(5000):
+            cents = random.randint(-100_000_000, 100_000_000)
+            result = parser.parse(self._format_money(cents))
+            self.assertEqual(result, Decimal(cents).scaleb(-2))
+
+    def test_parse_many(self) -> None:
+        config = AccountConfig(Account("xpi-cartao"))
+        regex = re.compile("R\\$ (?P<sign>-)?(?P<value>[\\d\\.,]+)$")
+        parser = MoneyParser(config, value_regex=regex)
+        values = ["R$ 1.439,80", "R$ -5.186,66", "-R$ 1.439,80", None, "R$ 1,2,3"]
+        self.assertEqual(
+            parser.parse_many(values),
+            [Decimal("-1439.80"), Decimal("5186.66"), None, None, None],
+        )
+        self.assertEqual(parser.parse_many(values), list(map(parser.parse, values)))
@@ -0,0 +1,37 @@
+from datetime import datetime
+from decimal import Decimal
+
+from ofx_converter.parsing.transaction import Transaction
+from tests.base_test_case import BaseTestCase
+
+
+class TransactionTestSuite(BaseTestCase):
+
+    def test_slotted_transaction(self) -> None:
+        transaction = Transaction(
+            datetime(2025, 3, 7), "Store", Decimal("-10.456"), Decimal("5")
+        )
+        self.assertFalse(hasattr(transaction, "__dict__"))
+        self.assertEqual(transaction.value, Decimal("-10.46"))
+        self.assertEqual(transaction.balance, Decimal("5.00"))
+        self.assertEqual(transaction.transaction_type, "DEBIT")
+        self.assertEqual(transaction.ofx_date, "20250307000000[0:GMT]")
+        self.assertIs(transaction.fitid, transaction.fitid)
+        self.assertEqual(transaction.fitid, "7XOJRfTlKNuU8qSl2wRyCA==")
+
+    def test_fitid_uses_transaction_id(self) -> None:
+        transaction = Transaction(
+            datetime(2025, 3, 7), "Store", 10, transaction_id="abc"
+        )
+        self.assertEqual(transaction.fitid, "abc")
+        self.assertEqual(transaction.transaction_type, "CREDIT")
+
+    def test_incompatible_transaction_type(self) -> None:
+        transaction = Transaction(datetime(2025, 3, 7), "Store", 10, tran_type="debit")
+        with self.assertRaises(ValueError):
+            transaction.transaction_type
+
+    def test_missing_amount_is_invalid(self) -> None:
+        transaction = Transaction(datetime(2025, 3, 7), "Store", None)
+        self.assertIsNone(transaction.value)
+        self.assertFalse(transaction.is_valid)
@@ -0,0 +1,82 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any, Iterable
+
+from ofx_converter.parsing.account import Account
+from ofx_converter.parsing.account_config import AccountConfig
+from ofx_converter.parsing.builder import TransactionParserFactory
+from ofx_converter.parsing.transaction import Transaction
+from ofx_converter.reader.csv_reader import CSVReader
+from ofx_converter.reader.mapped_file import MappedFile
+from ofx_converter.reader.ofx_reader import OfxReader
+from tests.base_test_case import BaseTestCase
+
+
+class MappedFileTestCase(BaseTestCase):
+
+    def setUp(self) -> None:
+        self._dir = TemporaryDirectory()
+        self.path = Path(self._dir.name) / "file.csv"
+
+    def tearDown(self) -> None:
+        self._dir.cleanup()
+
+    def test_lines_skip_bom(self) -> None:
+        self.path.write_bytes("﻿a;b\r\nç;1\r\nlast".encode("utf-8"))
+        with MappedFile(self.path, "utf-8-sig") as mapped_file:
+            lines = list(mapped_file.lines())
+            self.assertEqual(lines, ["a;b\r\n", "ç;1\r\n", "last"])
+        with MappedFile(self.path, "utf-8") as mapped_file:
+            self.assertEqual(next(mapped_file.lines()), "﻿a;b\r\n")
+
+    def test_rejects_multibyte_newlines(self) -> None:
+        self.assertTrue(MappedFile.supports("cp1252"))
+        for encoding in ("utf-16", "utf-16-le", "utf-16-be", "utf-32"):
+            self.assertFalse(MappedFile.supports(encoding))
+            with self.assertRaises(ValueError):
+                MappedFile(self.path, encoding)
+
+    def test_empty_file(self) -> None:
+        self.path.write_bytes(b"")
+        with MappedFile(self.path, "utf-8-sig") as mapped_file:
+            self.assertEqual(list(mapped_file.lines()), [])
+
+
+class MappedReaderTestCase(BaseTestCase):
+
+    @staticmethod
+    def _keys(transactions: Iterable[Transaction | None]) -> list[tuple[Any, ...]]:
+        return [
+            (t.fitid, t.value, t.balance, t.description) for t in transactions if t
+        ]
+
+    def test_csv_reader(self) -> None:
+        account_config = AccountConfig(Account("xpi-cartao"))
+        parser = TransactionParserFactory().make(account_config)
+        options = dict(account_config.file_options)
+        file = Path("./tests/files/xpi/card/2025-03.csv")
+        expected = CSVReader(**options).read_transactions(parser, file)
+        mapped = CSVReader(**options, use_mmap=True).read_transactions(parser, file)
+        self.assertEqual(self._keys(mapped), self._keys(expected))
+
+    def test_csv_reader_falls_back_to_buffered_io(self) -> None:
+        account_config = AccountConfig(Account("xpi-cartao"))
+        parser = TransactionParserFactory().make(account_config)
+        with TemporaryDirectory() as directory:
+            file = Path(directory) / "2025-03.csv"
+            content = Path("./tests/files/xpi/card/2025-03.csv").read_text("utf-8-sig")
+            file.write_text(content, "utf-16")
+            reader = CSVReader(";", encoding="utf-16", use_mmap=True)
+            transactions = reader.read_transactions(parser, file)
+        self.assertEqual(len(transactions), len(content.splitlines()) - 1)
+
+    def test_ofx_reader(self) -> None:
+        account_config = AccountConfig(Account("nubank-cartao"))
+        parser = TransactionParserFactory().make(account_config)
+        file = Path("./tests/files/nubank/card/2025-04.ofx")
+        expected = OfxReader("us-ascii").read_transactions(parser, file)
+        mapped = OfxReader("us-ascii", backend="native", use_mmap=True)
+        self.assertEqual(
+            self._keys(mapped.iter_transactions(parser, file)),
+            self._keys(expected),
+        )
@@ -0,0 +1,88 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from io import BytesIO
+from pathlib import Path
+
+from ofxparse import OfxParser
+
+from ofx_converter.parsing.account import Account
+from ofx_converter.parsing.account_config import AccountConfig
+from ofx_converter.parsing.builder import TransactionParserFactory
+from ofx_converter.reader.ofx_reader import OfxReader
+from ofx_converter.reader.ofx_tokenizer import OfxTokenizer
+from tests.base_test_case import BaseTestCase
+
+
+class OfxTokenizerTestCase(BaseTestCase):
+    files = sorted(Path("./tests/files/nubank/card").glob("*.ofx"))
+
+    @staticmethod
+    def _as_utc(date: datetime) -> datetime:
+        if date.tzinfo is None:
+            return date
+        return date.astimezone(timezone.utc).replace(tzinfo=None)
+
+    def test_records_match_ofxparse(self) -> None:
+        tokenizer = OfxTokenizer()
+        for file in self.files:
+            with open(file, "rb") as file_obj:
+                expected = OfxParser.parse(file_obj).account.statement.transactions
+            with open(file, "rb") as file_obj:
+                records = list(tokenizer.iter_file(file_obj))
+            self.assertEqual(len(records), len(expected))
+            for record, transaction in zip(records, expected):
+                self.assertEqual(record.id, transaction.id)
+                self.assertEqual(record.type, transaction.type)
+                self.assertEqual(record.memo, transaction.memo)
+                self.assertEqual(record.amount, transaction.amount)
+                self.assertEqual(record.date, self._as_utc(transaction.date))
+
+    def test_native_backend_matches_ofxparse_backend(self) -> None:
+        account_config = AccountConfig(Account("nubank-cartao"))
+        parser = TransactionParserFactory().make(account_config)
+        ofxparse_reader = OfxReader("us-ascii")
+        native_reader = OfxReader("us-ascii", backend=OfxReader.NATIVE_BACKEND)
+        for file in self.files:
+            expected = ofxparse_reader.read_transactions(parser, file)
+            transactions = native_reader.read_transactions(parser, file)
+            self.assertEqual(
+                [(t.fitid, t.value, t.transaction_type) for t in transactions if t],
+                [(t.fitid, t.value, t.transaction_type) for t in expected if t],
+            )
+
+    def test_small_chunks_and_xml(self) -> None:
+        content = b"""<?xml version="1.0" encoding="utf-8"?>
+<OFX><BANKTRANLIST>
+<STMTTRN><TRNTYPE>DEBIT</TRNTYPE><DTPOSTED>20250406120000.500[-3:BRT]</DTPOSTED>
+<TRNAMT>-1.234,50</TRNAMT><FITID>a1</FITID><MEMO>Caf\xc3\xa9 &amp; Bar</MEMO></STMTTRN>
+<STMTTRN><TRNTYPE>CREDIT</TRNTYPE><DTPOSTED>20250407</DTPOSTED>
+<TRNAMT>10</TRNAMT><FITID>a2</FITID></STMTTRN>
+</BANKTRANLIST></OFX>"""
+        tokenizer = OfxTokenizer()
+        tokenizer._chunk_size = 16
+        records = list(tokenizer.iter_file(BytesIO(content)))
+        self.assertEqual(records, list(tokenizer.iter_buffer(content)))
+        self.assertEqual(len(records), 2)
+        first, second = records
+        self.assertEqual(first.memo, "Café & Bar")
+        self.assertEqual(first.amount, Decimal("-1234.50"))
+        self.assertEqual(first.date, datetime(2025, 4, 6, 15, 0, 0, 500000))
+        self.assertEqual(first.type, "debit")
+        self.assertEqual(second.memo, "")
+        self.assertEqual(second.date, datetime(2025, 4, 7))
+
+    def test_long_stretch_without_records(self) -> None:
+        record = b"<STMTTRN><TRNAMT>1<DTPOSTED>20250407<FITID>%d</STMTTRN>"
+        content = b"".join(
+            [b"<OFX>", b"<NAME>x</NAME>" * 50_000, record % 1]
+            + [b"<MEMO>y" * 7 + record % i for i in range(2, 100)]
+        )
+        tokenizer = OfxTokenizer()
+        tokenizer._chunk_size = 7
+        records = list(tokenizer.iter_file(BytesIO(content[:5000])))
+        self.assertEqual(records, [])
+        for chunk_size in (7, 1024):
+            tokenizer._chunk_size = chunk_size
+            records = list(tokenizer.iter_file(BytesIO(content)))
+            ids = [record.id for record in records]
+            self.assertEqual(ids, [str(i) for i in range(1, 100)])
@@ -1,4 +1,5 @@
 from pathlib import Path
+from tempfile import TemporaryDirectory
 
 from ofx_converter.parsing.account import Account
 from ofx_converter.parsing.account_config import AccountConfig
@@ -39,3 +40,35 @@ class ReaderTestCase(BaseTestCase):
             self.assertIsNotNone(t)
             assert t is not None
             self.assertTrue(t.is_valid)
+
+    def test_stream_drops_malformed_rows(self) -> None:
+        account_config = AccountConfig(Account("xpi-cartao"))
+        reader = ReaderFactory().make(account_config)
+        parser = TransactionParserFactory().make(account_config)
+        content = Path("./tests/files/xpi/card/2025-03.csv").read_text("utf-8-sig")
+        header, first, *rows = content.splitlines()
+        malformed = "15/02/2025;STORE;LUCAS NASCIMENTO;R$ --;-"
+        with TemporaryDirectory() as directory:
+            file = Path(directory) / "2025-03.csv"
+            file.write_text("\n".join([header, first, malformed, *rows]), "utf-8")
+            with self.assertLogs(parser.log, "INFO") as logs:
+                transactions = list(reader.iter_transactions(parser, file))
+        self.assertEqual(len(transactions), len(rows) + 1)
+        self.assertIn(
+            f"Parsed {len(rows) + 2} records into {len(rows) + 1} transactions, "
+            "dropped 1 invalid records",
+            logs.output[-1],
+        )
+
+    def test_read_buffer_matches_read_records(self) -> None:
+        files = {
+            "xpi-cartao": Path("./tests/files/xpi/card/2025-03.csv"),
+            "nubank-cartao": Path("./tests/files/nubank/card/2025-04.ofx"),
+        }
+        for account_name, file in files.items():
+            account_config = AccountConfig(Account(account_name))
+            reader = ReaderFactory().make(account_config)
+            parser = TransactionParserFactory().make(account_config)
+            from_file = parser.parse_multiple(reader.read_records(file))
+            from_buffer = parser.parse_multiple(reader.read_buffer(file.read_bytes()))
+            self.assertEqual([str(t) for t in from_buffer], [str(t) for t in from_file])
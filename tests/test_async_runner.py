@@ -0,0 +1,71 @@
+import re
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from ofx_converter.async_runner import AsyncRunner
+from ofx_converter.cli import main
+from ofx_converter.fitid_index import DedupMode
+from ofx_converter.runner import Runner
+from tests.base_test_case import BaseTestCase
+
+
+def without_server_date(ofx: str) -> str:
+    return re.sub("<DTSERVER>.*</DTSERVER>", "", ofx)
+
+
+class AsyncRunnerTestSuite(BaseTestCase):
+
+    def test_matches_runner_output(self) -> None:
+        runner = Runner("nubank-cartao")
+        files = sorted(runner.find_files())
+        expected = []
+        for result in runner.run_account_conversion(force=True):
+            assert result.output_path is not None
+            expected.append(without_server_date(result.output_path.read_text()))
+
+        async_runner = AsyncRunner(runner, queue_size=1)
+        results = async_runner.run_account_conversion(force=True)
+        self.assertEqual([r.input_path for r in results], files)
+        for result, content in zip(results, expected):
+            self.assertTrue(result.ok)
+            self.assertEqual(result.transactions, 15)
+            assert result.output_path is not None
+            output = without_server_date(result.output_path.read_text())
+            self.assertEqual(output, content)
+
+        read_stats = async_runner.stats["read"]
+        self.assertEqual(read_stats.puts, len(files))
+        self.assertLessEqual(read_stats.max_depth, 1)
+        self.assertEqual(async_runner.stats["write"].puts, len(files))
+
+        skipped = async_runner.run_account_conversion()
+        self.assertTrue(all(r.skipped for r in skipped))
+
+    def test_failures_do_not_stop_other_files(self) -> None:
+        runner = Runner("nubank-cartao")
+        files = sorted(runner.find_files())
+        missing = Path("./tests/files/nubank/card/2025-01.ofx")
+        results = AsyncRunner(runner).convert_files([missing, *files])
+        self.assertEqual(len(results), 3)
+        self.assertFalse(results[0].ok)
+        self.assertIsNone(results[0].output_path)
+        self.assertTrue(all(r.ok for r in results[1:]))
+
+    def test_rejects_options_it_ignores(self) -> None:
+        for runner in [
+            Runner("nubank-cartao", stream=True),
+            Runner("nubank-cartao", dedup=DedupMode.DROP),
+            Runner("nubank-cartao", cache=True),
+        ]:
+            with self.assertRaises(ValueError):
+                AsyncRunner(runner)
+
+        cli = CliRunner()
+        result = cli.invoke(main, ["convert", "nubank-cartao", "--async", "--merge"])
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn("--async can't be combined with --merge", result.output)
+
+        arguments = ["--from_date", "2025-04", "--to_date", "2025-05", "--force"]
+        result = cli.invoke(main, ["convert", "nubank-cartao", "--async", *arguments])
+        self.assertEqual(result.exit_code, 0, result.output)
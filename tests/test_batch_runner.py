@@ -0,0 +1,27 @@
+from ofx_converter.batch_runner import BatchRunner
+from tests.base_test_case import BaseTestCase
+
+
+class BatchRunnerTestSuite(BaseTestCase):
+
+    def test_run_selected_account(self) -> None:
+        batch_runner = BatchRunner(["nubank-cartao"])
+        summaries = batch_runner.run(jobs=2, force=True)
+        self.assertEqual(len(summaries), 1)
+        summary = summaries[0]
+        self.assertTrue(summary.ok)
+        self.assertEqual(summary.files, 2)
+        self.assertEqual(summary.converted, 2)
+        self.assertGreater(summary.transactions, 0)
+
+    def test_run_all_accounts_reports_invalid_accounts(self) -> None:
+        batch_runner = BatchRunner()
+        summaries = {s.account: s for s in batch_runner.run()}
+        self.assertIn("nubank-cartao", summaries)
+        self.assertTrue(summaries["nubank-cartao"].ok)
+        self.assertFalse(summaries["xpi-conta"].ok)
+        self.assertEqual(summaries["xpi-conta"].files, 0)
+
+    def test_unknown_account(self) -> None:
+        with self.assertRaises(ValueError):
+            BatchRunner(["unknown-account"])
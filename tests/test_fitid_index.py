@@ -0,0 +1,84 @@
+from pathlib import Path
+
+from ofx_converter.fitid_index import DedupMode, FitidIndex, fitid_digest
+from ofx_converter.parsing.account import Account
+from ofx_converter.parsing.account_config import AccountConfig
+from ofx_converter.parsing.builder import TransactionParserFactory
+from ofx_converter.reader_factory import ReaderFactory
+from ofx_converter.runner import Runner
+from tests.base_test_case import BaseTestCase
+
+
+class FitidIndexTestSuite(BaseTestCase):
+
+    def setUp(self) -> None:
+        self.account_config = AccountConfig.load(Account("nubank-cartao"))
+        self.account_config.file_out.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.account_config.file_out / FitidIndex.file_name
+        self.index_path.unlink(missing_ok=True)
+        self.addCleanup(self.index_path.unlink, missing_ok=True)
+
+    def digests_of(self, input_path: Path) -> list[bytes]:
+        reader = ReaderFactory().make(self.account_config)
+        parser = TransactionParserFactory().make(self.account_config)
+        transactions = parser.parse_multiple(reader.read_records(input_path))
+        return [fitid_digest(t.fitid) for t in transactions if t is not None]
+
+    def test_round_trip(self) -> None:
+        index = FitidIndex(self.account_config)
+        first, second = fitid_digest("a"), fitid_digest("b")
+        index.replace_source(Path("2025-04.ofx"), [first, second])
+        index.replace_source(Path("2025-05.ofx"), [second, fitid_digest("c")])
+        index.save()
+
+        loaded = FitidIndex.load(self.account_config)
+        self.assertEqual(len(loaded), 3)
+        self.assertEqual(loaded.owner(first), "2025-04.ofx")
+        self.assertEqual(loaded.owner(second), "2025-04.ofx")
+        self.assertIsNone(loaded.owner(fitid_digest("d")))
+
+        # Converting a file again replaces what it owned
+        loaded.replace_source(Path("2025-04.ofx"), [first])
+        self.assertIsNone(loaded.owner(second))
+        self.assertEqual(len(loaded), 2)
+
+    def test_ignores_unreadable_index(self) -> None:
+        self.index_path.write_bytes(b"OFXCFID1")
+        with self.assertLogs("FitidIndex", "WARNING"):
+            index = FitidIndex.load(self.account_config)
+        self.assertEqual(len(index), 0)
+
+    def test_runner_drops_transactions_of_other_files(self) -> None:
+        runner = Runner("nubank-cartao", dedup=DedupMode.DROP)
+        # The test statements are the same file under two months
+        first, second = sorted(runner.find_files())
+        digests = self.digests_of(first)
+
+        for _ in range(2):
+            with self.assertLogs(runner.log, "WARNING") as logs:
+                results = list(runner.run_account_conversion(force=True))
+            self.assertIn("Dropped", "\n".join(logs.output))
+            by_input = {result.input_path: result for result in results}
+            # Converting the first file again doesn't drop its own transactions
+            self.assertEqual(by_input[first].transactions, len(digests))
+            self.assertEqual(by_input[second].transactions, 0)
+            self.assertIsNone(by_input[second].output_path)
+            self.assertFalse(runner.output_path_for(second).exists())
+
+        loaded = FitidIndex.load(self.account_config)
+        self.assertEqual(len(loaded), len(set(digests)))
+        self.assertEqual(loaded.owner(digests[0]), str(first))
+
+    def test_runner_reports_transactions_of_other_files(self) -> None:
+        runner = Runner("nubank-cartao", stream=True, dedup=DedupMode.REPORT)
+        first, second = sorted(runner.find_files())
+        index = FitidIndex(self.account_config)
+        index.replace_source(Path("2025-03.ofx"), self.digests_of(first)[:5])
+        index.save()
+
+        with self.assertLogs(runner.log, "WARNING") as logs:
+            results = list(runner.run_account_conversion(force=True))
+        self.assertIn("Found 5 transactions of 2025-04.ofx", logs.output[0])
+        by_input = {result.input_path: result for result in results}
+        self.assertEqual(by_input[first].transactions, len(self.digests_of(first)))
+        self.assertEqual(by_input[second].transactions, by_input[first].transactions)
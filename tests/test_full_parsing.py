@@ -44,12 +44,46 @@ class TestFullConversion(BaseTestCase):
             dt, "%Y-%m"
         )
         from_date, to_date = parse_date("2025-03"), parse_date("2025-04")
-        file_suffix = runner.account_config.file_format.value
-        input_files = [
-            x
-            for x in runner.account_config.file_in.iterdir()
-            if x.suffix.endswith(file_suffix)
-        ]
-        self.assertEqual(len(input_files), 2)
-        filtered_files = runner.filter_files_with_dates(input_files, from_date, to_date)
-        self.assertEqual(len(filtered_files), 1)
+        filtered_files = runner.find_files(from_date, to_date)
+        self.assertEqual(len(runner.find_files()), 2)
+        self.assertEqual([file.name for file in filtered_files], ["2025-04.ofx"])
+
+    def test_parallel_conversion_matches_sequential(self) -> None:
+        account_name = "nubank-cartao"
+        runner = Runner(account_name)
+        files = sorted(runner.find_files())
+        sequential = list(runner.convert_files(files, jobs=1))
+        parallel = list(runner.convert_files(files, jobs=2))
+        self.assertEqual(
+            [r.input_path for r in parallel], [r.input_path for r in sequential]
+        )
+        self.assertEqual(
+            [r.output_path for r in parallel], [r.output_path for r in sequential]
+        )
+        for result in parallel:
+            self.assertTrue(result.ok)
+            self.assertGreater(result.transactions, 0)
+
+    def test_parallel_conversion_reports_failures(self) -> None:
+        account_name = "nubank-cartao"
+        runner = Runner(account_name)
+        files = sorted(runner.find_files())
+        missing = runner.account_config.file_in / "1999-01.ofx"
+        results = list(runner.convert_files([missing, *files], jobs=2))
+        self.assertEqual(len(results), len(files) + 1)
+        self.assertFalse(results[0].ok)
+        self.assertIsNone(results[0].output_path)
+        for result in results[1:]:
+            self.assertTrue(result.ok)
+
+    def test_streaming_conversion(self) -> None:
+        account_name = "nubank-cartao"
+        runner = Runner(account_name, stream=True)
+        files = sorted(runner.find_files())
+        for result in runner.convert_files(files, jobs=2):
+            self.assertTrue(result.ok)
+            self.assertEqual(result.transactions, 15)
+            assert result.output_path is not None
+            content = result.output_path.read_text()
+            self.assertEqual(content.count("<STMTTRN>"), 15)
+            self.assertTrue(content.endswith("</OFX>"))
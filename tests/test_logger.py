@@ -0,0 +1,27 @@
+from logging import DEBUG, INFO
+
+from ofx_converter.logger import LogMixin, get_handler, get_logger
+from tests.base_test_case import BaseTestCase
+
+
+class LoggerTestSuite(BaseTestCase):
+
+    def test_loggers_are_cached(self) -> None:
+        first = get_logger("cached-logger")
+        second = get_logger("cached-logger")
+        self.assertIs(first, second)
+        self.assertEqual(first.handlers, [get_handler()])
+
+    def test_level_is_updated(self) -> None:
+        logger = get_logger("leveled-logger", INFO)
+        self.assertFalse(logger.isEnabledFor(DEBUG))
+        get_logger("leveled-logger", DEBUG)
+        self.assertTrue(logger.isEnabledFor(DEBUG))
+
+    def test_mixin_instances_share_logger(self) -> None:
+        class Component(LogMixin):
+            pass
+
+        first, second = Component(), Component()
+        self.assertIs(first.log, second.log)
+        self.assertIs(first.log.handlers[0], get_logger("main").handlers[0])
@@ -0,0 +1,88 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from ofx_converter.conversion_result import ConversionResult
+from ofx_converter.fitid_index import DedupMode, FitidIndex
+from ofx_converter.manifest import ConversionManifest
+from ofx_converter.parsing.account import Account
+from ofx_converter.parsing.account_config import AccountConfig
+from ofx_converter.runner import Runner
+from tests.base_test_case import BaseTestCase
+
+
+class ConversionManifestTestSuite(BaseTestCase):
+
+    def test_skips_unchanged_files(self) -> None:
+        runner = Runner("nubank-cartao")
+        converted = list(runner.run_account_conversion(force=True))
+        self.assertEqual(len(converted), 2)
+        for result in converted:
+            self.assertFalse(result.skipped)
+
+        skipped = list(runner.run_account_conversion())
+        self.assertEqual(len(skipped), 2)
+        for before, after in zip(converted, skipped):
+            self.assertTrue(after.skipped)
+            self.assertEqual(before.output_path, after.output_path)
+
+    def test_converts_files_with_missing_output(self) -> None:
+        runner = Runner("nubank-cartao")
+        converted = list(runner.run_account_conversion(force=True))
+        removed = converted[0].output_path
+        assert removed is not None
+        removed.unlink()
+
+        results = list(runner.run_account_conversion())
+        self.assertFalse(results[0].skipped)
+        self.assertTrue(removed.exists())
+        for result in results[1:]:
+            self.assertTrue(result.skipped)
+
+    def test_fingerprint_depends_on_settings(self) -> None:
+        nubank = AccountConfig(Account("nubank-cartao"))
+        xp = AccountConfig(Account("xpi-cartao"))
+        self.assertEqual(
+            ConversionManifest.make_fingerprint(nubank),
+            ConversionManifest.make_fingerprint(AccountConfig(Account("nubank-cartao"))),
+        )
+        self.assertNotEqual(
+            ConversionManifest.make_fingerprint(nubank),
+            ConversionManifest.make_fingerprint(xp),
+        )
+
+    def test_records_input_as_it_was_before_conversion(self) -> None:
+        manifest = ConversionManifest(AccountConfig(Account("nubank-cartao")))
+        with TemporaryDirectory() as directory:
+            input_path = Path(directory) / "2025-04.ofx"
+            input_path.write_bytes(b"before")
+            manifest.stamp(input_path)
+            input_path.write_bytes(b"after!")
+            manifest.record(ConversionResult("nubank-cartao", input_path))
+            self.assertFalse(manifest.is_up_to_date(input_path))
+
+            manifest.stamp(input_path)
+            manifest.record(ConversionResult("nubank-cartao", input_path))
+            self.assertTrue(manifest.is_up_to_date(input_path))
+
+    def test_converts_again_with_other_output_options(self) -> None:
+        list(Runner("nubank-cartao").run_account_conversion(force=True))
+        runner = Runner("nubank-cartao", dedup=DedupMode.DROP)
+        index_path = runner.account_config.file_out / FitidIndex.file_name
+        self.addCleanup(index_path.unlink, missing_ok=True)
+        with self.assertLogs(runner.log, "WARNING"):
+            results = list(runner.run_account_conversion())
+        self.assertFalse(any(result.skipped for result in results))
+        self.assertTrue(all(r.skipped for r in runner.run_account_conversion()))
+
+    def test_unreadable_file_fails_only_its_conversion(self) -> None:
+        runner = Runner("nubank-cartao")
+        manifest = runner.load_manifest()
+        with TemporaryDirectory() as directory:
+            missing = Path(directory) / "2025-01.ofx"
+            with self.assertLogs(runner.log, "WARNING"):
+                pending = runner.pending_files([missing], manifest, force=True)
+            self.assertEqual(pending, [missing])
+            result = runner.convert_file(missing, Path(directory) / "out.ofx")
+        self.assertFalse(result.ok)
+        manifest.record(result)
+        self.assertFalse(manifest.is_up_to_date(missing))
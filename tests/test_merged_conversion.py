@@ -0,0 +1,54 @@
+import re
+from datetime import datetime
+
+from ofx_converter.fitid_index import DedupMode, FitidIndex
+from ofx_converter.runner import Runner
+from tests.base_test_case import BaseTestCase
+
+
+class MergedConversionTestSuite(BaseTestCase):
+
+    def test_merges_files_in_date_order(self) -> None:
+        runner = Runner("nubank-cartao")
+        single = list(runner.run_account_conversion(force=True))
+        result = runner.run_merged_conversion(
+            datetime(2025, 1, 1), datetime(2025, 12, 1)
+        )
+        assert result.output_path is not None
+        self.addCleanup(result.output_path.unlink, missing_ok=True)
+
+        self.assertTrue(result.ok)
+        self.assertEqual(result.output_path.name, "2025-01_2025-12.ofx")
+        self.assertEqual(result.transactions, sum(r.transactions for r in single))
+        content = result.output_path.read_text()
+        posted = re.findall("<DTPOSTED>(.*)</DTPOSTED>", content)
+        self.assertEqual(len(posted), result.transactions)
+        self.assertEqual(posted, sorted(posted))
+        self.assertIn(f"<DTSTART>{posted[0]}</DTSTART>", content)
+        self.assertIn(f"<DTEND>{posted[-1]}</DTEND>", content)
+
+    def test_names_open_range_after_files(self) -> None:
+        runner = Runner("nubank-cartao")
+        files = sorted(runner.find_files())
+        output_path = runner.merged_output_path(files)
+        self.assertEqual(output_path.name, "2025-04_2025-05.ofx")
+
+    def test_deduplicates_merged_files_against_each_other(self) -> None:
+        runner = Runner("nubank-cartao", dedup=DedupMode.DROP)
+        index_path = runner.account_config.file_out / FitidIndex.file_name
+        index_path.unlink(missing_ok=True)
+        self.addCleanup(index_path.unlink, missing_ok=True)
+        # The test statements are the same file under two months
+        first, second = sorted(runner.find_files())
+
+        with self.assertLogs(runner.log, "WARNING") as logs:
+            result = runner.run_merged_conversion()
+        assert result.output_path is not None
+        self.addCleanup(result.output_path.unlink, missing_ok=True)
+
+        self.assertIn(f"already converted from {first}", logs.output[0])
+        content = result.output_path.read_text()
+        fitids = re.findall("<FITID>(.*)</FITID>", content)
+        self.assertEqual(result.transactions, len(runner._parse_file(first)))
+        self.assertEqual(len(fitids), len(set(fitids)))
+        self.assertEqual(len(FitidIndex.load(runner.account_config)), len(fitids))
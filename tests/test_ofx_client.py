@@ -1,7 +1,11 @@
+from io import StringIO
+from pathlib import Path
 
 from ofx_converter.ofx_client import OfxClient
 from ofx_converter.parsing.account import Account
 from ofx_converter.parsing.account_config import AccountConfig
+from ofx_converter.parsing.builder import TransactionParserFactory
+from ofx_converter.reader_factory import ReaderFactory
 from tests.base_test_case import BaseTestCase
 
 
@@ -15,3 +19,68 @@ class OfxClientTestSuite(BaseTestCase):
             client = OfxClient(account_config)
             loader = client._make_template_loader()
             self.assertIsNotNone(loader)
+
+    def test_write_ofx_file_matches_rendered_file(self) -> None:
+        file = Path("./tests/files/nubank/card/2025-04.ofx")
+        account_config = AccountConfig(Account("nubank-cartao"))
+        reader = ReaderFactory().make(account_config)
+        parser = TransactionParserFactory().make(account_config)
+        transactions = [
+            t for t in reader.read_transactions(parser, file) if t is not None
+        ]
+        client = OfxClient(account_config)
+
+        sorted_transactions = client.sort_transactions(transactions)
+        expected = "\n".join(
+            [
+                client.make_ofx_header(sorted_transactions),
+                *client.make_ofx_transactions(sorted_transactions),
+                client.make_ofx_footer(sorted_transactions),
+            ]
+        )
+        buffer = StringIO()
+        client.write_ofx_file(transactions, buffer)
+        self.assertEqual(buffer.getvalue(), expected)
+        self.assertEqual(client.make_ofx_file(transactions), expected)
+
+        # The header and footer helpers take transactions in any order
+        reversed_transactions = sorted_transactions[::-1]
+        self.assertEqual(
+            client.make_ofx_header(reversed_transactions),
+            client.make_ofx_header(sorted_transactions),
+        )
+        self.assertEqual(
+            client.make_ofx_footer(reversed_transactions),
+            client.make_ofx_footer(sorted_transactions),
+        )
+
+    def test_write_ofx_stream_matches_rendered_file(self) -> None:
+        file = Path("./tests/files/xpi/card/2025-03.csv")
+        account_config = AccountConfig(Account("xpi-cartao"))
+        reader = ReaderFactory().make(account_config)
+        parser = TransactionParserFactory().make(account_config)
+        client = OfxClient(account_config)
+        transactions = [
+            t for t in reader.read_transactions(parser, file) if t is not None
+        ]
+        expected = client.make_ofx_file(transactions)
+
+        # Streams keep the source order, the header bounds don't depend on it
+        buffer = StringIO()
+        count = client.write_ofx_stream(
+            iter(client.sort_transactions(transactions)), buffer
+        )
+        self.assertEqual(count, 12)
+        self.assertEqual(buffer.getvalue(), expected)
+
+        unsorted = StringIO()
+        client.write_ofx_stream(reader.iter_transactions(parser, file), unsorted)
+        header = expected.split("<STMTTRN>")[0]
+        footer = expected.split("</STMTTRN>")[-1]
+        self.assertTrue(unsorted.getvalue().startswith(header))
+        self.assertTrue(unsorted.getvalue().endswith(footer))
+        self.assertNotEqual(unsorted.getvalue(), expected)
+
+        empty = StringIO()
+        self.assertEqual(client.write_ofx_stream(iter([]), empty), 0)
+        self.assertEqual(empty.getvalue(), "")
@@ -0,0 +1,61 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from ofx_converter.profiler import NULL_PROFILER, Profiler
+from ofx_converter.runner import Runner
+from tests.base_test_case import BaseTestCase
+
+
+class ProfilerTestSuite(BaseTestCase):
+
+    def test_nested_stages_exclude_inner_time(self) -> None:
+        profiler = Profiler(trace_memory=False)
+        with TemporaryDirectory() as directory:
+            input_path = Path(directory) / "2025-04.csv"
+            input_path.write_text("abc")
+            with profiler.file(input_path, Path(directory) / "2025-04.ofx"):
+                with profiler.stage("parse"):
+                    items = list(profiler.iterate("read", range(1000)))
+                profiler.count(len(items))
+        (profile,) = profiler.files
+        self.assertEqual(profile.rows, 1000)
+        self.assertEqual(profile.bytes_in, 3)
+        self.assertEqual(profile.bytes_out, 0)
+        self.assertEqual(set(profile.stages), {"parse", "read", "other"})
+        self.assertAlmostEqual(sum(profile.stages.values()), profile.seconds)
+        self.assertEqual(len(profiler.report()), 3)
+
+    def test_null_profiler_passes_through(self) -> None:
+        items = iter(range(3))
+        self.assertIs(NULL_PROFILER.iterate("read", items), items)
+        self.assertIs(NULL_PROFILER.stage("read"), NULL_PROFILER.stage("parse"))
+
+    def test_profiles_runner(self) -> None:
+        profiler = Profiler()
+        profiler.start()
+        try:
+            runner = Runner("nubank-cartao", profiler=profiler)
+            results = list(runner.run_account_conversion(force=True))
+        finally:
+            profiler.stop()
+        self.assertEqual(len(profiler.files), len(results))
+        for profile, result in zip(profiler.files, results):
+            self.assertEqual(profile.input_path, result.input_path)
+            self.assertEqual(profile.rows, result.transactions)
+            self.assertGreater(profile.bytes_out, 0)
+            self.assertGreater(profile.peak_memory, 0)
+            for stage in ("read", "parse", "render", "write"):
+                self.assertIn(stage, profile.stages)
+        self.assertIn("manifest", profiler.setup.stages)
+
+    def test_missing_input_fails_only_its_file(self) -> None:
+        profiler = Profiler()
+        runner = Runner("nubank-cartao", profiler=profiler)
+        with TemporaryDirectory() as directory:
+            input_path = Path(directory) / "2025-01.ofx"
+            output_path = Path(directory) / "2025-01-out.ofx"
+            result = runner.convert_file(input_path, output_path)
+        self.assertFalse(result.ok)
+        self.assertIn("FileNotFoundError", str(result.error))
+        self.assertEqual(len(profiler.files), 1)
+        self.assertEqual(profiler.files[0].bytes_in, 0)
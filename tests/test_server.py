@@ -0,0 +1,69 @@
+from http.client import HTTPConnection
+from pathlib import Path
+from threading import Thread
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from ofx_converter.server import ConversionServer
+from tests.base_test_case import BaseTestCase
+
+
+class ConversionServerTestSuite(BaseTestCase):
+
+    def setUp(self) -> None:
+        self.server = ConversionServer("127.0.0.1", 0)
+        thread = Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    def post(self, path: str, content: bytes) -> tuple[int, str]:
+        request = Request(f"{self.server.url}{path}", data=content, method="POST")
+        try:
+            with urlopen(request, timeout=10) as response:
+                charset = response.headers.get_content_charset()
+                return response.status, response.read().decode(charset)
+        except HTTPError as e:
+            return e.code, e.read().decode()
+
+    def test_converts_statements(self) -> None:
+        files = {
+            "nubank-cartao": Path("./tests/files/nubank/card/2025-04.ofx"),
+            "xpi-cartao": Path("./tests/files/xpi/card/2025-03.csv"),
+        }
+        for account_name, file in files.items():
+            for _ in range(2):
+                status, body = self.post(f"/convert/{account_name}", file.read_bytes())
+                self.assertEqual(status, 200)
+                self.assertTrue(body.startswith("OFXHEADER"))
+                self.assertIn("<STMTTRN>", body)
+
+    def test_rejects_unknown_accounts_and_empty_statements(self) -> None:
+        status, _ = self.post("/convert/unknown-account", b"")
+        self.assertEqual(status, 404)
+        status, body = self.post("/convert/xpi-cartao", b"Data;Valor\n")
+        self.assertEqual(status, 422)
+        self.assertIn("no valid transactions", body)
+
+    def test_encodes_replies_as_the_header_declares(self) -> None:
+        content = Path("./tests/files/nubank/card/2025-04.ofx").read_bytes()
+        request = Request(
+            f"{self.server.url}/convert/nubank-cartao", data=content, method="POST"
+        )
+        with urlopen(request, timeout=10) as response:
+            self.assertEqual(response.headers.get_content_charset(), "cp1252")
+            body = response.read().decode("cp1252")
+        self.assertIn("ENCODING:US-ASCII\nCHARSET:1252", body)
+
+    def test_rejects_invalid_content_lengths(self) -> None:
+        host, port = self.server.server_address[:2]
+        for length, status in [(None, 411), ("abc", 400), ("-1", 400)]:
+            connection = HTTPConnection(str(host), port, timeout=10)
+            self.addCleanup(connection.close)
+            connection.putrequest("POST", "/convert/xpi-cartao")
+            if length is not None:
+                connection.putheader("Content-Length", length)
+            connection.endheaders()
+            response = connection.getresponse()
+            self.assertEqual(response.status, status)
+            self.assertEqual(response.getheader("Connection"), "close")
@@ -0,0 +1,44 @@
+import json
+import subprocess
+import sys
+
+from tests.base_test_case import BaseTestCase
+
+
+class StartupTestSuite(BaseTestCase):
+
+    def _loaded_modules(self, code: str, modules: list[str]) -> list[str]:
+        check = "\n".join(
+            [
+                "import json, sys",
+                code,
+                f"print(json.dumps([m for m in {modules!r} if m in sys.modules]))",
+            ]
+        )
+        process = subprocess.run(
+            [sys.executable, "-c", check], check=True, capture_output=True, text=True
+        )
+        loaded: list[str] = json.loads(process.stdout.strip().splitlines()[-1])
+        return loaded
+
+    def test_cli_import_is_lazy(self) -> None:
+        loaded = self._loaded_modules(
+            "import ofx_converter.cli",
+            ["dynaconf", "jinja2", "ofxparse", "dateutil", "ofx_converter.runner"],
+        )
+        self.assertEqual(loaded, [])
+
+    def test_csv_account_does_not_load_ofxparse(self) -> None:
+        code = "\n".join(
+            [
+                "from ofx_converter.parsing.account import Account",
+                "from ofx_converter.parsing.account_config import AccountConfig",
+                "from ofx_converter.parsing.builder import TransactionParserFactory",
+                "from ofx_converter.reader_factory import ReaderFactory",
+                "config = AccountConfig(Account('xpi-cartao'))",
+                "ReaderFactory().make(config)",
+                "TransactionParserFactory().make(config)",
+            ]
+        )
+        loaded = self._loaded_modules(code, ["dynaconf", "ofxparse"])
+        self.assertEqual(loaded, ["dynaconf"])
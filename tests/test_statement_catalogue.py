@@ -0,0 +1,104 @@
+import os
+from datetime import datetime
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from ofx_converter.runner import Runner
+from ofx_converter.statement_catalogue import StatementCatalogue
+from tests.base_test_case import BaseTestCase
+
+
+class StatementCatalogueTestSuite(BaseTestCase):
+
+    def setUp(self) -> None:
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = Path(directory.name)
+        self.input_dir = self.root / "in"
+        self.input_dir.mkdir()
+        self.index_path = self.root / StatementCatalogue.file_name
+
+    def make_catalogue(self, recursive: bool = True) -> StatementCatalogue:
+        catalogue = StatementCatalogue(
+            self.input_dir, "csv", self.index_path, recursive
+        )
+        catalogue._read()
+        catalogue.refresh()
+        catalogue.save()
+        return catalogue
+
+    def write(self, relative: str) -> Path:
+        path = self.input_dir / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("Data;Valor\n")
+        return path
+
+    def test_range_queries(self) -> None:
+        files = [
+            self.write("2024/2024-11.csv"),
+            self.write("2024/2024-12.csv"),
+            self.write("2025/2025-01-extra.csv"),
+            self.write("2025/2025-01.csv"),
+            self.write("2025-02.csv"),
+        ]
+        undated = self.write("statement.csv")
+        self.write("2025-03.ofx")
+
+        catalogue = self.make_catalogue()
+        self.assertEqual(len(catalogue), 6)
+        self.assertEqual(catalogue.files(), [*files, undated])
+        self.assertEqual(
+            catalogue.files(datetime(2024, 12, 1), datetime(2025, 1, 1)), files[1:4]
+        )
+        self.assertEqual(catalogue.files(from_date=datetime(2025, 2, 1)), files[4:])
+        self.assertEqual(catalogue.files(to_date=datetime(2024, 11, 30)), files[:1])
+        # A month starting before the range is out of it
+        self.assertEqual(catalogue.files(datetime(2024, 11, 15)), files[1:])
+
+        flat = self.make_catalogue(recursive=False)
+        self.assertEqual(flat.files(), [files[4], undated])
+
+    def test_refreshes_changed_directories(self) -> None:
+        self.write("2024/2024-12.csv")
+        self.write("2025/2025-01.csv")
+        self.make_catalogue()
+
+        new_file = self.write("2025/2025-02.csv")
+        (self.input_dir / "2024" / "2024-12.csv").unlink()
+        (self.input_dir / "2024").rmdir()
+        catalogue = self.make_catalogue()
+        self.assertEqual(
+            catalogue.files(), [self.input_dir / "2025" / "2025-01.csv", new_file]
+        )
+
+        # Unchanged directories are answered from the saved catalogue
+        (self.input_dir / "2025" / "2025-01.csv").unlink()
+        stale = StatementCatalogue(self.input_dir, "csv", self.index_path, True)
+        stale._read()
+        stale._build_index()
+        self.assertEqual(len(stale), 2)
+
+    def test_lists_racy_directories_again(self) -> None:
+        first = self.write("2025-01.csv")
+        mtime_ns = self.input_dir.stat().st_mtime_ns
+        self.make_catalogue()
+
+        # A file added within the same mtime tick leaves the mtime as saved
+        second = self.write("2025-02.csv")
+        os.utime(self.input_dir, ns=(mtime_ns, mtime_ns))
+        catalogue = self.make_catalogue()
+        self.assertEqual(catalogue.files(), [first, second])
+
+    def test_skips_symlinked_directories(self) -> None:
+        statement = self.write("2025/2025-01.csv")
+        (self.input_dir / "2025" / "loop").symlink_to(self.input_dir)
+        (self.input_dir / "2025-02.csv").symlink_to(statement)
+        catalogue = self.make_catalogue()
+        self.assertEqual(catalogue.files(), [statement, self.input_dir / "2025-02.csv"])
+
+    def test_runner_finds_files_with_catalogue(self) -> None:
+        runner = Runner("nubank-cartao")
+        files = runner.find_files(datetime(2025, 5, 1))
+        self.assertEqual([file.name for file in files], ["2025-05.ofx"])
+        index_path = runner.account_config.file_out / StatementCatalogue.file_name
+        self.assertTrue(index_path.exists())
@@ -0,0 +1,35 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from ofx_converter.ofx_client import OfxClient
+from ofx_converter.parsing.account import Account
+from ofx_converter.parsing.account_config import AccountConfig
+from ofx_converter.template_registry import TemplateRegistry, get_template_registry
+from tests.base_test_case import BaseTestCase
+
+
+class TemplateRegistryTestSuite(BaseTestCase):
+
+    def test_templates_are_shared_between_clients(self) -> None:
+        account_config = AccountConfig(Account("nubank-cartao"))
+        first = OfxClient(account_config)
+        second = OfxClient(account_config)
+        self.assertIs(first.header_template, second.header_template)
+        self.assertIs(first.transaction_template, second.transaction_template)
+        self.assertIs(get_template_registry(), get_template_registry())
+
+    def test_hits_and_misses(self) -> None:
+        registry = TemplateRegistry()
+        first = registry.get_template("credit-card", "ofx_header.ofx")
+        second = registry.get_template("credit-card", "ofx_header.ofx")
+        banking = registry.get_template("banking", "ofx_header.ofx")
+        self.assertIs(first, second)
+        self.assertIsNot(first, banking)
+        self.assertEqual(registry.misses, 2)
+        self.assertEqual(registry.hits, 1)
+
+    def test_bytecode_cache(self) -> None:
+        with TemporaryDirectory() as cache_dir:
+            registry = TemplateRegistry(Path(cache_dir))
+            registry.get_template("banking", "ofx_footer.ofx")
+            self.assertEqual(len(list(Path(cache_dir).iterdir())), 1)
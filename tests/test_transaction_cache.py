@@ -0,0 +1,140 @@
+import shutil
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+from ofx_converter.ofx_client import OfxClient
+from ofx_converter.parsing.builder import TransactionParserFactory
+from ofx_converter.parsing.transaction import Transaction
+from ofx_converter.runner import Runner
+from ofx_converter.transaction_cache import TransactionCache
+from tests.base_test_case import BaseTestCase
+
+
+def fields(t: Transaction) -> tuple[object, ...]:
+    return (
+        t.timestamp,
+        t.ofx_date,
+        t.description,
+        t.value,
+        t.balance,
+        t.transaction_id,
+        t.transaction_type,
+        t.fitid,
+    )
+
+
+class TransactionCacheTestSuite(BaseTestCase):
+
+    def setUp(self) -> None:
+        self.runner = Runner("nubank-cartao", cache=True)
+        cache = self.runner.transaction_cache
+        assert cache is not None
+        self.cache = cache
+        shutil.rmtree(cache.directory, ignore_errors=True)
+        self.addCleanup(shutil.rmtree, cache.directory, ignore_errors=True)
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.source = Path(directory.name) / "2025-01.ofx"
+        self.source.write_text("statement")
+
+    def test_round_trip(self) -> None:
+        sao_paulo = ZoneInfo("America/Sao_Paulo")
+        transactions = [
+            Transaction(
+                datetime(2025, 1, 2, 10, 30, 15, 123456, tzinfo=sao_paulo),
+                "Supermercado",
+                Decimal("-12.34"),
+                Decimal("1000.5"),
+            ),
+            Transaction(datetime(2025, 1, 3), "Pix recebido", Decimal("50")),
+            Transaction(
+                datetime(2025, 1, 4, tzinfo=timezone(timedelta(hours=5, minutes=30))),
+                "Pagamento",
+                Decimal("-0.01"),
+                transaction_id="abc-123",
+                tran_type="debit",
+            ),
+            Transaction(datetime(1969, 12, 31, 23, 59), "Estorno", Decimal("0.00")),
+            Transaction(datetime(2025, 1, 3), "Pix recebido", Decimal("50")),
+        ]
+        self.runner.account_config.fitid_hasher.assign(transactions)
+        digest, cached = self.cache.lookup(self.source)
+        self.assertIsNone(cached)
+        self.cache.store(self.source, digest, transactions)
+
+        _, cached = self.cache.lookup(self.source)
+        assert cached is not None
+        self.assertEqual([fields(t) for t in cached], [fields(t) for t in transactions])
+
+    def test_runner_loads_cached_transactions(self) -> None:
+        input_path = sorted(self.runner.find_files())[0]
+        parsed = self.runner._parse_file(input_path)
+        self.assertTrue(self.cache.entry_path(input_path).exists())
+        with self.assertLogs(self.runner.log, "INFO") as logs:
+            cached = self.runner._parse_file(input_path)
+        self.assertIn(f"Loaded {len(parsed)} cached transactions", logs.output[0])
+        self.assertEqual([fields(t) for t in cached], [fields(t) for t in parsed])
+
+        client = OfxClient(self.runner.account_config)
+        rendered, from_cache = StringIO(), StringIO()
+        client.write_ofx_file(parsed, rendered)
+        client.write_ofx_file(cached, from_cache)
+        self.assertEqual(from_cache.getvalue(), rendered.getvalue())
+
+    def test_misses_on_changed_content_or_parser(self) -> None:
+        transactions = [Transaction(datetime(2025, 1, 3), "Pix", Decimal("50"))]
+        digest, _ = self.cache.lookup(self.source)
+        self.cache.store(self.source, digest, transactions)
+
+        other_parser = TransactionCache(self.runner.account_config, "other.Parser")
+        self.assertIsNone(other_parser.lookup(self.source)[1])
+        self.source.write_text("statement changed")
+        self.assertIsNone(self.cache.lookup(self.source)[1])
+
+    def test_misses_on_changed_parsing_code(self) -> None:
+        digest, _ = self.cache.lookup(self.source)
+        self.cache.store(self.source, digest, [])
+        account_config = self.runner.account_config
+        parser_path = TransactionParserFactory().parser_path(account_config)
+        same_code = TransactionCache(account_config, parser_path)
+        self.assertEqual(same_code.lookup(self.source)[1], [])
+        with patch(
+            "ofx_converter.transaction_cache.parsing_version", return_value="fixed"
+        ):
+            other_code = TransactionCache(account_config, parser_path)
+        self.assertIsNone(other_code.lookup(self.source)[1])
+
+    def test_reuses_digest_of_manifest_stamp(self) -> None:
+        manifest = self.runner.load_manifest()
+        digest, _ = self.cache.lookup(self.source)
+        self.cache.store(self.source, digest, [])
+        sha256_digest = manifest.stamp(self.source)
+        self.assertEqual(bytes.fromhex(sha256_digest), digest)
+        # A known digest is trusted, the file isn't read again
+        self.source.unlink()
+        self.assertEqual(self.cache.lookup(self.source, sha256_digest)[1], [])
+
+    def test_ignores_unreadable_entries(self) -> None:
+        digest, _ = self.cache.lookup(self.source)
+        self.cache.store(self.source, digest, [])
+        entry_path = self.cache.entry_path(self.source)
+        entry_path.write_bytes(entry_path.read_bytes() + b"\0")
+        with self.assertLogs(self.cache.log, "WARNING"):
+            self.assertIsNone(self.cache.lookup(self.source)[1])
+
+    def test_evicts_entries_of_missing_sources(self) -> None:
+        digest, _ = self.cache.lookup(self.source)
+        self.cache.store(self.source, digest, [])
+        input_path = sorted(self.runner.find_files())[0]
+        self.runner._parse_file(input_path)
+
+        self.assertEqual(self.cache.evict(), 0)
+        self.source.unlink()
+        self.assertEqual(self.cache.evict(), 1)
+        self.assertFalse(self.cache.entry_path(self.source).exists())
+        self.assertTrue(self.cache.entry_path(input_path).exists())
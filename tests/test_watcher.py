@@ -0,0 +1,156 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from ofx_converter.manifest import ConversionManifest
+from ofx_converter.watcher import DirectoryPoller, StatementWatcher
+from tests.base_test_case import BaseTestCase
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class DirectoryPollerTestSuite(BaseTestCase):
+
+    def setUp(self) -> None:
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        self.clock = FakeClock()
+        self.poller = DirectoryPoller(self.directory, "csv", 0.3, self.clock)
+
+    def test_waits_until_files_are_written(self) -> None:
+        statement = self.directory / "2025-04.csv"
+        statement.write_text("Data;Valor\n")
+        (self.directory / "notes.txt").write_text("ignored")
+        self.assertEqual(self.poller.poll(), [])
+        self.assertEqual(self.poller.pending, 1)
+
+        self.clock.advance(0.2)
+        with open(statement, "a") as file_obj:
+            file_obj.write("01/04/25;R$ 1,00\n")
+        self.assertEqual(self.poller.poll(), [])
+
+        # Unchanged since the append, but not for long enough yet
+        self.clock.advance(0.2)
+        self.assertEqual(self.poller.poll(), [])
+        self.clock.advance(0.2)
+        self.assertEqual(self.poller.poll(), [statement])
+        self.assertEqual(self.poller.poll(), [])
+
+    def test_returns_new_and_replaced_files(self) -> None:
+        first = self.directory / "2025-04.csv"
+        first.write_text("first")
+        self.poller.poll()
+        self.clock.advance(1)
+        self.assertEqual(self.poller.poll(), [first])
+
+        second = self.directory / "2025-05.csv"
+        second.write_text("second")
+        replacement = self.directory / "2025-04.csv.tmp"
+        replacement.write_text("first, again")
+        replacement.replace(first)
+        self.poller.poll()
+        self.clock.advance(1)
+        self.assertEqual(self.poller.poll(), [first, second])
+
+    def test_skips_empty_and_removed_files(self) -> None:
+        empty = self.directory / "2025-04.csv"
+        empty.touch()
+        removed = self.directory / "2025-05.csv"
+        removed.write_text("removed")
+        self.poller.poll()
+        removed.unlink()
+        self.clock.advance(1)
+        self.assertEqual(self.poller.poll(), [])
+        self.assertEqual(self.poller.pending, 1)
+
+    def test_returns_files_modified_in_place(self) -> None:
+        statement = self.directory / "2025-04.csv"
+        statement.write_text("first")
+        self.poller.poll()
+        self.clock.advance(1)
+        self.assertEqual(self.poller.poll(), [statement])
+
+        with open(statement, "a") as file_obj:
+            file_obj.write(", again")
+        self.assertEqual(self.poller.poll(), [])
+        self.clock.advance(1)
+        self.assertEqual(self.poller.poll(), [statement])
+
+        self.poller.retry(statement)
+        self.clock.advance(1)
+        self.assertEqual(self.poller.poll(), [statement])
+
+    def test_watches_subdirectories_when_recursive(self) -> None:
+        poller = DirectoryPoller(self.directory, "csv", 0.3, self.clock, True)
+        nested = self.directory / "2025" / "2025-04.csv"
+        nested.parent.mkdir()
+        nested.write_text("nested")
+        (self.directory / "link").symlink_to(nested.parent)
+        self.poller.poll()
+        poller.poll()
+        self.clock.advance(1)
+        self.assertEqual(self.poller.poll(), [])
+        self.assertEqual(poller.poll(), [nested])
+
+        later = self.directory / "2025" / "2025-05.csv"
+        later.write_text("later")
+        poller.poll()
+        self.clock.advance(1)
+        self.assertEqual(poller.poll(), [later])
+
+
+class StatementWatcherTestSuite(BaseTestCase):
+
+    def test_converts_files_once_settled(self) -> None:
+        clock = FakeClock()
+        watcher = StatementWatcher(["nubank-cartao"], clock=clock)
+        runner = watcher.runners["nubank-cartao"]
+        # Start from an empty manifest, so the existing files are new
+        watcher.manifests["nubank-cartao"] = ConversionManifest(
+            runner.account_config, runner.output_options
+        )
+
+        self.assertEqual(watcher.poll(), [])
+        clock.advance(1)
+        results = watcher.poll()
+        self.assertEqual(len(results), 2)
+        for result in results:
+            self.assertTrue(result.ok)
+            self.assertGreater(result.transactions, 0)
+        self.assertEqual(watcher.poll(), [])
+
+    def test_retries_files_it_fails_to_read(self) -> None:
+        clock = FakeClock()
+        watcher = StatementWatcher(["nubank-cartao"], clock=clock)
+        runner = watcher.runners["nubank-cartao"]
+        manifest = ConversionManifest(runner.account_config, runner.output_options)
+        watcher.manifests["nubank-cartao"] = manifest
+        files = sorted(runner.find_files())
+
+        watcher.poll()
+        clock.advance(1)
+        denied = PermissionError("Permission denied")
+        with patch.object(manifest, "stamp", side_effect=[None, denied]):
+            with self.assertLogs(watcher.log, "WARNING"):
+                results = watcher.poll()
+        self.assertEqual([result.input_path for result in results], files[:1])
+        self.assertEqual(watcher.pollers["nubank-cartao"].pending, 1)
+
+        clock.advance(1)
+        results = watcher.poll()
+        self.assertEqual([result.input_path for result in results], files[1:])
+        self.assertTrue(results[0].ok)
+
+    def test_unknown_account(self) -> None:
+        with self.assertRaises(ValueError):
+            StatementWatcher(["unknown-account"])